@@ -1,11 +1,27 @@
 from flask import Blueprint, request, jsonify
 from flask_limiter.util import get_remote_address
-from nfl_simulation_engine_lite.game_simulator import run_multiple_simulations_with_statistics, run_multiple_simulations_multi_threaded
+from nfl_simulation_engine_lite.game_simulator import run_multiple_simulations_with_statistics, run_multiple_simulations_multi_threaded, ADAPTIVE_TARGET_WIN_PCT_SE, ADAPTIVE_TARGET_SCORE_DIFF_SE
 from nfl_simulation_engine_lite.game_model.game_model_factory import initialize_new_game_model_instance
-import gc
+from nfl_simulation_engine_lite.game_engine.game_engine import OUTPUT_LEVELS
+from nfl_simulation_engine_lite.utils.random_stream import SAMPLING_SCHEMES
+import math
 
 api_bp = Blueprint('api_bp', __name__)
 
+# Budgets stay within gunicorn's 120 second timeout, budgeted runs default to at most this many games
+MAX_TIME_BUDGET_MS = 100000
+TIME_BUDGETED_MAX_SIMULATIONS = 1000000
+
+def replace_non_finite_floats(value):
+    # NaN/Infinity (e.g. standard errors of too few games) isn't valid JSON, so it becomes null
+    if isinstance(value, dict):
+        return {key: replace_non_finite_floats(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [replace_non_finite_floats(item) for item in value]
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
 @api_bp.route('/', methods=['GET'])
 def index():
     return jsonify({
@@ -19,8 +35,24 @@ def run_simulation():
     payload = request.get_json()
     home_team_abbrev = payload['home_team']
     away_team_abbrev = payload['away_team']
-    num_simulations = int(payload['num_simulations'])
+    # Optional, runs as many games as fit in the budget
+    time_budget_ms = payload.get('time_budget_ms')
+    num_simulations = int(payload.get('num_simulations') or (TIME_BUDGETED_MAX_SIMULATIONS if time_budget_ms is not None else 0))
     game_model = payload['game_model']
+    # Optional, the seed used is returned with the results so any run can be reproduced
+    seed = payload.get('seed')
+    # Optional, adds percentiles of every team stat to the results
+    track_percentiles = bool(payload.get('percentiles', False))
+    # Optional, "scores" only returns win probability and score stats, without team stats or a featured game
+    output_level = payload.get('output_level', 'full')
+    # Optional, simulates in rounds until the standard errors are within the targets
+    adaptive = bool(payload.get('adaptive', False))
+    target_win_pct_se = payload.get('target_win_pct_se', ADAPTIVE_TARGET_WIN_PCT_SE)
+    target_score_diff_se = payload.get('target_score_diff_se', ADAPTIVE_TARGET_SCORE_DIFF_SE)
+    # Optional, "antithetic" or "stratified" sampling also returns the variance reduction it got
+    sampling = payload.get('sampling', 'plain')
+    # Optional, plays the games on the vectorized engine, for game models that support it
+    batch = bool(payload.get('batch', False))
 
     if not home_team_abbrev or not away_team_abbrev:
         return jsonify({'message': 'Please provide a home and away team'}), 400
@@ -31,7 +63,31 @@ def run_simulation():
     if not game_model:
         game_model = 'proto'
 
+    if seed is not None and (type(seed) is not int or seed < 0):
+        return jsonify({'message': 'The seed must be a non-negative integer'}), 400
+
+    if output_level not in OUTPUT_LEVELS:
+        return jsonify({'message': f'The output level must be one of {", ".join(OUTPUT_LEVELS)}'}), 400
+
+    for target in (target_win_pct_se, target_score_diff_se):
+        if type(target) not in (int, float) or target <= 0:
+            return jsonify({'message': 'Standard error targets must be positive numbers'}), 400
+
+    if sampling not in SAMPLING_SCHEMES:
+        return jsonify({'message': f'The sampling scheme must be one of {", ".join(SAMPLING_SCHEMES)}'}), 400
+
+    if time_budget_ms is not None and (type(time_budget_ms) not in (int, float) or not 0 < time_budget_ms <= MAX_TIME_BUDGET_MS):
+        return jsonify({'message': f'The time budget must be a positive number of milliseconds, at most {MAX_TIME_BUDGET_MS}'}), 400
+
     game_model_instance = initialize_new_game_model_instance(game_model)
+    if not game_model_instance.is_playable():
+        return jsonify({'message': f'The {game_model} game model is not available'}), 400
+
+    if batch and not game_model_instance.supports_batch_simulation():
+        return jsonify({'message': f'The {game_model} game model does not support batch simulation'}), 400
+
+    if batch and sampling != 'plain':
+        return jsonify({'message': 'Batch simulation only supports plain sampling'}), 400
     
     results = run_multiple_simulations_multi_threaded(
         home_team_abbrev, 
@@ -39,14 +95,19 @@ def run_simulation():
         num_simulations, 
         game_model_instance,
         num_workers=2, 
-        debug_mode=False
+        debug_mode=False,
+        seed=seed,
+        track_percentiles=track_percentiles,
+        output_level=output_level,
+        adaptive=adaptive,
+        target_win_pct_se=target_win_pct_se,
+        target_score_diff_se=target_score_diff_se,
+        sampling=sampling,
+        time_budget_ms=time_budget_ms,
+        batch=batch
     )
-    
-    # Clean up
-    del game_model_instance
-    gc.collect()
-    
-    return jsonify(results)
+
+    return jsonify(replace_non_finite_floats(results))
 
 @api_bp.route('/run-simulation-legacy', methods=['POST'])
 def run_simulation_legacy():
@@ -0,0 +1,52 @@
+from nfl_simulation_engine_lite.game_engine.game_engine import GameEngine
+from nfl_simulation_engine_lite.game_model.game_model_factory import initialize_new_game_model_instance
+from nfl_simulation_engine_lite.game_simulator import initialize_teams_for_game_engine
+from nfl_simulation_engine_lite.utils.random_stream import get_game_generator
+from time import perf_counter
+import argparse
+import tracemalloc
+
+# Serial GameEngine timings, e.g. --models proto v2b --games 400 --repeats 7
+
+def time_games(game_engine: GameEngine, num_games: int, num_repeats: int, output_level: str) -> float:
+    # Best of num_repeats runs of the same seeded games, in ms per game
+    best_seconds = float("inf")
+    for __ in range(num_repeats):
+        run_start = perf_counter()
+        for __ in game_engine.run_many(num_games, seed=0, output_level=output_level):
+            pass
+        best_seconds = min(best_seconds, perf_counter() - run_start)
+    return 1000 * best_seconds / num_games
+
+def measure_retained_memory(game_engine: GameEngine) -> int:
+    # Bytes a finished game's summary and game state still hold
+    game_engine.reset(get_game_generator(0, 0))
+    tracemalloc.start()
+    start_bytes = tracemalloc.get_traced_memory()[0]
+    game_summary = game_engine.run_simulation()
+    retained_bytes = tracemalloc.get_traced_memory()[0] - start_bytes
+    tracemalloc.stop()
+    del game_summary
+    return retained_bytes
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Time serial simulations of one matchup with each game model")
+    parser.add_argument("--models", nargs="+", default=["proto", "v2", "v2b"])
+    parser.add_argument("--home-team", default="SF")
+    parser.add_argument("--away-team", default="SEA")
+    parser.add_argument("--games", type=int, default=400)
+    parser.add_argument("--repeats", type=int, default=7)
+    args = parser.parse_args()
+
+    home_team, away_team = initialize_teams_for_game_engine(args.home_team, args.away_team)
+    print(f"ms per game, best of {args.repeats} runs of {args.games} games of {args.away_team} at {args.home_team}\n")
+    print(f"{'model':8}{'full':>10}{'scores':>10}{'retained KB':>14}")
+    for model_name in args.models:
+        game_engine = GameEngine(home_team, away_team, initialize_new_game_model_instance(model_name))
+        full_ms = time_games(game_engine, args.games, args.repeats, "full")
+        scores_ms = time_games(game_engine, args.games, args.repeats, "scores")
+        retained_kb = measure_retained_memory(game_engine) / 1024
+        print(f"{model_name:8}{full_ms:10.3f}{scores_ms:10.3f}{retained_kb:14.0f}")
+
+if __name__ == "__main__":
+    main()
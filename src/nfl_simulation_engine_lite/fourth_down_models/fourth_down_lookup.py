@@ -0,0 +1,103 @@
+from bisect import bisect_left
+from time import time
+import numpy as np
+import os
+
+FOURTH_DOWN_FEATURES = ("game_seconds_remaining", "half_seconds_remaining", "ydstogo", "yardline_100", "score_differential")
+
+def get_default_lookup_axes() -> dict[str, np.ndarray]:
+    # Finer clock axes late in a half, where most time splits are, and exact ydstogo up to 15 yards
+    return {
+        "game_seconds_remaining": np.concatenate([np.arange(0, 300, 30), np.arange(300, 3601, 150)]),
+        "half_seconds_remaining": np.concatenate([np.arange(0, 300, 30), np.arange(300, 1801, 150)]),
+        "ydstogo": np.concatenate([np.arange(1, 16), [18, 22, 27]]),
+        "yardline_100": np.arange(1, 100, 2),
+        "score_differential": np.arange(-24, 25, 3),
+    }
+
+class FourthDownLookupTable:
+    def __init__(self, axes: list[np.ndarray], table: np.ndarray, agreement_rate: float = None):
+        self.axes = axes
+        self.table = table
+        self.agreement_rate = agreement_rate
+        # Cell boundaries sit halfway between neighbouring grid points
+        self.cell_boundaries = [(axis[1:] + axis[:-1]) / 2 for axis in axes]
+        self.cell_boundary_lists = [boundaries.tolist() for boundaries in self.cell_boundaries]
+
+    def predict_state(self, game_seconds_remaining: float, half_seconds_remaining: float, ydstogo: float,
+                      yardline_100: float, score_differential: float) -> int:
+        state = (game_seconds_remaining, half_seconds_remaining, ydstogo, yardline_100, score_differential)
+        cell = tuple(bisect_left(boundaries, value) for boundaries, value in zip(self.cell_boundary_lists, state))
+        return int(self.table[cell])
+
+    def predict(self, states) -> np.ndarray:
+        # Accepts a DataFrame with the forest's feature columns or an (n, 5) array in FOURTH_DOWN_FEATURES order
+        if hasattr(states, "columns"):
+            states = states[list(FOURTH_DOWN_FEATURES)].to_numpy()
+        states = np.asarray(states, dtype=np.float64)
+        cell = tuple(np.searchsorted(boundaries, states[:, i]) for i, boundaries in enumerate(self.cell_boundaries))
+        return self.table[cell]
+
+    def save(self, path: str) -> None:
+        axes = {f"axis_{feature}": axis for feature, axis in zip(FOURTH_DOWN_FEATURES, self.axes)}
+        agreement_rate = np.nan if self.agreement_rate is None else self.agreement_rate
+        np.savez_compressed(path, table=self.table, agreement_rate=agreement_rate, **axes)
+
+    @classmethod
+    def load(cls, path: str) -> "FourthDownLookupTable":
+        with np.load(path) as lookup_data:
+            axes = [lookup_data[f"axis_{feature}"] for feature in FOURTH_DOWN_FEATURES]
+            agreement_rate = float(lookup_data["agreement_rate"])
+            return cls(axes, lookup_data["table"], None if np.isnan(agreement_rate) else agreement_rate)
+
+def compile_fourth_down_lookup_table(fourth_down_model, axes: dict[str, np.ndarray] = None, chunk_size: int = 500000) -> FourthDownLookupTable:
+    # pandas and joblib are only needed to compile and check tables, not to use them while simulating
+    import pandas as pd
+
+    if axes is None:
+        axes = get_default_lookup_axes()
+    if not all(0 <= label < 256 for label in fourth_down_model.classes_):
+        raise ValueError(f"Unsupported fourth down model classes: {fourth_down_model.classes_}")
+
+    axis_values = [np.asarray(axes[feature], dtype=np.float64) for feature in FOURTH_DOWN_FEATURES]
+    table_shape = tuple(len(axis) for axis in axis_values)
+    table = np.empty(int(np.prod(table_shape)), dtype=np.uint8)
+    for chunk_start in range(0, table.size, chunk_size):
+        chunk_end = min(chunk_start + chunk_size, table.size)
+        grid_index = np.unravel_index(np.arange(chunk_start, chunk_end), table_shape)
+        grid_states = pd.DataFrame({feature: axis[index] for feature, axis, index in zip(FOURTH_DOWN_FEATURES, axis_values, grid_index)})
+        table[chunk_start:chunk_end] = fourth_down_model.predict(grid_states)
+    return FourthDownLookupTable(axis_values, table.reshape(table_shape))
+
+def sample_fourth_down_states(num_states: int, rng: np.random.Generator) -> "pd.DataFrame":
+    # Continuous states shaped like the ones the engine produces
+    import pandas as pd
+
+    game_seconds_remaining = rng.integers(0, 3601, num_states)
+    return pd.DataFrame({
+        "game_seconds_remaining": game_seconds_remaining,
+        "half_seconds_remaining": np.where(game_seconds_remaining > 1800, game_seconds_remaining - 1800, game_seconds_remaining),
+        "ydstogo": np.clip(rng.exponential(4, num_states) + 0.5, 0.5, 30),
+        "yardline_100": rng.uniform(1, 99, num_states),
+        "score_differential": np.clip(np.round(rng.normal(0, 10, num_states)), -40, 40),
+    })
+
+def measure_lookup_agreement(fourth_down_model, lookup_table: FourthDownLookupTable, states: "pd.DataFrame") -> float:
+    return float(np.mean(lookup_table.predict(states) == fourth_down_model.predict(states)))
+
+def compile_lookup_tables_for_models(model_names: list[str], num_agreement_states: int = 200000) -> None:
+    import joblib
+
+    model_dir = os.path.dirname(__file__)
+    for model_name in model_names:
+        compile_start = time()
+        fourth_down_model = joblib.load(os.path.join(model_dir, f"{model_name}_4th_down_playcall_model.pkl"))
+        lookup_table = compile_fourth_down_lookup_table(fourth_down_model)
+        agreement_states = sample_fourth_down_states(num_agreement_states, np.random.default_rng(0))
+        lookup_table.agreement_rate = measure_lookup_agreement(fourth_down_model, lookup_table, agreement_states)
+        lookup_table.save(os.path.join(model_dir, f"{model_name}_4th_down_playcall_lookup.npz"))
+        print(f"Compiled {model_name} lookup table {lookup_table.table.shape} in {round(time() - compile_start, 2)} seconds "
+              f"with a {round(100 * lookup_table.agreement_rate, 2)}% agreement rate.")
+
+if __name__ == "__main__":
+    compile_lookup_tables_for_models(["v2", "v2a"])
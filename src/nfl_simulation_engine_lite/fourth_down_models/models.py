@@ -1,10 +1,61 @@
-import joblib
+from nfl_simulation_engine_lite.fourth_down_models.fourth_down_lookup import FourthDownLookupTable
+from nfl_simulation_engine_lite.fourth_down_models.tree_ensemble import TreeEnsemble, export_tree_ensemble
 import os
 
-v1_model_path = os.path.join(os.path.dirname(__file__), "v1_4th_down_playcall_model.pkl")
-v2_model_path = os.path.join(os.path.dirname(__file__), "v2_4th_down_playcall_model.pkl")
-v2a_model_path = os.path.join(os.path.dirname(__file__), "v2a_4th_down_playcall_model.pkl")
+FOURTH_DOWN_MODEL_DIR = os.path.dirname(__file__)
+FOURTH_DOWN_MODEL_NAMES = ("v1", "v2", "v2a")
 
-v1_fdm = joblib.load(v1_model_path)
-v2_fdm = joblib.load(v2_model_path)
-v2a_fdm = joblib.load(v2a_model_path)
\ No newline at end of file
+# Unpickled on first use, memory-mapped so forked processes share the pages
+fourth_down_models = {}
+# NumPy exports of the models above, exported from the pickle on first use if missing
+fourth_down_forests = {}
+# Lookup tables compiled from the models above by fourth_down_lookup.py
+fourth_down_lookup_tables = {}
+
+def get_fourth_down_model_path(model_name: str) -> str:
+    if model_name not in FOURTH_DOWN_MODEL_NAMES:
+        raise ValueError(f"Unknown fourth down model: {model_name}")
+    return os.path.join(FOURTH_DOWN_MODEL_DIR, f"{model_name}_4th_down_playcall_model.pkl")
+
+def get_fourth_down_forest_path(model_name: str) -> str:
+    if model_name not in FOURTH_DOWN_MODEL_NAMES:
+        raise ValueError(f"Unknown fourth down model: {model_name}")
+    return os.path.join(FOURTH_DOWN_MODEL_DIR, f"{model_name}_4th_down_playcall_forest.npz")
+
+def is_fourth_down_model_available(model_name: str) -> bool:
+    # Game models can play fourth downs with either the exported forest or the pickle it is exported from
+    return os.path.exists(get_fourth_down_forest_path(model_name)) or os.path.exists(get_fourth_down_model_path(model_name))
+
+def get_fourth_down_model(model_name: str):
+    if model_name not in fourth_down_models:
+        model_path = get_fourth_down_model_path(model_name)
+        if not os.path.exists(model_path):
+            raise FileNotFoundError(f"The {model_name} fourth down model is not available, expected it at {model_path}")
+        # Imported here so simulating with the exported forests never loads joblib or scikit-learn
+        import joblib
+        fourth_down_models[model_name] = joblib.load(model_path, mmap_mode="r")
+    return fourth_down_models[model_name]
+
+def get_fourth_down_forest(model_name: str) -> TreeEnsemble:
+    if model_name not in fourth_down_forests:
+        forest_path = get_fourth_down_forest_path(model_name)
+        if os.path.exists(forest_path):
+            fourth_down_forests[model_name] = TreeEnsemble.load(forest_path)
+        else:
+            # Raises FileNotFoundError when the pickle is missing as well
+            fourth_down_forests[model_name] = export_tree_ensemble(get_fourth_down_model(model_name))
+    return fourth_down_forests[model_name]
+
+def get_fourth_down_lookup_table(model_name: str) -> FourthDownLookupTable:
+    if model_name not in fourth_down_lookup_tables:
+        lookup_table_path = os.path.join(FOURTH_DOWN_MODEL_DIR, f"{model_name}_4th_down_playcall_lookup.npz")
+        if not os.path.exists(lookup_table_path):
+            raise FileNotFoundError(f"The {model_name} fourth down lookup table is not available, expected it at {lookup_table_path}")
+        fourth_down_lookup_tables[model_name] = FourthDownLookupTable.load(lookup_table_path)
+    return fourth_down_lookup_tables[model_name]
+
+def __getattr__(name: str):
+    # Keeps the old module-level v1_fdm / v2_fdm / v2a_fdm imports working, loading on first access
+    if name.endswith("_fdm") and name[:-len("_fdm")] in FOURTH_DOWN_MODEL_NAMES:
+        return get_fourth_down_model(name[:-len("_fdm")])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
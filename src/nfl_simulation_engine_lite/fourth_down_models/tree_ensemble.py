@@ -0,0 +1,130 @@
+from nfl_simulation_engine_lite.fourth_down_models.fourth_down_lookup import FOURTH_DOWN_FEATURES, sample_fourth_down_states
+from time import time
+import numpy as np
+import os
+
+class TreeEnsemble:
+    # NumPy evaluator for a fitted RandomForestClassifier, a child index < 0 points at leaf -(index + 1)
+    def __init__(self, classes: np.ndarray, tree_roots: np.ndarray, feature: np.ndarray, threshold: np.ndarray,
+                 children_left: np.ndarray, children_right: np.ndarray, leaf_counts: np.ndarray):
+        self.classes_ = classes
+        self.tree_roots = tree_roots
+        self.feature = feature
+        self.threshold = threshold
+        self.children_left = children_left
+        self.children_right = children_right
+        self.leaf_counts = leaf_counts
+
+        leaf_totals = leaf_counts.sum(axis=1, dtype=np.float64)[:, np.newaxis]
+        leaf_totals[leaf_totals == 0.0] = 1.0
+        self.leaf_proba = leaf_counts.astype(np.float64) / leaf_totals
+        # Python lists of the same arrays for predict_state, which walks a single state down one tree at a time
+        self.node_lists = (feature.tolist(), threshold.tolist(), children_left.tolist(), children_right.tolist())
+        self.tree_root_list = tree_roots.tolist()
+        self.leaf_proba_list = self.leaf_proba.tolist()
+        self.class_list = classes.tolist()
+
+    def predict_state(self, game_seconds_remaining: float, half_seconds_remaining: float, ydstogo: float,
+                      yardline_100: float, score_differential: float) -> int:
+        # Same result as predict on one state
+        state = [float(np.float32(value)) for value in (game_seconds_remaining, half_seconds_remaining, ydstogo, yardline_100, score_differential)]
+        feature, threshold, children_left, children_right = self.node_lists
+        proba = [0.0] * len(self.class_list)
+        for node in self.tree_root_list:
+            while node >= 0:
+                node = children_left[node] if state[feature[node]] <= threshold[node] else children_right[node]
+            proba = [total + leaf_proba for total, leaf_proba in zip(proba, self.leaf_proba_list[-(node + 1)])]
+        proba = [total / len(self.tree_root_list) for total in proba]
+        return int(self.class_list[proba.index(max(proba))])
+
+    def predict(self, states) -> np.ndarray:
+        # Accepts a DataFrame with the forest's feature columns or an (n, 5) array in FOURTH_DOWN_FEATURES order
+        return self.classes_[np.argmax(self.predict_proba(states), axis=1)]
+
+    def predict_proba(self, states) -> np.ndarray:
+        if hasattr(states, "columns"):
+            states = states[list(FOURTH_DOWN_FEATURES)].to_numpy()
+        states = np.asarray(states, dtype=np.float32)
+        num_states = len(states)
+        num_trees = len(self.tree_roots)
+
+        # Walk every (state, tree) pair down one level per iteration until all of them sit on a leaf
+        nodes = np.broadcast_to(self.tree_roots, (num_states, num_trees)).copy()
+        state_rows = np.broadcast_to(np.arange(num_states)[:, np.newaxis], (num_states, num_trees))
+        internal = nodes >= 0
+        while internal.any():
+            active_nodes = nodes[internal]
+            go_left = states[state_rows[internal], self.feature[active_nodes]] <= self.threshold[active_nodes]
+            nodes[internal] = np.where(go_left, self.children_left[active_nodes], self.children_right[active_nodes])
+            internal = nodes >= 0
+
+        tree_proba = self.leaf_proba[-(nodes + 1)]
+        proba = np.zeros((num_states, len(self.classes_)))
+        for tree in range(num_trees):
+            proba += tree_proba[:, tree]
+        return proba / num_trees
+
+    def save(self, path: str) -> None:
+        np.savez(path, classes=self.classes_, tree_roots=self.tree_roots, feature=self.feature, threshold=self.threshold,
+                 children_left=self.children_left, children_right=self.children_right, leaf_counts=self.leaf_counts)
+
+    @classmethod
+    def load(cls, path: str) -> "TreeEnsemble":
+        with np.load(path) as ensemble_data:
+            return cls(ensemble_data["classes"], ensemble_data["tree_roots"], ensemble_data["feature"], ensemble_data["threshold"],
+                       ensemble_data["children_left"], ensemble_data["children_right"], ensemble_data["leaf_counts"])
+
+    def get_size_in_bytes(self) -> int:
+        return sum(array.nbytes for array in (self.classes_, self.tree_roots, self.feature, self.threshold,
+                                              self.children_left, self.children_right, self.leaf_counts))
+
+def export_tree_ensemble(fourth_down_model) -> TreeEnsemble:
+    if list(fourth_down_model.feature_names_in_) != list(FOURTH_DOWN_FEATURES) or fourth_down_model.n_outputs_ != 1:
+        raise ValueError("Only single output forests trained on the fourth down features can be exported")
+
+    tree_roots, feature, threshold, children_left, children_right, leaf_counts = [], [], [], [], [], []
+    num_nodes = 0
+    num_leaves = 0
+    for estimator in fourth_down_model.estimators_:
+        tree = estimator.tree_
+        is_leaf = tree.children_left < 0
+        # Internal nodes keep their position in the tree, leaves are renumbered as -(leaf index + 1)
+        node_index = np.where(is_leaf, -(num_leaves + np.cumsum(is_leaf)), num_nodes + np.cumsum(~is_leaf) - 1)
+        internal_nodes = np.flatnonzero(~is_leaf)
+
+        tree_roots.append(node_index[0])
+        feature.append(tree.feature[internal_nodes])
+        threshold.append(tree.threshold[internal_nodes])
+        children_left.append(node_index[tree.children_left[internal_nodes]])
+        children_right.append(node_index[tree.children_right[internal_nodes]])
+        leaf_counts.append(tree.value[is_leaf, 0, :])
+        num_nodes += len(internal_nodes)
+        num_leaves += int(is_leaf.sum())
+
+    leaf_counts = np.concatenate(leaf_counts)
+    # Bootstrapped leaf values are whole sample counts, which float32 holds exactly
+    if np.array_equal(leaf_counts.astype(np.float32), leaf_counts):
+        leaf_counts = leaf_counts.astype(np.float32)
+    return TreeEnsemble(np.asarray(fourth_down_model.classes_), np.array(tree_roots, dtype=np.int32),
+                        np.concatenate(feature).astype(np.int8), np.concatenate(threshold),
+                        np.concatenate(children_left).astype(np.int32), np.concatenate(children_right).astype(np.int32),
+                        leaf_counts)
+
+def export_tree_ensembles_for_models(model_names: list[str], num_check_states: int = 200000) -> None:
+    # Imported here since the registry itself loads exported forests from this module
+    from nfl_simulation_engine_lite.fourth_down_models.models import FOURTH_DOWN_MODEL_DIR, get_fourth_down_model, get_fourth_down_model_path
+
+    for model_name in model_names:
+        export_start = time()
+        fourth_down_model = get_fourth_down_model(model_name)
+        tree_ensemble = export_tree_ensemble(fourth_down_model)
+        check_states = sample_fourth_down_states(num_check_states, np.random.default_rng(0))
+        mismatches = np.count_nonzero(tree_ensemble.predict(check_states) != fourth_down_model.predict(check_states))
+        if mismatches > 0:
+            raise ValueError(f"Exported {model_name} forest disagrees with the original on {mismatches} states")
+        tree_ensemble.save(os.path.join(FOURTH_DOWN_MODEL_DIR, f"{model_name}_4th_down_playcall_forest.npz"))
+        print(f"Exported {model_name} forest in {round(time() - export_start, 2)} seconds: "
+              f"{tree_ensemble.get_size_in_bytes()} bytes of arrays vs a {os.path.getsize(get_fourth_down_model_path(model_name))} byte pickle.")
+
+if __name__ == "__main__":
+    export_tree_ensembles_for_models(["v1", "v2", "v2a"])
@@ -0,0 +1,224 @@
+from nfl_simulation_engine_lite.game_model.game_model import AbstractGameModel, PLAY_TYPES, RUN, PASS, PUNT, FIELD_GOAL
+from nfl_simulation_engine_lite.team.team import Team
+import numpy as np
+
+TEAM_STAT_COUNTERS = ["plays", "run_plays", "pass_plays", "pass_cmps", "sacks", "rush_yards", "pass_yards",
+                      "rush_tds", "pass_tds", "turnovers", "fg_attempts", "fg_makes"]
+
+class BatchGameEngine:
+    # Simulates many games of one matchup in lockstep, with the rules of GameEngine applied with boolean masks
+    def __init__(self, home_team: Team, away_team: Team, game_model: AbstractGameModel, num_games: int, rng: np.random.Generator = None,
+                 featured_game_index: int = None, track_featured_game: bool = True):
+        if not game_model.supports_batch_simulation():
+            raise ValueError(f"Game model {game_model.get_model_code()} does not support batch simulation")
+        self.home_team = home_team
+        self.away_team = away_team
+
+        game_model.set_home_team(home_team)
+        game_model.set_away_team(away_team)
+        self.game_model = game_model
+        home_team.setup_stat_distributions(game_model.get_model_code())
+        away_team.setup_stat_distributions(game_model.get_model_code())
+        game_model.init_batch_simulation()
+
+        self.num_games = num_games
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.game_state = self.initialize_game_state()
+        self.team_stats = {counter: np.zeros((num_games, 2)) for counter in TEAM_STAT_COUNTERS}
+
+        # One game is tracked play by play so it can be featured in detail on the frontend, a random one unless given
+        self.featured_game_index = None
+        if track_featured_game:
+            self.featured_game_index = featured_game_index if featured_game_index is not None else int(self.rng.integers(num_games))
+        self.featured_play_log = []
+
+    def initialize_game_state(self) -> dict:
+        return {
+            "quarter": np.ones(self.num_games, dtype=np.int64),
+            "game_seconds_remaining": np.full(self.num_games, 3600, dtype=np.int64),
+            "quarter_seconds_remaining": np.full(self.num_games, 900, dtype=np.int64),
+            "possession": np.zeros(self.num_games, dtype=np.int64),
+            "yardline": np.full(self.num_games, 75, dtype=np.float64),
+            "down": np.ones(self.num_games, dtype=np.int64),
+            "distance": np.full(self.num_games, 10, dtype=np.float64),
+            "score": np.zeros((self.num_games, 2), dtype=np.int64),
+            "live": np.ones(self.num_games, dtype=bool),
+        }
+
+    def simulate_plays(self) -> bool:
+        live_games = np.flatnonzero(self.game_state["live"])
+        if live_games.size == 0:
+            return True
+
+        state = {key: value[live_games] for key, value in self.game_state.items()}
+        play_result = self.game_model.resolve_plays_batch(state, self.rng)
+        posteam = state["possession"].copy()
+        featured_play = self.get_featured_play(live_games, state, play_result)
+
+        touchdown = self.update_game_state(state, play_result)
+        self.update_team_stats(live_games, posteam, play_result, touchdown)
+        if featured_play is not None:
+            featured_play["touchdown"] = bool(touchdown[featured_play.pop("batch_position")])
+            self.featured_play_log.append(featured_play)
+
+        for key, value in state.items():
+            self.game_state[key][live_games] = value
+        return not self.game_state["live"].any()
+
+    def update_game_state(self, state: dict, play_result: dict) -> np.ndarray:
+        game_indices = np.arange(len(state["down"]))
+        play_type = play_result["play_type"]
+        yards_gained = play_result["yards_gained"]
+        possession = state["possession"]
+        yardline = state["yardline"]
+        down = state["down"]
+        distance = state["distance"]
+        score = state["score"]
+
+        state["quarter_seconds_remaining"] -= play_result["time_elapsed"]
+        state["game_seconds_remaining"] -= play_result["time_elapsed"]
+
+        turnover = play_result["turnover"]
+        punt = ~turnover & (play_type == PUNT)
+        field_goal = ~turnover & (play_type == FIELD_GOAL)
+        scrimmage = ~(turnover | punt | field_goal)
+
+        # Turnovers, punts and field goals always hand the ball over on 1st and 10
+        punt_yardline = yardline - yards_gained
+        punt_yardline[punt_yardline < 0] = 25 # Handle touchbacks
+        yardline[turnover] = 100 - yardline[turnover]
+        yardline[punt] = 100 - punt_yardline[punt]
+        yardline[field_goal] = 75
+        field_goal_made = field_goal & play_result["field_goal_made"]
+        score[game_indices[field_goal_made], possession[field_goal_made]] += 3
+        change_of_possession = turnover | punt | field_goal
+        down[change_of_possession] = 1
+        distance[change_of_possession] = 10
+
+        yardline[scrimmage] -= yards_gained[scrimmage]
+        first_down = scrimmage & (yards_gained >= distance)
+        turnover_on_downs = scrimmage & ~first_down & (down == 4)
+        next_down = scrimmage & ~first_down & ~turnover_on_downs
+        down[first_down] = 1
+        distance[first_down] = 10
+        down[next_down] += 1
+        distance[next_down] -= yards_gained[next_down]
+        possession[change_of_possession | turnover_on_downs] = 1 - possession[change_of_possession | turnover_on_downs]
+
+        touchdown = scrimmage & (yardline <= 0)
+        score[game_indices[touchdown], possession[touchdown]] += 7
+        safety = scrimmage & (yardline > 100)
+        score[game_indices[safety], 1 - possession[safety]] += 2
+        possession[touchdown | safety] = 1 - possession[touchdown | safety]
+        yardline[touchdown] = 75
+        yardline[safety] = 60 # Since free kicks typically don't travel as far as kickoffs
+        down[touchdown | safety] = 1
+        distance[touchdown | safety] = 10
+
+        quarter = state["quarter"]
+        quarter_over = state["quarter_seconds_remaining"] <= 0
+        halftime = quarter_over & (quarter == 2)
+        game_over = quarter_over & (quarter == 4)
+        next_quarter = quarter_over & ~game_over
+        quarter[next_quarter] += 1
+        state["quarter_seconds_remaining"][next_quarter] = 900
+        possession[halftime] = 1
+        yardline[halftime] = 75
+        down[halftime] = 1
+        distance[halftime] = 10
+        state["live"][game_over] = False
+        return touchdown
+
+    def update_team_stats(self, live_games: np.ndarray, posteam: np.ndarray, play_result: dict, touchdown: np.ndarray) -> None:
+        play_type = play_result["play_type"]
+        yards_gained = play_result["yards_gained"]
+        run_play = play_type == RUN
+        pass_play = play_type == PASS
+        field_goal = play_type == FIELD_GOAL
+        play_counts = {
+            "plays": 1,
+            "run_plays": run_play,
+            "pass_plays": pass_play,
+            "pass_cmps": pass_play & (yards_gained > 0),
+            "sacks": pass_play & (yards_gained < 0),
+            "rush_yards": np.where(run_play, yards_gained, 0),
+            "pass_yards": np.where(pass_play, yards_gained, 0),
+            "rush_tds": run_play & touchdown,
+            "pass_tds": pass_play & touchdown,
+            "turnovers": play_result["turnover"],
+            "fg_attempts": field_goal,
+            "fg_makes": field_goal & play_result["field_goal_made"],
+        }
+        for counter, count in play_counts.items():
+            self.team_stats[counter][live_games, posteam] += count
+
+    def get_featured_play(self, live_games: np.ndarray, state: dict, play_result: dict) -> dict:
+        if self.featured_game_index is None:
+            return None
+        batch_position = np.searchsorted(live_games, self.featured_game_index)
+        if batch_position >= len(live_games) or live_games[batch_position] != self.featured_game_index:
+            return None
+
+        team_names = (self.home_team.name, self.away_team.name)
+        posteam = state["possession"][batch_position]
+        play_type = PLAY_TYPES[play_result["play_type"][batch_position]]
+        score = state["score"][batch_position]
+        return {
+            "batch_position": batch_position,
+            "play_type": play_type,
+            "field_goal_made": bool(play_result["field_goal_made"][batch_position]) if play_type == "field_goal" else None,
+            "yards_gained": float(play_result["yards_gained"][batch_position]),
+            "time_elapsed": int(play_result["time_elapsed"][batch_position]),
+            "quarter": int(state["quarter"][batch_position]),
+            "quarter_seconds_remaining": int(state["quarter_seconds_remaining"][batch_position]),
+            "turnover": bool(play_result["turnover"][batch_position]),
+            "posteam": team_names[posteam],
+            "game_seconds_remaining": int(state["game_seconds_remaining"][batch_position]),
+            "yardline": float(state["yardline"][batch_position]),
+            "down": int(state["down"][batch_position]),
+            "distance": float(state["distance"][batch_position]),
+            "score": {team_names[0]: int(score[0]), team_names[1]: int(score[1])},
+            "posteam_score": int(score[posteam]),
+        }
+
+    def run_simulations(self) -> dict:
+        while True:
+            all_games_over = self.simulate_plays()
+            if all_games_over:
+                break
+        return self.get_simulation_summary()
+
+    def get_simulation_summary(self) -> dict:
+        final_scores = self.game_state["score"]
+        return {
+            "final_scores": final_scores,
+            "home_wins": int(np.count_nonzero(final_scores[:, 0] > final_scores[:, 1])),
+            "featured_game_index": self.featured_game_index,
+            "featured_play_log": self.featured_play_log,
+            self.home_team.name: self.generate_team_stats_summary(0),
+            self.away_team.name: self.generate_team_stats_summary(1),
+        }
+
+    def generate_team_stats_summary(self, team_index: int) -> dict:
+        team_stats = {counter: values[:, team_index] for counter, values in self.team_stats.items()}
+        team_name = self.home_team.name if team_index == 0 else self.away_team.name
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            fg_pct = np.round(100 * (team_stats["fg_makes"] / team_stats["fg_attempts"]), 2)
+            return {
+                "team": np.full(self.num_games, team_name),
+                "score": self.game_state["score"][:, team_index],
+                "run_rate": np.round(team_stats["run_plays"] / team_stats["plays"], 2),
+                "pass_rate": np.round(team_stats["pass_plays"] / team_stats["plays"], 2),
+                "pass_cmp_rate": np.round(team_stats["pass_cmps"] / team_stats["pass_plays"], 2),
+                "pass_yards": team_stats["pass_yards"],
+                "passing_tds": team_stats["pass_tds"],
+                "sacks_allowed": team_stats["sacks"],
+                "pass_yards_per_play": np.round(team_stats["pass_yards"] / team_stats["pass_plays"], 2),
+                "rushing_attempts": team_stats["run_plays"],
+                "rushing_yards": team_stats["rush_yards"],
+                "rushing_tds": team_stats["rush_tds"],
+                "rush_yards_per_play": np.round(team_stats["rush_yards"] / team_stats["run_plays"], 2),
+                "total_turnovers": team_stats["turnovers"],
+                "fg_pct": np.where(team_stats["fg_attempts"] > 0, fg_pct, np.nan),
+            }
@@ -1,212 +1,277 @@
+from nfl_simulation_engine_lite.game_engine.game_state import GameState, PlayResult, HOME, AWAY
 from nfl_simulation_engine_lite.game_model.prototype_game_model import PrototypeGameModel
 from nfl_simulation_engine_lite.team.team import Team
-import pandas as pd
+from nfl_simulation_engine_lite.utils.random_stream import RandomStream, PairedRandomStream, StratifiedDraws, SAMPLING_SCHEMES, get_game_generator, get_paired_game_stream
+import numpy as np
+
+# How much of a simulated game is recorded: everything, or only the final score and the winner
+OUTPUT_LEVELS = ("full", "scores")
 
 class GameEngine:
-    def __init__(self, home_team: Team, away_team: Team, game_model=PrototypeGameModel()):
+    def __init__(self, home_team: Team, away_team: Team, game_model=PrototypeGameModel(), rng: np.random.Generator = None, paired: bool = False,
+                 sampling: str = "plain"):
+        if sampling not in SAMPLING_SCHEMES:
+            raise ValueError(f"Unknown sampling scheme: {sampling}, expected one of {SAMPLING_SCHEMES}")
         self.home_team = home_team
         self.away_team = away_team
-        
-        game_model.set_home_team(home_team)
-        game_model.set_away_team(away_team)
         self.game_model = game_model
-        home_team.setup_stat_distributions(game_model.get_model_code())
-        away_team.setup_stat_distributions(game_model.get_model_code())
+        # Paired engines (and antithetic and stratified sampling) draw from a PairedRandomStream
+        self.paired = paired or sampling != "plain"
+        self.sampling = sampling
+        self.strata = None
+        self.bind_matchup()
+        self.set_rng(rng)
         
+        self.score_only = False
         self.game_state = self.initialize_game_state()
 
-    def initialize_game_state(self) -> dict:
-        if (self.game_model.get_model_code().startswith("v2")):
-            self.game_model.init_team_strength_data(rpi_enabled=True)
+    def bind_matchup(self) -> None:
+        # Everything that only depends on the matchup and the model, done once per engine rather than per game
+        self.game_model.set_home_team(self.home_team)
+        self.game_model.set_away_team(self.away_team)
+        self.home_team.setup_stat_distributions(self.game_model.get_model_code())
+        self.away_team.setup_stat_distributions(self.game_model.get_model_code())
+        self.game_model.init_matchup()
 
-        return {
-            "quarter": 1,
-            "game_seconds_remaining": 3600,
-            "quarter_seconds_remaining": 900, 
-            "possession_team": self.home_team, 
-            "defense_team": self.away_team,
-            "yardline": 75, 
-            "down": 1,
-            "distance": 10,
-            "score": {self.home_team.name: 0, self.away_team.name: 0},
-            "play_log": [],
-        }
+    def set_rng(self, rng: np.random.Generator) -> None:
+        # Paired engines can also be given the game's PairedRandomStream itself
+        if self.paired:
+            random_stream = rng if isinstance(rng, PairedRandomStream) else PairedRandomStream(rng)
+            self.game_model.set_rng(random_stream)
+            self.home_team.set_rng(random_stream.sampler_generator)
+            self.away_team.set_rng(random_stream.sampler_generator)
+        elif rng is not None:
+            self.game_model.set_rng(RandomStream(rng))
+            self.home_team.set_rng(rng)
+            self.away_team.set_rng(rng)
+
+    def initialize_game_state(self) -> GameState:
+        return GameState(self.home_team, self.away_team)
+
+    def reset(self, rng: np.random.Generator = None) -> None:
+        # Gets the engine ready for another game of the same matchup
+        if self.game_model.get_home_team() is not self.home_team or self.game_model.get_away_team() is not self.away_team:
+            self.bind_matchup()
+        self.set_rng(rng)
+        self.game_state.reset()
+
+    def run_many(self, num_simulations: int, seed: int = None, start_index: int = 0, output_level: str = "full", play_records: bool = False):
+        # Yields the summaries of games start_index to start_index + num_simulations - 1 of a run
+        if self.sampling != "plain" and seed is None:
+            raise ValueError(f"{self.sampling.capitalize()} sampling needs a seeded run")
+        if self.sampling == "stratified" and (self.strata is None or self.strata.seed != seed):
+            self.strata = StratifiedDraws(seed)
+        for game_index in range(start_index, start_index + num_simulations):
+            if self.sampling != "plain":
+                self.reset(get_paired_game_stream(seed, game_index, self.sampling, self.strata))
+            else:
+                self.reset(get_game_generator(seed, game_index))
+            yield self.run_simulation(output_level=output_level, play_records=play_records)
     
-    def simulate_play(self) -> dict:
-        play_result = self.game_model.resolve_play(self.game_state)
-        play_result["game_seconds_remaining"] = self.game_state["game_seconds_remaining"]
-        play_result["yardline"] = self.game_state["yardline"]
-        play_result["down"] = self.game_state["down"]
-        play_result["distance"] = self.game_state["distance"]
-        play_result["score"] = self.game_state["score"].copy()
-        play_result["posteam_score"] = self.game_state["score"][self.game_state["possession_team"].name]
+    def simulate_play(self) -> PlayResult:
+        game_state = self.game_state
+        if self.paired:
+            self.game_model.rng.start_play(game_state.possession)
+        play_result = self.game_model.resolve_play(game_state)
+        if self.score_only:
+            return play_result
+        play_result.quarter = game_state.quarter
+        play_result.quarter_seconds_remaining = game_state.quarter_seconds_remaining
+        play_result.game_seconds_remaining = game_state.game_seconds_remaining
+        play_result.yardline = game_state.yardline
+        play_result.down = game_state.down
+        play_result.distance = game_state.distance
+        play_result.home_score, play_result.away_score = game_state.score
         return play_result
     
-    def update_game_state(self, play_result: dict) -> bool:
+    def update_game_state(self, play_result: PlayResult) -> bool:
         # Update game state based on play result
         # Update yardline, down, distance, score, time remaining, etc.
         # Append play result to play log
-        self.game_state["quarter_seconds_remaining"] -= play_result["time_elapsed"]
-        self.game_state["game_seconds_remaining"] -= play_result["time_elapsed"]
+        game_state = self.game_state
+        game_state.quarter_seconds_remaining -= play_result.time_elapsed
+        game_state.game_seconds_remaining -= play_result.time_elapsed
 
-        if (play_result["turnover"]):
+        if (play_result.turnover):
             self.simulate_turnover()
-        elif (play_result["play_type"] == "punt"):
+        elif (play_result.play_type == "punt"):
             self.simulate_punt(play_result)
-        elif (play_result["play_type"] == "field_goal"):
+        elif (play_result.play_type == "field_goal"):
             self.simulate_field_goal(play_result)
         else:
-            self.game_state["yardline"] -= play_result["yards_gained"]
+            game_state.yardline -= play_result.yards_gained
 
-            if (play_result["yards_gained"] >= self.game_state["distance"]): # Gained a first down
-                self.game_state["down"] = 1
-                self.game_state["distance"] = 10
-            elif (play_result["yards_gained"] < self.game_state["distance"] and self.game_state["down"] == 4): # Turnover on downs
+            if (play_result.yards_gained >= game_state.distance): # Gained a first down
+                game_state.down = 1
+                game_state.distance = 10
+            elif (play_result.yards_gained < game_state.distance and game_state.down == 4): # Turnover on downs
                 self.switch_possession()
             else:
-                self.game_state["down"] += 1
-                self.game_state["distance"] -= play_result["yards_gained"]
+                game_state.down += 1
+                game_state.distance -= play_result.yards_gained
 
-            if (self.game_state["yardline"] <= 0): # Touchdown
-                self.game_state["score"][self.game_state["possession_team"].name] += 7
+            if (game_state.yardline <= 0): # Touchdown
+                game_state.score[game_state.possession] += 7
                 self.switch_possession()
-                self.game_state["yardline"] = 75
-                self.game_state["down"] = 1
-                self.game_state["distance"] = 10
-                play_result["touchdown"] = True
-            elif (self.game_state["yardline"] > 100): # Safety
-                self.game_state["score"][self.game_state["defense_team"].name] += 2
+                game_state.yardline = 75
+                game_state.down = 1
+                game_state.distance = 10
+                play_result.touchdown = True
+            elif (game_state.yardline > 100): # Safety
+                game_state.score[game_state.defense] += 2
                 self.switch_possession()
-                self.game_state["yardline"] = 60 # Since free kicks typically don't travel as far as kickoffs
-                self.game_state["down"] = 1
-                self.game_state["distance"] = 10
+                game_state.yardline = 60 # Since free kicks typically don't travel as far as kickoffs
+                game_state.down = 1
+                game_state.distance = 10
 
-        self.game_state["play_log"].append(play_result)
+        if not self.score_only:
+            self.update_team_stats(play_result)
+            game_state.play_log.append(play_result)
 
-        if (self.game_state["quarter_seconds_remaining"] <= 0 and self.game_state["quarter"] not in [2, 4]):
-            self.game_state["quarter"] += 1
-            self.game_state["quarter_seconds_remaining"] = 900
+        if (game_state.quarter_seconds_remaining <= 0 and game_state.quarter not in [2, 4]):
+            game_state.quarter += 1
+            game_state.quarter_seconds_remaining = 900
             return False
-        elif (self.game_state["quarter_seconds_remaining"] <= 0 and self.game_state["quarter"] == 2):
+        elif (game_state.quarter_seconds_remaining <= 0 and game_state.quarter == 2):
             self.handle_halftime()
             return False
-        elif (self.game_state["quarter_seconds_remaining"] <= 0 and self.game_state["quarter"] == 4):
-            self.game_state["play_log"].append(play_result)
+        elif (game_state.quarter_seconds_remaining <= 0 and game_state.quarter == 4):
             return True
+
+    def update_team_stats(self, play_result: PlayResult) -> None:
+        team_stats = self.game_state.team_stats[play_result.posteam]
+        team_stats["plays"] += 1
+        if (play_result.turnover):
+            team_stats["turnovers"] += 1
+
+        if (play_result.play_type == "run"):
+            team_stats["run_plays"] += 1
+            team_stats["rush_yards"] += play_result.yards_gained
+            if (play_result.touchdown):
+                team_stats["rush_tds"] += 1
+        elif (play_result.play_type == "pass"):
+            team_stats["pass_plays"] += 1
+            team_stats["pass_yards"] += play_result.yards_gained
+            if (play_result.yards_gained > 0):
+                team_stats["pass_cmps"] += 1
+            elif (play_result.yards_gained < 0):
+                team_stats["sacks"] += 1
+            if (play_result.touchdown):
+                team_stats["pass_tds"] += 1
+        elif (play_result.play_type == "field_goal"):
+            team_stats["fg_attempts"] += 1
+            if (play_result.field_goal_made):
+                team_stats["fg_makes"] += 1
         
     def simulate_turnover(self):
         self.switch_possession()
-        self.game_state["yardline"] = 100 - self.game_state["yardline"]
-        self.game_state["down"] = 1
-        self.game_state["distance"] = 10
+        self.game_state.yardline = 100 - self.game_state.yardline
+        self.game_state.down = 1
+        self.game_state.distance = 10
 
-    def simulate_punt(self, play_result: dict):
+    def simulate_punt(self, play_result: PlayResult):
         self.switch_possession()
-        self.game_state["yardline"] -= play_result["yards_gained"]
-        if (self.game_state["yardline"] < 0): # Handle touchbacks
-            self.game_state["yardline"] = 25
-        self.game_state["yardline"] = 100 - self.game_state["yardline"]
-        self.game_state["down"] = 1
-        self.game_state["distance"] = 10
-
-    def simulate_field_goal(self, play_result: dict):
-        if (play_result["field_goal_made"]):
-            self.game_state["score"][self.game_state["possession_team"].name] += 3
+        self.game_state.yardline -= play_result.yards_gained
+        if (self.game_state.yardline < 0): # Handle touchbacks
+            self.game_state.yardline = 25
+        self.game_state.yardline = 100 - self.game_state.yardline
+        self.game_state.down = 1
+        self.game_state.distance = 10
+
+    def simulate_field_goal(self, play_result: PlayResult):
+        if (play_result.field_goal_made):
+            self.game_state.score[self.game_state.possession] += 3
         self.switch_possession()
-        self.game_state["yardline"] = 75
-        self.game_state["down"] = 1
-        self.game_state["distance"] = 10
+        self.game_state.yardline = 75
+        self.game_state.down = 1
+        self.game_state.distance = 10
 
     def switch_possession(self):
-        if (self.game_state["possession_team"] == self.home_team):
-            self.game_state["possession_team"] = self.away_team
-            self.game_state["defense_team"] = self.home_team
-        else:
-            self.game_state["possession_team"] = self.home_team
-            self.game_state["defense_team"] = self.away_team
+        self.game_state.possession = 1 - self.game_state.possession
     
     def handle_halftime(self):
-        self.game_state["quarter"] += 1
-        self.game_state["quarter_seconds_remaining"] = 900
-        self.game_state["possession_team"] = self.away_team
-        self.game_state["defense_team"] = self.home_team
-        self.game_state["yardline"] = 75
-        self.game_state["down"] = 1
-        self.game_state["distance"] = 10
-
-    def run_simulation(self, test_mode=False) -> dict:
+        self.game_state.quarter += 1
+        self.game_state.quarter_seconds_remaining = 900
+        self.game_state.possession = AWAY
+        self.game_state.yardline = 75
+        self.game_state.down = 1
+        self.game_state.distance = 10
+
+    def run_simulation(self, test_mode=False, output_level="full", play_records=False) -> dict:
+        if output_level not in OUTPUT_LEVELS:
+            raise ValueError(f"Unknown output level: {output_level}, expected one of {OUTPUT_LEVELS}")
+        # Score-only games skip the play log and team stats, they play out exactly the same otherwise
+        self.score_only = output_level == "scores"
         while True:
             play_result = self.simulate_play()
             game_over = self.update_game_state(play_result)
             if game_over:
                 break
-        return self.get_game_summary(test_mode)
-
-    def get_game_summary(self, test_mode: bool) -> dict:
-        # create play log dataframe and save it to a csv file
-        play_log_df = pd.DataFrame(self.game_state["play_log"])
+        if self.score_only:
+            return self.get_final_score_summary()
+        return self.get_game_summary(test_mode, play_records)
 
-        home_team_df = play_log_df[play_log_df["posteam"] == self.home_team.name]
-        away_team_df = play_log_df[play_log_df["posteam"] == self.away_team.name]
+    def get_final_score_summary(self) -> dict:
+        home_score, away_score = self.game_state.score
+        winner = None
+        if home_score > away_score:
+            winner = self.home_team.name
+        elif away_score > home_score:
+            winner = self.away_team.name
+        return {
+            "final_score": self.game_state.get_score_dict(),
+            "winner": winner
+        }
 
-        game_summary_dict = {
-            "final_score": self.game_state["score"],
-            "num_plays_in_game": len(self.game_state["play_log"]),
-            "play_log": self.game_state["play_log"],
-            self.home_team.name: self.generate_team_stats_summary(self.home_team.name, home_team_df),
-            self.away_team.name: self.generate_team_stats_summary(self.away_team.name, away_team_df)
+    def get_game_summary(self, test_mode: bool, play_records: bool = False) -> dict:
+        # play_records leaves the play log as PlayResult records, for callers that only convert the plays they keep
+        play_log = self.game_state.play_log if play_records else self.get_play_log()
+        return {
+            "final_score": self.game_state.get_score_dict(),
+            "num_plays_in_game": len(self.game_state.play_log),
+            "play_log": play_log,
+            self.home_team.name: self.generate_team_stats_summary(HOME),
+            self.away_team.name: self.generate_team_stats_summary(AWAY)
         }
 
-        ## TODO: Figure out whether this is even needed
-        # if (not test_mode):
-        #     play_log_df.to_csv(f"simulation_logs/{self.home_team.name}_{self.away_team.name}_play_log.csv", index=True)
-        #     home_team_stats_df = pd.DataFrame([game_summary_dict[self.home_team.name]])
-        #     away_team_stats_df = pd.DataFrame([game_summary_dict[self.away_team.name]])
-        #     team_stats_df = pd.concat([home_team_stats_df, away_team_stats_df])
-        #     team_stats_df.to_csv(f"simulation_logs/{self.home_team.name}_{self.away_team.name}_team_stats.csv", index=False)
+    def get_play_log(self) -> list:
+        team_names = (self.home_team.name, self.away_team.name)
+        return [play_result.to_dict(team_names) for play_result in self.game_state.play_log]
 
-        return game_summary_dict
-    
-    def generate_team_stats_summary(self, team_name: str, team_df: pd.DataFrame) -> dict:
-        team_run_df = team_df[team_df["play_type"] == "run"]
-        team_pass_df = team_df[team_df["play_type"] == "pass"]
-        team_fg_df = team_df[team_df["play_type"] == "field_goal"]
-        total_plays = team_df["play_type"].count()
-        total_run_plays = team_run_df["play_type"].count()
-        team_rush_yards = team_run_df["yards_gained"].sum()
-        team_rush_tds = team_run_df[team_run_df["touchdown"] == True]["touchdown"].count()
-        total_pass_plays = team_pass_df["play_type"].count()
-        team_pass_cmps = team_pass_df[team_pass_df["yards_gained"] > 0]["yards_gained"].count()
-        team_pass_yards = team_pass_df["yards_gained"].sum()
-        team_pass_tds = team_pass_df[team_pass_df["touchdown"] == True]["touchdown"].count()
-        team_total_turnovers = team_df[team_df["turnover"] == True]["turnover"].count()
-        team_total_sacks = team_pass_df[team_pass_df["yards_gained"] < 0]["yards_gained"].count()
-        team_fg_attempts = team_fg_df["play_type"].count()
-        team_fg_makes = team_fg_df[team_fg_df["field_goal_made"] == True]["field_goal_made"].count()
-
-        run_rate = round(total_run_plays / total_plays, 2)
-        pass_rate = round(total_pass_plays / total_plays, 2)
-        pass_cmp_rate = round(team_pass_cmps / total_pass_plays, 2)
-        rush_yards_per_play = round(team_rush_yards / total_run_plays, 2)
-        pass_yards_per_play = round(team_pass_yards / total_pass_plays, 2)
+    def generate_team_stats_summary(self, team_index: int) -> dict:
+        team_stats = self.game_state.team_stats[team_index]
+        total_plays = team_stats["plays"]
+        total_run_plays = team_stats["run_plays"]
+        total_pass_plays = team_stats["pass_plays"]
+
+        run_rate = self.get_rounded_rate(total_run_plays, total_plays)
+        pass_rate = self.get_rounded_rate(total_pass_plays, total_plays)
+        pass_cmp_rate = self.get_rounded_rate(team_stats["pass_cmps"], total_pass_plays)
+        rush_yards_per_play = self.get_rounded_rate(team_stats["rush_yards"], total_run_plays)
+        pass_yards_per_play = self.get_rounded_rate(team_stats["pass_yards"], total_pass_plays)
         fg_pct = None
-        if (team_fg_attempts > 0):
-            fg_pct = round(100 * (team_fg_makes / team_fg_attempts), 2)
+        if (team_stats["fg_attempts"] > 0):
+            fg_pct = round(100 * (team_stats["fg_makes"] / team_stats["fg_attempts"]), 2)
 
         return {
-            "team": team_df["posteam"].iloc[0],
-            "score": self.game_state["score"][team_name],
+            "team": self.game_state.teams[team_index].name,
+            "score": self.game_state.score[team_index],
             "run_rate": run_rate,
             "pass_rate": pass_rate,
             "pass_cmp_rate": pass_cmp_rate,
-            "pass_yards": team_pass_yards,
-            "passing_tds": team_pass_tds,
-            "sacks_allowed": team_total_sacks,
+            "pass_yards": team_stats["pass_yards"],
+            "passing_tds": team_stats["pass_tds"],
+            "sacks_allowed": team_stats["sacks"],
             "pass_yards_per_play": pass_yards_per_play,
             "rushing_attempts": total_run_plays,
-            "rushing_yards": team_rush_yards,
-            "rushing_tds": team_rush_tds,
+            "rushing_yards": team_stats["rush_yards"],
+            "rushing_tds": team_stats["rush_tds"],
             "rush_yards_per_play": rush_yards_per_play,
-            "total_turnovers": team_total_turnovers,
+            "total_turnovers": team_stats["turnovers"],
             "fg_pct": fg_pct
-        }
\ No newline at end of file
+        }
+
+    @staticmethod
+    def get_rounded_rate(count: float, total: int) -> float:
+        # NaN when there is nothing to divide by, as the per-play averages have always been
+        return round(count / total, 2) if total > 0 else np.nan
@@ -0,0 +1,120 @@
+from nfl_simulation_engine_lite.team.team import Team
+
+# Teams are referred to by their index into GameState.teams
+HOME, AWAY = 0, 1
+
+def initialize_team_stats() -> dict:
+    # Box score counters, kept up to date play by play so the game summary doesn't need the play log
+    return {
+        "plays": 0,
+        "run_plays": 0,
+        "rush_yards": 0,
+        "rush_tds": 0,
+        "pass_plays": 0,
+        "pass_cmps": 0,
+        "pass_yards": 0,
+        "pass_tds": 0,
+        "sacks": 0,
+        "turnovers": 0,
+        "fg_attempts": 0,
+        "fg_makes": 0,
+    }
+
+class GameState:
+    # State of one simulated game, possession and score are indexed by HOME / AWAY
+    __slots__ = ("teams", "quarter", "game_seconds_remaining", "quarter_seconds_remaining", "possession",
+                 "yardline", "down", "distance", "score", "play_log", "team_stats")
+
+    def __init__(self, home_team: Team, away_team: Team, quarter: int = 1, game_seconds_remaining: int = 3600,
+                 quarter_seconds_remaining: int = 900, possession: int = HOME, yardline: float = 75, down: int = 1,
+                 distance: float = 10, score: list = None):
+        self.teams = (home_team, away_team)
+        self.quarter = quarter
+        self.game_seconds_remaining = game_seconds_remaining
+        self.quarter_seconds_remaining = quarter_seconds_remaining
+        self.possession = possession
+        self.yardline = yardline
+        self.down = down
+        self.distance = distance
+        self.score = score if score is not None else [0, 0]
+        self.play_log = []
+        self.team_stats = [initialize_team_stats(), initialize_team_stats()]
+
+    def reset(self) -> None:
+        # Back to kickoff, the play log is replaced since the last game's summary still refers to it
+        self.quarter = 1
+        self.game_seconds_remaining = 3600
+        self.quarter_seconds_remaining = 900
+        self.possession = HOME
+        self.yardline = 75
+        self.down = 1
+        self.distance = 10
+        self.score[HOME] = self.score[AWAY] = 0
+        self.play_log = []
+        for team_stats in self.team_stats:
+            for stat in team_stats:
+                team_stats[stat] = 0
+
+    @property
+    def defense(self) -> int:
+        return 1 - self.possession
+
+    @property
+    def possession_team(self) -> Team:
+        return self.teams[self.possession]
+
+    @property
+    def defense_team(self) -> Team:
+        return self.teams[1 - self.possession]
+
+    def get_score_dict(self) -> dict:
+        return {self.teams[HOME].name: self.score[HOME], self.teams[AWAY].name: self.score[AWAY]}
+
+class PlayResult:
+    # One resolved play, the engine fills in the situation fields left as None
+    __slots__ = ("play_type", "field_goal_made", "yards_gained", "time_elapsed", "turnover", "touchdown", "posteam",
+                 "quarter", "quarter_seconds_remaining", "game_seconds_remaining", "yardline", "down", "distance",
+                 "home_score", "away_score")
+
+    def __init__(self, play_type: str, yards_gained: float, time_elapsed: int, posteam: int,
+                 field_goal_made: bool = None, turnover: bool = False):
+        self.play_type = play_type
+        self.field_goal_made = field_goal_made
+        self.yards_gained = yards_gained
+        self.time_elapsed = time_elapsed
+        self.turnover = turnover
+        # Updated after the play is processed in update_game_state
+        self.touchdown = False
+        self.posteam = posteam
+        self.quarter = None
+        self.quarter_seconds_remaining = None
+        self.game_seconds_remaining = None
+        self.yardline = None
+        self.down = None
+        self.distance = None
+        self.home_score = None
+        self.away_score = None
+
+    def to_dict(self, team_names: tuple) -> dict:
+        # The play as it appears in a game summary's play log, with teams referred to by name
+        score = (self.home_score, self.away_score)
+        return {
+            "play_type": self.play_type,
+            "field_goal_made": self.field_goal_made,
+            "yards_gained": self.yards_gained,
+            "time_elapsed": self.time_elapsed,
+            "quarter": self.quarter,
+            "quarter_seconds_remaining": self.quarter_seconds_remaining,
+            "turnover": self.turnover,
+            "touchdown": self.touchdown,
+            "posteam": team_names[self.posteam],
+            "game_seconds_remaining": self.game_seconds_remaining,
+            "yardline": self.yardline,
+            "down": self.down,
+            "distance": self.distance,
+            "score": {team_names[HOME]: score[HOME], team_names[AWAY]: score[AWAY]},
+            "posteam_score": score[self.posteam],
+        }
+
+    def __repr__(self) -> str:
+        return f"PlayResult({', '.join(f'{field}={getattr(self, field)!r}' for field in self.__slots__)})"
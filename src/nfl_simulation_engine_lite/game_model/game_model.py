@@ -1,6 +1,13 @@
 from abc import ABC, abstractmethod
 from nfl_simulation_engine_lite.team.team import Team
-from functools import lru_cache
+from nfl_simulation_engine_lite.game_engine.game_state import GameState, PlayResult
+from nfl_simulation_engine_lite.fourth_down_models.models import get_fourth_down_forest, get_fourth_down_lookup_table, is_fourth_down_model_available
+from nfl_simulation_engine_lite.utils.random_stream import RandomStream
+import numpy as np
+
+# Integer play type codes used by the batch simulation interface
+PLAY_TYPES = ("run", "pass", "punt", "field_goal", "goforit")
+RUN, PASS, PUNT, FIELD_GOAL, GOFORIT = range(len(PLAY_TYPES))
 
 class AbstractGameModel(ABC):
 
@@ -9,12 +16,61 @@ class AbstractGameModel(ABC):
         self.def_weight = 1 - off_weight
         self.home_team = None
         self.away_team = None
+        # Every random decision the model makes is drawn from this stream
+        self.rng = RandomStream()
+
+    def set_rng(self, rng: RandomStream) -> None:
+        self.rng = rng
 
     @abstractmethod
-    def resolve_play(self, game_state: dict) -> dict:
+    def resolve_play(self, game_state: GameState) -> PlayResult:
+        pass
+
+    def get_model_params(self) -> dict:
+        # The constructor arguments the model was built with
+        return {"off_weight": self.off_weight}
+
+    def get_model_descriptor(self) -> tuple:
+        # Hashable (model code, params) to build an identical model elsewhere, e.g. in a pool worker
+        return (self.get_model_code(), tuple(sorted(self.get_model_params().items())))
+
+    def init_matchup(self) -> None:
+        # Called once the home and away teams are set
         pass
 
-    @lru_cache(maxsize=1000)
+    def supports_batch_simulation(self) -> bool:
+        return False
+
+    def is_playable(self) -> bool:
+        # Models that call a fourth down forest need it (or the pickle it is exported from) to play a game
+        fourth_down_model_name = getattr(self, "fourth_down_model_name", None)
+        return fourth_down_model_name is None or is_fourth_down_model_available(fourth_down_model_name)
+
+    def init_batch_simulation(self) -> None:
+        pass
+
+    def resolve_plays_batch(self, batch_state: dict, rng: np.random.Generator) -> dict:
+        # Resolves one play for every game in batch_state, returns arrays of play_type, yards_gained, time_elapsed, turnover and field_goal_made
+        raise NotImplementedError(f"Game model {self.get_model_code()} does not support batch simulation")
+
+    @property
+    def fourth_down_model(self):
+        # Models only name their fourth down forest, its NumPy export is loaded from the registry on first use
+        return get_fourth_down_forest(self.fourth_down_model_name)
+
+    @property
+    def fourth_down_lookup_table(self):
+        return get_fourth_down_lookup_table(self.fourth_down_model_name)
+
+    def get_fourth_down_predictor(self):
+        # The model's random forest, or the forest's precompiled lookup table in "lookup" mode
+        if self.fourth_down_mode == "lookup":
+            return self.fourth_down_lookup_table
+        return self.fourth_down_model
+
+    def predict_4th_down_play_call(self, fourth_down_data: dict) -> int:
+        return self.get_fourth_down_predictor().predict_state(**fourth_down_data)
+
     def get_weighted_average(self, off_stat: float, def_stat: float) -> float:
         return (off_stat * self.off_weight) + (def_stat * self.def_weight)
 
@@ -28,4 +84,4 @@ class AbstractGameModel(ABC):
         self.away_team = away_team
 
     def get_away_team(self) -> Team:
-        return self.away_team
\ No newline at end of file
+        return self.away_team
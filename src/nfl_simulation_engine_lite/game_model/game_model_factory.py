@@ -7,18 +7,25 @@ from nfl_simulation_engine_lite.game_model.game_model_v2 import GameModel_V2
 from nfl_simulation_engine_lite.game_model.game_model_v2a import GameModel_V2a
 from nfl_simulation_engine_lite.game_model.game_model_v2b import GameModel_V2b
 
-def initialize_new_game_model_instance(model_code:str) -> AbstractGameModel:
+GAME_MODEL_CODES = ("proto", "v1", "v1a", "v1b", "v2", "v2a", "v2b")
+
+def initialize_new_game_model_instance(model_code:str, **model_params) -> AbstractGameModel:
     if model_code == "v1":
-        return GameModel_V1()
+        return GameModel_V1(**model_params)
     elif model_code == "v1a":
-        return GameModel_V1a()
+        return GameModel_V1a(**model_params)
     elif model_code == "v1b":
-        return GameModel_V1b()
+        return GameModel_V1b(**model_params)
     elif model_code == "v2":
-        return GameModel_V2()
+        return GameModel_V2(**model_params)
     elif model_code == "v2a":
-        return GameModel_V2a()
+        return GameModel_V2a(**model_params)
     elif model_code == "v2b":
-        return GameModel_V2b()
+        return GameModel_V2b(**model_params)
     else:
-        return PrototypeGameModel()
\ No newline at end of file
+        return PrototypeGameModel(**model_params)
+
+def initialize_game_model_from_descriptor(model_descriptor: tuple) -> AbstractGameModel:
+    # Inverse of AbstractGameModel.get_model_descriptor
+    model_code, model_params = model_descriptor
+    return initialize_new_game_model_instance(model_code, **dict(model_params))
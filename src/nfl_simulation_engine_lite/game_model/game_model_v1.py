@@ -1,81 +1,61 @@
+from nfl_simulation_engine_lite.game_engine.game_state import GameState, PlayResult
 from nfl_simulation_engine_lite.game_model.game_model import AbstractGameModel
-from nfl_simulation_engine_lite.fourth_down_models.models import v1_fdm
-import pandas as pd
-import random
 
 class GameModel_V1(AbstractGameModel):
     
-    def __init__(self, off_weight=0.595):
-        self.fourth_down_model = v1_fdm
+    def __init__(self, off_weight=0.595, fourth_down_mode="forest"):
+        self.fourth_down_model_name = "v1"
         self.fourth_down_model_column_mapping = { 0: "run", 1: "pass",
                                                 2: "punt", 3: "field_goal" }
+        self.fourth_down_mode = fourth_down_mode
         super().__init__(off_weight)
 
     def get_model_code(self) -> str:
         return "v1"
 
+    def get_model_params(self) -> dict:
+        return {"off_weight": self.off_weight, "fourth_down_mode": self.fourth_down_mode}
+
     def get_half_seconds_remaining(self, qtr: int, qtr_seconds_remaining: int) -> int:
         if qtr == 1 or qtr == 3:
             return qtr_seconds_remaining + 900
         else:
             return qtr_seconds_remaining
 
-    def handle_4th_down(self, game_state: dict) -> str:
-        posteam = game_state["possession_team"].name
-        defteam = game_state["defense_team"].name
+    def handle_4th_down(self, game_state: GameState) -> str:
         fourth_down_data = {
-            "game_seconds_remaining": game_state["game_seconds_remaining"],
-            "half_seconds_remaining": self.get_half_seconds_remaining(game_state["quarter"], game_state["quarter_seconds_remaining"]),
-            "ydstogo": game_state["distance"],
-            "yardline_100": game_state["yardline"],
-            "score_differential": game_state["score"][posteam] - game_state["score"][defteam]    
+            "game_seconds_remaining": game_state.game_seconds_remaining,
+            "half_seconds_remaining": self.get_half_seconds_remaining(game_state.quarter, game_state.quarter_seconds_remaining),
+            "ydstogo": game_state.distance,
+            "yardline_100": game_state.yardline,
+            "score_differential": game_state.score[game_state.possession] - game_state.score[game_state.defense]    
         }
-        prediction = self.fourth_down_model.predict(pd.DataFrame([fourth_down_data]))
-        return self.fourth_down_model_column_mapping[prediction[0]]
+        prediction = self.predict_4th_down_play_call(fourth_down_data)
+        return self.fourth_down_model_column_mapping[prediction]
 
-    def resolve_play(self, game_state: dict) -> dict:
-        posteam = game_state["possession_team"]
+    def resolve_play(self, game_state: GameState) -> PlayResult:
+        posteam = game_state.possession_team
         posteam_stats = posteam.get_stats()
 
-        defteam = game_state["defense_team"]
+        defteam = game_state.defense_team
         defteam_stats = defteam.get_stats()
 
-        time_elapsed = random.randint(15,40)
+        time_elapsed = self.rng.randint(15, 40, purpose="clock")
 
         play_type = None
-        if (game_state["down"] == 4):
+        if (game_state.down == 4):
             # For 4th downs, use our random forest model to determine the play call
             play_type = self.handle_4th_down(game_state)
         else:
             # If not 4th down, run normal simulation logic
-            play_type = random.choices(['run', 'pass'], [posteam_stats.run_rate, posteam_stats.pass_rate])[0]
+            play_type = self.rng.choose("run", "pass", posteam_stats.run_rate, posteam_stats.pass_rate, purpose="play_call")
 
         # Handle 4th down scenarios for punts and field goals
-        if game_state["down"] == 4 and play_type == "punt":
-            return {
-                "play_type": "punt", 
-                "field_goal_made": None,
-                "yards_gained": 40,
-                "time_elapsed": time_elapsed, 
-                "quarter": game_state["quarter"],
-                "quarter_seconds_remaining": game_state["quarter_seconds_remaining"],
-                "turnover": False,
-                "touchdown": False,
-                "posteam": posteam.name
-            }
-        elif game_state["down"] == 4 and play_type == "field_goal":
+        if game_state.down == 4 and play_type == "punt":
+            return PlayResult("punt", 40, time_elapsed, game_state.possession)
+        elif game_state.down == 4 and play_type == "field_goal":
             fg_success_rate = posteam_stats.field_goal_success_rate
-            return {
-                "play_type": "field_goal", 
-                "field_goal_made": random.choices([True, False], [fg_success_rate, 1 - fg_success_rate])[0],
-                "yards_gained": 0,
-                "time_elapsed": time_elapsed,
-                "quarter": game_state["quarter"],
-                "quarter_seconds_remaining": game_state["quarter_seconds_remaining"],  
-                "turnover": False,
-                "touchdown": False,
-                "posteam": posteam.name
-            }
+            return PlayResult("field_goal", 0, time_elapsed, game_state.possession, field_goal_made=self.rng.bernoulli(fg_success_rate, purpose="field_goal"))
 
         # Handle normal play calls (run or pass)
         off_yards_per_play = None
@@ -93,14 +73,14 @@ class GameModel_V1(AbstractGameModel):
             off_pass_cmp_rate = posteam_stats.pass_completion_rate / 100
             def_pass_cmp_rate = defteam_stats.pass_completion_rate_allowed / 100
             weighted_pass_cmp_rate = self.get_weighted_average(off_pass_cmp_rate, def_pass_cmp_rate)
-            pass_completed = random.choices([True, False], [weighted_pass_cmp_rate, 1 - weighted_pass_cmp_rate])[0]
+            pass_completed = self.rng.bernoulli(weighted_pass_cmp_rate, purpose="completion")
             if (not pass_completed):
                weighted_yards_per_play = 0 
 
         off_turnover_rate = posteam_stats.turnover_rate
         def_turnover_rate = defteam_stats.forced_turnover_rate
         weighted_turnover_rate = (0.45) * (self.get_weighted_average(off_turnover_rate, def_turnover_rate))
-        turnover_on_play = random.choices([True, False], [weighted_turnover_rate, 1 - weighted_turnover_rate])[0]
+        turnover_on_play = self.rng.bernoulli(weighted_turnover_rate, purpose="turnover")
 
         if (not turnover_on_play):
             yards_gained = weighted_yards_per_play
@@ -110,7 +90,7 @@ class GameModel_V1(AbstractGameModel):
         off_sack_rate = posteam_stats.sacks_allowed_rate
         def_sack_rate = defteam_stats.sacks_made_rate
         weighted_sack_rate = self.get_weighted_average(off_sack_rate, def_sack_rate)
-        sack_on_play = random.choices([True, False], [weighted_sack_rate, 1 - weighted_sack_rate])[0]
+        sack_on_play = self.rng.bernoulli(weighted_sack_rate, purpose="sack")
 
         if (sack_on_play and play_type == "pass"):
             off_yards_lost_per_sack = posteam_stats.sack_yards_allowed
@@ -118,14 +98,4 @@ class GameModel_V1(AbstractGameModel):
             yards_lost_on_sack = self.get_weighted_average(off_yards_lost_per_sack, def_yards_inflicted_per_sack)
             yards_gained = yards_lost_on_sack
 
-        return {
-            "play_type": play_type, 
-            "field_goal_made": None,
-            "yards_gained": yards_gained,
-            "time_elapsed": time_elapsed,
-            "quarter": game_state["quarter"],
-            "quarter_seconds_remaining": game_state["quarter_seconds_remaining"],
-            "turnover": turnover_on_play,
-            "touchdown": False, # This will be updated after the play is processed in update_game_state
-            "posteam": posteam.name
-        }
\ No newline at end of file
+        return PlayResult(play_type, yards_gained, time_elapsed, game_state.possession, turnover=turnover_on_play)
\ No newline at end of file
@@ -1,82 +1,61 @@
+from nfl_simulation_engine_lite.game_engine.game_state import GameState, PlayResult
 from nfl_simulation_engine_lite.game_model.game_model_v1 import GameModel_V1
-from nfl_simulation_engine_lite.fourth_down_models.models import v2a_fdm
-import pandas as pd
-import random
 
 class GameModel_V1a(GameModel_V1):
     
-    def __init__(self, off_weight=0.585):
-        self.fourth_down_model = v2a_fdm
+    def __init__(self, off_weight=0.585, fourth_down_mode="forest"):
+        super().__init__(off_weight, fourth_down_mode=fourth_down_mode)
+        # Set after GameModel_V1's, which would otherwise replace them with the v1 forest and its four classes
+        self.fourth_down_model_name = "v2a"
         self.fourth_down_model_column_mapping = { 0: "goforit", 1: "field_goal", 2: "punt" }
-        super().__init__(off_weight)
 
     def get_model_code(self) -> str:
         return "v1a"
 
-    def handle_4th_down(self, game_state: dict) -> str:
-        posteam = game_state["possession_team"]
+    def handle_4th_down(self, game_state: GameState) -> str:
+        posteam = game_state.possession_team
         posteam_stats = posteam.get_stats()
 
-        defteam = game_state["defense_team"]
+        defteam = game_state.defense_team
         defteam_stats = defteam.get_stats()
 
         fourth_down_data = {
-            "game_seconds_remaining": game_state["game_seconds_remaining"],
-            "half_seconds_remaining": self.get_half_seconds_remaining(game_state["quarter"], game_state["quarter_seconds_remaining"]),
-            "ydstogo": game_state["distance"],
-            "yardline_100": game_state["yardline"],
-            "score_differential": game_state["score"][posteam.name] - game_state["score"][posteam.name]    
+            "game_seconds_remaining": game_state.game_seconds_remaining,
+            "half_seconds_remaining": self.get_half_seconds_remaining(game_state.quarter, game_state.quarter_seconds_remaining),
+            "ydstogo": game_state.distance,
+            "yardline_100": game_state.yardline,
+            "score_differential": game_state.score[game_state.possession] - game_state.score[game_state.possession]    
         }
-        prediction_result = self.fourth_down_model.predict(pd.DataFrame([fourth_down_data]))
-        prediction = self.fourth_down_model_column_mapping[prediction_result[0]]
+        prediction_result = self.predict_4th_down_play_call(fourth_down_data)
+        prediction = self.fourth_down_model_column_mapping[prediction_result]
         if prediction == "goforit":
-            return random.choices(['run', 'pass'], [posteam_stats.run_rate, defteam_stats.pass_rate])[0]
+            return self.rng.choose("run", "pass", posteam_stats.run_rate, defteam_stats.pass_rate, purpose="play_call")
         else:
             return prediction
 
-    def resolve_play(self, game_state: dict) -> dict:
-        posteam = game_state["possession_team"]
+    def resolve_play(self, game_state: GameState) -> PlayResult:
+        posteam = game_state.possession_team
         posteam_stats = posteam.get_stats()
 
-        defteam = game_state["defense_team"]
+        defteam = game_state.defense_team
         defteam_stats = defteam.get_stats()
 
-        time_elapsed = random.randint(20,30)
+        time_elapsed = self.rng.randint(20, 30, purpose="clock")
 
         play_type = None
-        if (game_state["down"] == 4):
+        if (game_state.down == 4):
             # For 4th downs, use our random forest model to determine the play call
             play_type = self.handle_4th_down(game_state)
         else:
             # If not 4th down, run normal simulation logic
-            play_type = random.choices(['run', 'pass'], [posteam_stats.run_rate, posteam_stats.pass_rate])[0]
+            play_type = self.rng.choose("run", "pass", posteam_stats.run_rate, posteam_stats.pass_rate, purpose="play_call")
 
         # Handle 4th down scenarios for punts and field goals
-        if game_state["down"] == 4 and play_type == "punt":
-            return {
-                "play_type": "punt", 
-                "field_goal_made": None,
-                "yards_gained": random.randint(40,55),
-                "time_elapsed": time_elapsed, 
-                "quarter": game_state["quarter"],
-                "quarter_seconds_remaining": game_state["quarter_seconds_remaining"],
-                "turnover": False,
-                "touchdown": False,
-                "posteam": posteam.name
-            }
-        elif game_state["down"] == 4 and play_type == "field_goal":
+        if game_state.down == 4 and play_type == "punt":
+            return PlayResult("punt", self.rng.randint(40, 55, purpose="punt"), time_elapsed, game_state.possession)
+        elif game_state.down == 4 and play_type == "field_goal":
             fg_success_rate = posteam_stats.field_goal_success_rate
-            return {
-                "play_type": "field_goal", 
-                "field_goal_made": random.choices([True, False], [fg_success_rate, 1 - fg_success_rate])[0],
-                "yards_gained": 0,
-                "time_elapsed": time_elapsed,
-                "quarter": game_state["quarter"],
-                "quarter_seconds_remaining": game_state["quarter_seconds_remaining"],  
-                "turnover": False,
-                "touchdown": False,
-                "posteam": posteam.name
-            }
+            return PlayResult("field_goal", 0, time_elapsed, game_state.possession, field_goal_made=self.rng.bernoulli(fg_success_rate, purpose="field_goal"))
 
         # Handle normal play calls (run or pass)
         off_yards_per_play = None
@@ -94,14 +73,14 @@ class GameModel_V1a(GameModel_V1):
             off_pass_cmp_rate = posteam_stats.pass_completion_rate / 100
             def_pass_cmp_rate = defteam_stats.pass_completion_rate_allowed / 100
             weighted_pass_cmp_rate = self.get_weighted_average(off_pass_cmp_rate, def_pass_cmp_rate)
-            pass_completed = random.choices([True, False], [weighted_pass_cmp_rate, 1 - weighted_pass_cmp_rate])[0]
+            pass_completed = self.rng.bernoulli(weighted_pass_cmp_rate, purpose="completion")
             if (not pass_completed):
                weighted_yards_per_play = 0 
 
         off_turnover_rate = posteam_stats.turnover_rate
         def_turnover_rate = defteam_stats.forced_turnover_rate
         weighted_turnover_rate = (0.40) * (self.get_weighted_average(off_turnover_rate, def_turnover_rate))
-        turnover_on_play = random.choices([True, False], [weighted_turnover_rate, 1 - weighted_turnover_rate])[0]
+        turnover_on_play = self.rng.bernoulli(weighted_turnover_rate, purpose="turnover")
 
         if (not turnover_on_play):
             yards_gained = weighted_yards_per_play
@@ -111,7 +90,7 @@ class GameModel_V1a(GameModel_V1):
         off_sack_rate = posteam_stats.sacks_allowed_rate
         def_sack_rate = defteam_stats.sacks_made_rate
         weighted_sack_rate = self.get_weighted_average(off_sack_rate, def_sack_rate)
-        sack_on_play = random.choices([True, False], [weighted_sack_rate, 1 - weighted_sack_rate])[0]
+        sack_on_play = self.rng.bernoulli(weighted_sack_rate, purpose="sack")
 
         if (sack_on_play and play_type == "pass"):
             off_yards_lost_per_sack = posteam_stats.sack_yards_allowed
@@ -119,14 +98,4 @@ class GameModel_V1a(GameModel_V1):
             yards_lost_on_sack = self.get_weighted_average(off_yards_lost_per_sack, def_yards_inflicted_per_sack)
             yards_gained = yards_lost_on_sack
 
-        return {
-            "play_type": play_type, 
-            "field_goal_made": None,
-            "yards_gained": yards_gained,
-            "time_elapsed": time_elapsed,
-            "quarter": game_state["quarter"],
-            "quarter_seconds_remaining": game_state["quarter_seconds_remaining"],
-            "turnover": turnover_on_play,
-            "touchdown": False, # This will be updated after the play is processed in update_game_state
-            "posteam": posteam.name
-        }
\ No newline at end of file
+        return PlayResult(play_type, yards_gained, time_elapsed, game_state.possession, turnover=turnover_on_play)
\ No newline at end of file
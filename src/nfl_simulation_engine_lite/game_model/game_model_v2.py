@@ -1,18 +1,21 @@
-from nfl_simulation_engine_lite.game_model.game_model import AbstractGameModel
+from nfl_simulation_engine_lite.game_engine.game_state import GameState, PlayResult
+from nfl_simulation_engine_lite.game_model.game_model import AbstractGameModel, RUN, PASS, PUNT, FIELD_GOAL, GOFORIT
 from nfl_simulation_engine_lite.team.team import Team
-from nfl_simulation_engine_lite.team.team_rates import TeamRates
-from nfl_simulation_engine_lite.fourth_down_models.models import v2a_fdm
+from nfl_simulation_engine_lite.team.team_rates import SITUATIONS, RATE_STAT_INDEX, get_distance_category_index, get_situation_index
 from math import exp
-import random
-import pandas as pd
 import numpy as np
 
 class GameModel_V2(AbstractGameModel):
-    def __init__(self, off_weight=0.525, rpi_enabled=True):
+    def __init__(self, off_weight=0.525, rpi_enabled=True, fourth_down_mode="forest", rpi_params=None):
         self.strength_data = None
-        self.fourth_down_model = v2a_fdm
+        self.fourth_down_model_name = "v2a"
+        self.fourth_down_mode = fourth_down_mode
         self.fourth_down_model_column_mapping = { 0: "goforit", 1: "field_goal", 2: "punt" }
-        self.rpi_params = self.init_rpi_params()
+        self.fourth_down_model_code_mapping = np.array([GOFORIT, FIELD_GOAL, PUNT])
+        self.batch_rates = None
+        self.matchup_rates = None
+        self.matchup_fg_rates = None
+        self.rpi_params = self.init_rpi_params() if rpi_params is None else dict(rpi_params)
         super().__init__(off_weight)
 
     def init_rpi_params(self, hfa_const: float = 0.08) -> dict:
@@ -46,123 +49,173 @@ class GameModel_V2(AbstractGameModel):
     def get_model_code(self) -> str:
         return "v2"
 
+    def get_model_params(self) -> dict:
+        return {"off_weight": self.off_weight, "fourth_down_mode": self.fourth_down_mode,
+                "rpi_params": tuple(sorted(self.rpi_params.items()))}
+
     def get_half_seconds_remaining(self, qtr: int, qtr_seconds_remaining: int) -> int:
         if qtr == 1 or qtr == 3:
             return qtr_seconds_remaining + 900
         else:
             return qtr_seconds_remaining
 
-    def handle_4th_down(self, game_state:dict):
-        posteam = game_state["possession_team"].name
-        defteam = game_state["defense_team"].name
+    def handle_4th_down(self, game_state: GameState):
         fourth_down_data = {
-            "game_seconds_remaining": game_state["game_seconds_remaining"],
-            "half_seconds_remaining": self.get_half_seconds_remaining(game_state["quarter"], game_state["quarter_seconds_remaining"]),
-            "ydstogo": game_state["distance"],
-            "yardline_100": game_state["yardline"],
-            "score_differential": game_state["score"][posteam] - game_state["score"][defteam]    
+            "game_seconds_remaining": game_state.game_seconds_remaining,
+            "half_seconds_remaining": self.get_half_seconds_remaining(game_state.quarter, game_state.quarter_seconds_remaining),
+            "ydstogo": game_state.distance,
+            "yardline_100": game_state.yardline,
+            "score_differential": game_state.score[game_state.possession] - game_state.score[game_state.defense]    
         }
-        prediction = self.fourth_down_model.predict(pd.DataFrame([fourth_down_data]))
-        return self.fourth_down_model_column_mapping[prediction[0]]
+        prediction = self.predict_4th_down_play_call(fourth_down_data)
+        return self.fourth_down_model_column_mapping[prediction]
+
+    def handle_4th_down_batch(self, batch_state: dict, possession: np.ndarray) -> np.ndarray:
+        game_indices = np.arange(len(possession))
+        # Columns in the order of the fourth down model's features
+        fourth_down_data = np.column_stack([
+            batch_state["game_seconds_remaining"],
+            np.where(batch_state["quarter"] % 2 == 1, batch_state["quarter_seconds_remaining"] + 900, batch_state["quarter_seconds_remaining"]),
+            batch_state["distance"],
+            batch_state["yardline"],
+            batch_state["score"][game_indices, possession] - batch_state["score"][game_indices, 1 - possession]
+        ])
+        prediction = self.get_fourth_down_predictor().predict(fourth_down_data)
+        return self.fourth_down_model_code_mapping[prediction]
+
+    def supports_batch_simulation(self) -> bool:
+        return True
+
+    def init_batch_simulation(self) -> None:
+        # Same per-matchup table as resolve_play, stacked into [possession, situation] arrays
+        self.init_matchup()
+        batch_rates = {"fg_rate": np.array(self.matchup_fg_rates)}
+        for field in SituationRates.__slots__:
+            batch_rates[field] = np.array([[getattr(situation_rates, field) for situation_rates in possession_rates[:len(SITUATIONS)]]
+                                           for possession_rates in self.matchup_rates])
+        # resolve_play chooses between run and pass in proportion to their rates
+        with np.errstate(divide="ignore", invalid="ignore"):
+            batch_rates["run_share"] = batch_rates["run_prob"] / (batch_rates["run_prob"] + batch_rates["pass_prob"])
+        self.batch_rates = batch_rates
+
+    def get_batch_yards_gained(self, possession: np.ndarray, situation: np.ndarray, is_pass: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        return np.where(is_pass, self.batch_rates["pass_yards"][possession, situation], self.batch_rates["run_yards"][possession, situation])
+
+    def resolve_plays_batch(self, batch_state: dict, rng: np.random.Generator) -> dict:
+        num_games = len(batch_state["down"])
+        possession = batch_state["possession"]
+        redzone = (batch_state["yardline"] <= 20) * 1
+        situation = get_situation_index(batch_state["down"], get_distance_category_index(batch_state["distance"]), redzone)
+        rates = self.batch_rates
+
+        time_elapsed = rng.integers(15, 41, size=num_games)
+
+        play_type = np.where(rng.random(num_games) < rates["run_share"][possession, situation], RUN, PASS)
+        fourth_down = batch_state["down"] == 4
+        if fourth_down.any():
+            fourth_down_state = {key: value[fourth_down] for key, value in batch_state.items()}
+            play_type[fourth_down] = self.handle_4th_down_batch(fourth_down_state, possession[fourth_down])
+        punt = play_type == PUNT
+        field_goal = play_type == FIELD_GOAL
+        is_pass = play_type == PASS
+
+        # Same order of events as resolve_play: sack, then completion, then turnover
+        yards_gained = self.get_batch_yards_gained(possession, situation, is_pass, rng)
+        sack = is_pass & (rng.random(num_games) < rates["sack_rate"][possession, situation])
+        yards_gained = np.where(sack, -rates["sack_yards"][possession, situation], yards_gained)
+        pass_completed = rng.random(num_games) < rates["pass_cmp_rate"][possession, situation]
+        yards_gained = np.where(is_pass & ~pass_completed, 0, yards_gained)
+        turnover = ~(punt | field_goal) & (rng.random(num_games) < rates["turnover_rate"][possession, situation])
+        yards_gained = np.where(turnover | field_goal, 0, yards_gained)
+        yards_gained = np.where(punt, 40, yards_gained)
 
-    def resolve_play(self, game_state: dict) -> dict:
-        posteam = game_state["possession_team"]
-        defteam = game_state["defense_team"]
+        return {
+            "play_type": play_type,
+            "field_goal_made": field_goal & (rng.random(num_games) < rates["fg_rate"][possession]),
+            "yards_gained": yards_gained,
+            "time_elapsed": time_elapsed,
+            "turnover": turnover
+        }
 
-        distance_category = "short" if game_state["distance"] < 4 else "medium" if game_state["distance"] < 7 else "long"
-        redzone = 1 if game_state["yardline"] <= 20 else 0
-        situational_condition = (game_state["down"], game_state["distance"], game_state["yardline"], distance_category, redzone)
+    def init_matchup(self) -> None:
+        self.init_team_strength_data(rpi_enabled=True)
+        self.compile_matchup()
+
+    def compile_matchup(self) -> None:
+        # Rates blended once per matchup for both possessions and every situation, then the fallback row
+        teams = (self.home_team, self.away_team)
+        situations = [(down, None, None, distance_category, redzone) for down, distance_category, redzone in SITUATIONS]
+        situations.append((0, None, None, 0, 0)) # The down axis of the rate array holds the fallback data at 0
+        self.matchup_rates = []
+        self.matchup_fg_rates = []
+        for possession, posteam in enumerate(teams):
+            defteam = teams[1 - possession]
+            self.matchup_fg_rates.append(float(self.get_field_goal_success_rate(posteam)))
+            self.matchup_rates.append([self.compile_situation_rates(posteam, defteam, situation) for situation in situations])
+
+    def compile_situation_rates(self, posteam: Team, defteam: Team, situation: tuple[int, int, int, int, int]) -> "SituationRates":
+        situation_rates = SituationRates(
+            run_prob=float(self._get_situation_rate(posteam, situation, "run_rate")),
+            pass_prob=float(self._get_situation_rate(posteam, situation, "pass_rate")),
+            run_yards=self.compile_yards_per_play(posteam, defteam, "run", situation),
+            pass_yards=self.compile_yards_per_play(posteam, defteam, "pass", situation),
+            sack_rate=float(self.get_weighted_average(self.get_off_sack_rate(posteam, situation), self.get_def_sack_rate(defteam, situation))),
+            sack_yards=float(self.get_weighted_average(self.get_sack_yards_allowed(posteam, situation), self.get_sack_yards_inflicted(defteam, situation))),
+            pass_cmp_rate=float(self.get_weighted_average(self.get_off_pass_cmp_rate(posteam, situation), self.get_def_pass_cmp_rate(defteam, situation))),
+            turnover_rate=float(self.get_weighted_average(self.get_off_turnover_rate(posteam, situation), self.get_def_turnover_rate(defteam, situation)))
+        )
 
-        time_elapsed = random.randint(15,40)
+        # Log NaN values in calculations
+        if np.isnan(np.sum(situation_rates.run_yards)) or np.isnan(np.sum(situation_rates.pass_yards)):
+            print(f"yards_gained is NaN: posteam={posteam.name}, defteam={defteam.name}, situational_condition={situation}")
+        return situation_rates
+
+    def compile_yards_per_play(self, posteam: Team, defteam: Team, play_type: str, situation: tuple[int, int, int, int, int]):
+        off_yards_per_play = self.get_off_yards_per_play(posteam, play_type, situation)
+        def_yards_per_play = self.get_def_yards_per_play(defteam, play_type, situation)
+        return float(self.get_weighted_average(off_yards_per_play, def_yards_per_play))
+
+    def get_yards_gained(self, situation_rates: "SituationRates", play_type: str, game_state: GameState) -> float:
+        return situation_rates.pass_yards if play_type == "pass" else situation_rates.run_yards
+
+    def resolve_play(self, game_state: GameState) -> PlayResult:
+        distance_category = get_distance_category_index(game_state.distance)
+        redzone = 1 if game_state.yardline <= 20 else 0
+        situation_rates = self.matchup_rates[game_state.possession][get_situation_index(game_state.down, distance_category, redzone)]
+
+        time_elapsed = self.rng.randint(15, 40, purpose="clock")
 
         play_type = None
-        if (game_state["down"] == 4):
+        if (game_state.down == 4):
             play_type = self.handle_4th_down(game_state)
         else:
             # for non-4th down scenarios or 4th downs that we are trying to convert
             # get the the type of play to be called: run or pass
-            play_type = self.get_conditional_play_type(posteam.get_team_rates(), situational_condition)
+            play_type = self.rng.choose("run", "pass", situation_rates.run_prob, situation_rates.pass_prob, purpose="play_call")
 
         # Handle 4th down scenarios for punts and field goals
-        if game_state["down"] == 4 and play_type == "punt":
-            return {
-                "play_type": "punt", 
-                "field_goal_made": None,
-                "yards_gained": 40,
-                "time_elapsed": time_elapsed, 
-                "quarter": game_state["quarter"],
-                "quarter_seconds_remaining": game_state["quarter_seconds_remaining"],
-                "turnover": False,
-                "touchdown": False,
-                "posteam": posteam.name
-            }
-        elif game_state["down"] == 4 and play_type == "field_goal":
-            fg_success_rate = self.get_field_goal_success_rate(posteam)
-            return {
-                "play_type": "field_goal", 
-                "field_goal_made": random.choices([True, False], [fg_success_rate, 1 - fg_success_rate])[0],
-                "yards_gained": 0,
-                "time_elapsed": time_elapsed,
-                "quarter": game_state["quarter"],
-                "quarter_seconds_remaining": game_state["quarter_seconds_remaining"],  
-                "turnover": False,
-                "touchdown": False,
-                "posteam": posteam.name
-            }
+        if game_state.down == 4 and play_type == "punt":
+            return PlayResult("punt", 40, time_elapsed, game_state.possession)
+        elif game_state.down == 4 and play_type == "field_goal":
+            fg_success_rate = self.matchup_fg_rates[game_state.possession]
+            return PlayResult("field_goal", 0, time_elapsed, game_state.possession, field_goal_made=self.rng.bernoulli(fg_success_rate, purpose="field_goal"))
 
-        off_yards_per_play = self.get_off_yards_per_play(posteam, play_type, situational_condition)
-        def_yards_per_play = self.get_def_yards_per_play(defteam, play_type, situational_condition)
-        
-        yards_gained = self.get_weighted_average(off_yards_per_play, def_yards_per_play)
-
-        # Log NaN values in calculations
-        if pd.isna(yards_gained):
-            print(f"yards_gained is NaN: off_yards_per_play={off_yards_per_play}, def_yards_per_play={def_yards_per_play}, situational_condition={situational_condition}")
+        yards_gained = self.get_yards_gained(situation_rates, play_type, game_state)
 
         if play_type == "pass":
-            off_sack_rate = self.get_off_sack_rate(posteam, situational_condition)
-            def_sack_rate = self.get_def_sack_rate(defteam, situational_condition)
-            weighted_sack_rate = self.get_weighted_average(off_sack_rate, def_sack_rate)
-            sack = random.choices([True, False], [weighted_sack_rate, 1 - weighted_sack_rate])[0]
+            sack = self.rng.bernoulli(situation_rates.sack_rate, purpose="sack")
             if (sack):
-                off_yards_lost_per_sack = self.get_sack_yards_allowed(posteam, situational_condition)
-                def_yards_inflicted_per_sack = self.get_sack_yards_inflicted(defteam, situational_condition)
-                weighted_yards_gained = self.get_weighted_average(off_yards_lost_per_sack, def_yards_inflicted_per_sack)
-                yards_gained = -weighted_yards_gained
-
-            off_pass_cmp_rate = self.get_off_pass_cmp_rate(posteam, situational_condition)
-            def_pass_cmp_rate = self.get_def_pass_cmp_rate(defteam, situational_condition)
-            weighted_pass_cmp_rate = self.get_weighted_average(off_pass_cmp_rate, def_pass_cmp_rate)
-            pass_completed = random.choices([True, False], [weighted_pass_cmp_rate, 1 - weighted_pass_cmp_rate])[0]
+                yards_gained = -situation_rates.sack_yards
+
+            pass_completed = self.rng.bernoulli(situation_rates.pass_cmp_rate, purpose="completion")
             if (not pass_completed):
                 yards_gained = 0
 
-        off_turnover_rate = self.get_off_turnover_rate(posteam, situational_condition)
-        def_turnover_rate = self.get_def_turnover_rate(defteam, situational_condition)
-        weighted_turnover_rate = self.get_weighted_average(off_turnover_rate, def_turnover_rate)
-        turnover_on_play = random.choices([True, False], [weighted_turnover_rate, 1 - weighted_turnover_rate])[0]
+        turnover_on_play = self.rng.bernoulli(situation_rates.turnover_rate, purpose="turnover")
         if (turnover_on_play):
             yards_gained = 0
         
-        return {
-            "play_type": play_type, 
-            "field_goal_made": None,
-            "yards_gained": yards_gained,
-            "time_elapsed": time_elapsed,
-            "quarter": game_state["quarter"],
-            "quarter_seconds_remaining": game_state["quarter_seconds_remaining"],
-            "turnover": turnover_on_play,
-            "touchdown": False, # This will be updated after the play is processed in update_game_state
-            "posteam": posteam.name
-        }
-
-    def get_conditional_play_type(self, team_rates: TeamRates, situation: tuple[int, int, int, int, int]) -> str:
-        # Based on the game situation, determine what play type will be called next
-        down, __, __, distance_category, redzone = situation
-        team_rates_data = team_rates.get_data_for_situation(down, distance_category, redzone)
-        run_prob = team_rates_data.run_rate
-        pass_prob = team_rates_data.pass_rate 
-        return np.random.choice(["run", "pass"], p=[run_prob, pass_prob])
+        return PlayResult(play_type, yards_gained, time_elapsed, game_state.possession, turnover=turnover_on_play)
 
     def _bias_off_value(self, value: float, team: str) -> float:
         if team == self.home_team.name:
@@ -176,102 +229,71 @@ class GameModel_V2(AbstractGameModel):
         else:
             return value / self.strength_data["away_multiplier"]
 
-    def get_off_yards_per_play(self, posteam: Team, play_type: str, situation: tuple[int, int, int]) -> float:
+    def _get_situation_rate(self, team: Team, situation: tuple[int, int, int, int, int], stat: str) -> float:
+        # Missing situational values are already replaced by the fallback data in the rate matrix
         down, __, __, distance_category, redzone = situation
-        team_rates = self.home_team.get_team_rates() if posteam == self.home_team else self.away_team.get_team_rates()
-        team_rates_data = team_rates.get_data_for_situation(down, distance_category, redzone)
-        fallback_team_rates_data = team_rates.get_data_for_situation(None, None, None)
+        return team.get_team_rates().get_rate(down, distance_category, redzone, stat)
+
+    def _get_fallback_rate(self, team: Team, stat: str) -> float:
+        return team.get_team_rates().fallback_rates[RATE_STAT_INDEX[stat]]
 
-        raw_off_yards_per_play = 0
+    def get_off_yards_per_play(self, posteam: Team, play_type: str, situation: tuple[int, int, int, int, int]) -> float:
         if play_type == "pass":
-            raw_off_yards_per_play = team_rates_data.yards_per_completion if pd.notna(team_rates_data.yards_per_completion) else fallback_team_rates_data.yards_per_completion
+            raw_off_yards_per_play = self._get_situation_rate(posteam, situation, "yards_per_completion")
         else:
-            raw_off_yards_per_play = team_rates_data.rush_yards_per_carry if pd.notna(team_rates_data.rush_yards_per_carry) else fallback_team_rates_data.rush_yards_per_carry
+            raw_off_yards_per_play = self._get_situation_rate(posteam, situation, "rush_yards_per_carry")
 
         return self._bias_off_value(raw_off_yards_per_play, posteam)
 
-    def get_def_yards_per_play(self, defteam: Team, play_type: str, situation: tuple[int, int, int]) -> float:
-        down, __, __, distance_category, redzone = situation
-        team_rates = self.home_team.get_team_rates() if defteam == self.home_team else self.away_team.get_team_rates()
-        team_rates_data = team_rates.get_data_for_situation(down, distance_category, redzone)
-        fallback_team_rates_data = team_rates.get_data_for_situation(None, None, None)
-
-        raw_def_yards_per_play = 0
+    def get_def_yards_per_play(self, defteam: Team, play_type: str, situation: tuple[int, int, int, int, int]) -> float:
         if play_type == "pass":
-            raw_def_yards_per_play = team_rates_data.yards_allowed_per_completion if pd.notna(team_rates_data.yards_allowed_per_completion) else fallback_team_rates_data.yards_allowed_per_completion
+            raw_def_yards_per_play = self._get_situation_rate(defteam, situation, "yards_allowed_per_completion")
         else:
-            raw_def_yards_per_play = team_rates_data.rush_yards_per_carry_allowed if pd.notna(team_rates_data.rush_yards_per_carry_allowed) else fallback_team_rates_data.rush_yards_per_carry_allowed
+            raw_def_yards_per_play = self._get_situation_rate(defteam, situation, "rush_yards_per_carry_allowed")
 
         return self._bias_def_value(raw_def_yards_per_play, defteam)
 
+    def get_off_sack_rate(self, posteam: Team, situation: tuple[int, int, int, int, int]) -> float:
+        return self._get_situation_rate(posteam, situation, "sacks_allowed_rate")
 
-    def get_off_sack_rate(self, posteam: Team, situation: tuple[int, int, int]) -> float:
-        down, __, __, distance_category, redzone = situation
-        team_rates = self.home_team.get_team_rates() if posteam == self.home_team else self.away_team.get_team_rates()
-        team_rates_data = team_rates.get_data_for_situation(down, distance_category, redzone)
-        fallback_team_rates_data = team_rates.get_data_for_situation(None, None, None)
+    def get_def_sack_rate(self, defteam: Team, situation: tuple[int, int, int, int, int]) -> float:
+        return self._get_situation_rate(defteam, situation, "sacks_made_rate")
 
-        return team_rates_data.sacks_allowed_rate if pd.notna(team_rates_data.sacks_allowed_rate) else fallback_team_rates_data.sacks_allowed_rate
+    def get_sack_yards_allowed(self, posteam: Team, situation: tuple[int, int, int, int, int]) -> float:
+        return self._get_situation_rate(posteam, situation, "sack_yards_allowed")
 
-    def get_def_sack_rate(self, defteam: Team, situation: tuple[int, int, int]) -> float:
-        down, __, __, distance_category, redzone = situation
-        team_rates = self.home_team.get_team_rates() if defteam == self.home_team else self.away_team.get_team_rates()
-        team_rates_data = team_rates.get_data_for_situation(down, distance_category, redzone)
-        fallback_team_rates_data = team_rates.get_data_for_situation(None, None, None)
+    def get_sack_yards_inflicted(self, defteam: Team, situation: tuple[int, int, int, int, int]) -> float:
+        return self._get_situation_rate(defteam, situation, "sack_yards_inflicted")
 
-        return team_rates_data.sacks_made_rate if pd.notna(team_rates_data.sacks_made_rate) else fallback_team_rates_data.sacks_made_rate
-
-    def get_sack_yards_allowed(self, posteam: Team, situation: tuple[int, int, int]) -> float:
-        down, __, __, distance_category, redzone = situation
-        team_rates = self.home_team.get_team_rates() if posteam == self.home_team else self.away_team.get_team_rates()
-        team_rates_data = team_rates.get_data_for_situation(down, distance_category, redzone)
-        fallback_team_rates_data = team_rates.get_data_for_situation(None, None, None)
-
-        return team_rates_data.sack_yards_allowed if pd.notna(team_rates_data.sack_yards_allowed) else fallback_team_rates_data.sack_yards_allowed
-
-    def get_sack_yards_inflicted(self, defteam: Team, situation: tuple[int, int, int]) -> float:
-        down, __, __, distance_category, redzone = situation
-        team_rates = self.home_team.get_team_rates() if defteam == self.home_team else self.away_team.get_team_rates()
-        team_rates_data = team_rates.get_data_for_situation(down, distance_category, redzone)
-        fallback_team_rates_data = team_rates.get_data_for_situation(None, None, None)
-
-        return team_rates_data.sack_yards_inflicted if pd.notna(team_rates_data.sack_yards_inflicted) else fallback_team_rates_data.sack_yards_inflicted
-
-    def get_off_pass_cmp_rate(self, posteam: Team, situation: tuple[int, int, int]) -> float:
-        down, __, __, distance_category, redzone = situation
-        team_rates = self.home_team.get_team_rates() if posteam == self.home_team else self.away_team.get_team_rates()
-        team_rates_data = team_rates.get_data_for_situation(down, distance_category, redzone)
-        fallback_team_rates_data = team_rates.get_data_for_situation(None, None, None)
-
-        raw_off_pass_cmp_rate = team_rates_data.pass_completion_rate if pd.notna(team_rates_data.pass_completion_rate) else fallback_team_rates_data.pass_completion_rate
+    def get_off_pass_cmp_rate(self, posteam: Team, situation: tuple[int, int, int, int, int]) -> float:
+        raw_off_pass_cmp_rate = self._get_situation_rate(posteam, situation, "pass_completion_rate")
         return self._bias_off_value(raw_off_pass_cmp_rate, posteam)
 
-    def get_def_pass_cmp_rate(self, defteam: Team, situation: tuple[int, int, int]) -> float:
-        down, __, __, distance_category, redzone = situation
-        team_rates = self.home_team.get_team_rates() if defteam == self.home_team else self.away_team.get_team_rates()
-        team_rates_data = team_rates.get_data_for_situation(down, distance_category, redzone)
-        fallback_team_rates_data = team_rates.get_data_for_situation(None, None, None)
-
-        raw_def_pass_cmp_rate = team_rates_data.pass_completion_rate_allowed if pd.notna(team_rates_data.pass_completion_rate_allowed) else fallback_team_rates_data.pass_completion_rate_allowed
+    def get_def_pass_cmp_rate(self, defteam: Team, situation: tuple[int, int, int, int, int]) -> float:
+        raw_def_pass_cmp_rate = self._get_situation_rate(defteam, situation, "pass_completion_rate_allowed")
         return self._bias_def_value(raw_def_pass_cmp_rate, defteam)
 
-    def get_off_turnover_rate(self, posteam: Team, situation: tuple[int, int, int]) -> float:
-        down, __, __, distance_category, redzone = situation
-        team_rates = self.home_team.get_team_rates() if posteam == self.home_team else self.away_team.get_team_rates()
-        team_rates_data = team_rates.get_data_for_situation(down, distance_category, redzone)
-        fallback_team_rates_data = team_rates.get_data_for_situation(None, None, None)
-
-        return team_rates_data.turnover_rate if pd.notna(team_rates_data.turnover_rate) else fallback_team_rates_data.turnover_rate
-
-    def get_def_turnover_rate(self, defteam: Team, situation: tuple[int, int, int]) -> float:
-        down, __, __, distance_category, redzone = situation
-        team_rates = self.home_team.get_team_rates() if defteam == self.home_team else self.away_team.get_team_rates()
-        team_rates_data = team_rates.get_data_for_situation(down, distance_category, redzone)
-        fallback_team_rates_data = team_rates.get_data_for_situation(None, None, None)
+    def get_off_turnover_rate(self, posteam: Team, situation: tuple[int, int, int, int, int]) -> float:
+        return self._get_situation_rate(posteam, situation, "turnover_rate")
 
-        return team_rates_data.forced_turnover_rate if pd.notna(team_rates_data.forced_turnover_rate) else fallback_team_rates_data.forced_turnover_rate
+    def get_def_turnover_rate(self, defteam: Team, situation: tuple[int, int, int, int, int]) -> float:
+        return self._get_situation_rate(defteam, situation, "forced_turnover_rate")
 
     def get_field_goal_success_rate(self, posteam: Team) -> float:
-        team_rates = self.home_team.get_team_rates() if posteam == self.home_team else self.away_team.get_team_rates()
-        team_rates_data = team_rates.get_data_for_situation(None, None, None)
-        return team_rates_data.field_goal_success_rate if pd.notna(team_rates_data.field_goal_success_rate) else 0.75
\ No newline at end of file
+        field_goal_success_rate = self._get_fallback_rate(posteam, "field_goal_success_rate")
+        return field_goal_success_rate if not np.isnan(field_goal_success_rate) else 0.75
+
+class SituationRates:
+    # What a V2 play in one situation is drawn from, blended for one possession team of a matchup
+    __slots__ = ("run_prob", "pass_prob", "run_yards", "pass_yards", "sack_rate", "sack_yards", "pass_cmp_rate", "turnover_rate")
+
+    def __init__(self, run_prob: float, pass_prob: float, run_yards, pass_yards, sack_rate: float, sack_yards: float,
+                 pass_cmp_rate: float, turnover_rate: float):
+        self.run_prob = run_prob
+        self.pass_prob = pass_prob
+        self.run_yards = run_yards
+        self.pass_yards = pass_yards
+        self.sack_rate = sack_rate
+        self.sack_yards = sack_yards
+        self.pass_cmp_rate = pass_cmp_rate
+        self.turnover_rate = turnover_rate
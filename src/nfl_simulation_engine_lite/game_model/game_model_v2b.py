@@ -1,54 +1,75 @@
-from nfl_simulation_engine_lite.game_model.game_model_v2 import GameModel_V2
+from nfl_simulation_engine_lite.game_engine.game_state import GameState
+from nfl_simulation_engine_lite.game_model.game_model_v2 import GameModel_V2, SituationRates
 from nfl_simulation_engine_lite.team.team import Team
-import pandas as pd
+import numpy as np
 
 class GameModel_V2b(GameModel_V2):
-    def __init__(self, off_weight=0.5, rpi_enabled=True):
-        super().__init__(off_weight=off_weight, rpi_enabled=rpi_enabled)
+    def __init__(self, off_weight=0.5, rpi_enabled=True, fourth_down_mode="forest", rpi_params=None):
+        super().__init__(off_weight=off_weight, rpi_enabled=rpi_enabled, fourth_down_mode=fourth_down_mode, rpi_params=rpi_params)
 
     def get_model_code(self) -> str:
         return "v2b"
 
-    def get_off_yards_per_play(self, posteam: Team, play_type: str, situation: tuple[int, int, int]) -> float:
-        down, __, __, distance_category, redzone = situation
-        team_rates = self.home_team.get_team_rates() if posteam == self.home_team else self.away_team.get_team_rates()
-        team_rates_data = team_rates.get_data_for_situation(down, distance_category, redzone)
-        fallback_team_rates_data = team_rates.get_data_for_situation(None, None, None)
-
-        raw_off_yards_per_play = 0
+    def get_off_yards_per_play(self, posteam: Team, play_type: str, situation: tuple[int, int, int, int, int]) -> float:
         if play_type == "pass":
             sampled_yards_per_completion = posteam.sample_offensive_passing_play()
-            if (pd.notna(team_rates_data.yards_per_completion)):
-                raw_off_yards_per_play = (team_rates_data.yards_per_completion + sampled_yards_per_completion) / 2
-            else:
-                raw_off_yards_per_play = (sampled_yards_per_completion + fallback_team_rates_data.yards_per_completion) / 2
+            raw_off_yards_per_play = (self._get_situation_rate(posteam, situation, "yards_per_completion") + sampled_yards_per_completion) / 2
         else:
             sampled_rush_yards_per_carry = posteam.sample_offensive_rushing_play()
-            if (pd.notna(team_rates_data.rush_yards_per_carry)):
-                raw_off_yards_per_play = (team_rates_data.rush_yards_per_carry + sampled_rush_yards_per_carry) / 2
-            else:
-                raw_off_yards_per_play = (sampled_rush_yards_per_carry + fallback_team_rates_data.rush_yards_per_carry) / 2
+            raw_off_yards_per_play = (self._get_situation_rate(posteam, situation, "rush_yards_per_carry") + sampled_rush_yards_per_carry) / 2
 
         return self._bias_off_value(raw_off_yards_per_play, posteam)
 
-    def get_def_yards_per_play(self, posteam: Team, play_type: str, situation: tuple[int, int, int]) -> float:
-        down, __, __, distance_category, redzone = situation
-        team_rates = self.home_team.get_team_rates() if posteam == self.home_team else self.away_team.get_team_rates()
-        team_rates_data = team_rates.get_data_for_situation(down, distance_category, redzone)
-        fallback_team_rates_data = team_rates.get_data_for_situation(None, None, None)
+    def get_def_yards_per_play(self, defteam: Team, play_type: str, situation: tuple[int, int, int, int, int]) -> float:
+        if play_type == "pass":
+            sampled_yards_allowed_per_completion = defteam.sample_defensive_passing_play()
+            raw_def_yards_per_play = (self._get_situation_rate(defteam, situation, "yards_allowed_per_completion") + sampled_yards_allowed_per_completion) / 2
+        else:
+            sampled_rush_yards_allowed_per_carry = defteam.sample_defensive_rushing_play()
+            raw_def_yards_per_play = (self._get_situation_rate(defteam, situation, "rush_yards_per_carry_allowed") + sampled_rush_yards_allowed_per_carry) / 2
+
+        return self._bias_def_value(raw_def_yards_per_play, defteam)
+
+    def compile_yards_per_play(self, posteam: Team, defteam: Team, play_type: str, situation: tuple[int, int, int, int, int]) -> tuple[float, float]:
+        # Yards are blended with values sampled on every play, so only the situational half of each side is compiled
+        off_stat, def_stat = ("yards_per_completion", "yards_allowed_per_completion") if play_type == "pass" else ("rush_yards_per_carry", "rush_yards_per_carry_allowed")
+        return float(self._get_situation_rate(posteam, situation, off_stat)), float(self._get_situation_rate(defteam, situation, def_stat))
 
-        raw_def_yards_per_play = 0
+    def get_yards_gained(self, situation_rates: SituationRates, play_type: str, game_state: GameState) -> float:
+        posteam = game_state.possession_team
+        defteam = game_state.defense_team
         if play_type == "pass":
-            sampled_yards_allowed_per_completion = posteam.sample_defensive_passing_play()
-            if (pd.notna(team_rates_data.yards_allowed_per_completion)):
-                raw_def_yards_per_play = (team_rates_data.yards_allowed_per_completion + sampled_yards_allowed_per_completion) / 2
-            else:
-                raw_def_yards_per_play = (sampled_yards_allowed_per_completion + fallback_team_rates_data.yards_allowed_per_completion) / 2
+            raw_off_situation_yards, raw_def_situation_yards = situation_rates.pass_yards
+            sampled_off_yards = posteam.sample_offensive_passing_play()
+            sampled_def_yards = defteam.sample_defensive_passing_play()
         else:
-            sampled_rush_yards_allowed_per_carry = posteam.sample_defensive_rushing_play()
-            if (pd.notna(team_rates_data.rush_yards_per_carry_allowed)):
-                raw_def_yards_per_play = (team_rates_data.rush_yards_per_carry_allowed + sampled_rush_yards_allowed_per_carry) / 2
-            else:
-                raw_def_yards_per_play = (sampled_rush_yards_allowed_per_carry + fallback_team_rates_data.rush_yards_per_carry_allowed) / 2
+            raw_off_situation_yards, raw_def_situation_yards = situation_rates.run_yards
+            sampled_off_yards = posteam.sample_offensive_rushing_play()
+            sampled_def_yards = defteam.sample_defensive_rushing_play()
+
+        off_yards_per_play = self._bias_off_value((raw_off_situation_yards + sampled_off_yards) / 2, posteam)
+        def_yards_per_play = self._bias_def_value((raw_def_situation_yards + sampled_def_yards) / 2, defteam)
+        return self.get_weighted_average(off_yards_per_play, def_yards_per_play)
 
-        return self._bias_def_value(raw_def_yards_per_play, posteam)
\ No newline at end of file
+    def get_batch_yards_gained(self, possession: np.ndarray, situation: np.ndarray, is_pass: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        # Same blend as get_yards_gained, applied to the compiled situational yards of every play
+        teams = (self.home_team, self.away_team)
+        yards_gained = np.empty(len(possession))
+        for posteam_index, posteam in enumerate(teams):
+            defteam = teams[1 - posteam_index]
+            off_coef = self.off_weight * self._bias_off_value(0.5, posteam)
+            def_coef = self.def_weight * self._bias_def_value(0.5, defteam)
+            for play_type, play_mask in [("pass", is_pass), ("run", ~is_pass)]:
+                mask = play_mask & (possession == posteam_index)
+                num_plays = np.count_nonzero(mask)
+                if num_plays == 0:
+                    continue
+                if play_type == "pass":
+                    off_sample = posteam.off_passing_distribution.rvs(size=num_plays, random_state=rng)
+                    def_sample = defteam.def_passing_distribution.rvs(size=num_plays, random_state=rng)
+                else:
+                    off_sample = posteam.off_rushing_distribution.rvs(size=num_plays, random_state=rng)
+                    def_sample = defteam.def_rushing_distribution.rvs(size=num_plays, random_state=rng)
+                situation_yards = self.batch_rates[f"{play_type}_yards"][possession[mask], situation[mask]]
+                yards_gained[mask] = off_coef * (situation_yards[:, 0] + off_sample) + def_coef * (situation_yards[:, 1] + def_sample)
+        return yards_gained
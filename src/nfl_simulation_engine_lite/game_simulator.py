@@ -1,16 +1,21 @@
-from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures import wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
 from nfl_simulation_engine_lite.db.db_conn import get_db_conn
 from nfl_simulation_engine_lite.game_model.game_model_factory import initialize_new_game_model_instance
-from nfl_simulation_engine_lite.game_model.game_model import AbstractGameModel
 from nfl_simulation_engine_lite.game_model.prototype_game_model import PrototypeGameModel
-from nfl_simulation_engine_lite.game_engine.game_engine import GameEngine
+from nfl_simulation_engine_lite.game_engine.game_engine import GameEngine, OUTPUT_LEVELS
+from nfl_simulation_engine_lite.game_engine.batch_game_engine import BatchGameEngine
+from nfl_simulation_engine_lite.simulation_pool import SimulationPool, get_simulation_pool, get_shared_league_data, run_simulation_chunk
 from nfl_simulation_engine_lite.team.team import Team
-from time import time
+from nfl_simulation_engine_lite.utils.random_stream import SAMPLING_SCHEMES, SAMPLING_GROUP_SIZES, spawn_generator, get_game_generator, derive_seed, generate_seed
+from nfl_simulation_engine_lite.utils.simulation_aggregate import SimulationAggregate
+from nfl_simulation_engine_lite.utils.paired_comparison import compare_paired_game_scores
+from time import time, perf_counter
 from tqdm import tqdm
 import math
+import numpy as np
 import os
 import pandas as pd
-import random
 import nfl_simulation_engine_lite.team.team_factory as TeamFactory
 import nfl_simulation_engine_lite.utils.play_log_util as plu
 import warnings
@@ -21,6 +26,28 @@ import csv
 warnings.filterwarnings("ignore", category=pd.errors.SettingWithCopyWarning)
 warnings.filterwarnings("ignore", category=FutureWarning)
 
+SIM_STATS_PERCENTILES = (5, 25, 50, 75, 95)
+
+# Game models run for the weekly predictions, by model code, with their labels in the prediction CSVs
+WEEKLY_GAME_MODELS = {"proto": "Prototype", "v1": "V1", "v1a": "V1a", "v1b": "V1b", "v2": "V2", "v2a": "V2a", "v2b": "V2b"}
+
+# Default standard error targets of adaptive runs, in percentage points and points
+ADAPTIVE_TARGET_WIN_PCT_SE = 1.0
+ADAPTIVE_TARGET_SCORE_DIFF_SE = 0.5
+# Games in the first round of an adaptive run, and the fewest games any later round adds
+ADAPTIVE_MIN_ROUND_SIZE = 200
+# Games per worker in a time-budgeted run's first round, and the share of the budget left each round fills
+TIME_BUDGET_PILOT_GAMES_PER_WORKER = 10
+# Generous time per game, to shrink the pilot round for short budgets
+TIME_BUDGET_PILOT_GAME_MS = 10
+TIME_BUDGET_ROUND_FRACTION = 0.8
+# z-score of the 95% normal confidence intervals of home_win_pct and average_score_diff
+CONFIDENCE_INTERVAL_Z = 1.96
+# Most games in a chunk of a slate run
+SLATE_CHUNK_SIZE = 250
+# Rounds a slate's simulation budget is handed out in after the pilot rounds, each with a share of what is left
+SLATE_ALLOCATION_STAGES = 2
+
 def initialize_teams_for_game_engine(home_team_abbrev: str, away_team_abbrev: str) -> tuple:
     db_conn = get_db_conn() 
     home_team = TeamFactory.initialize_team(home_team_abbrev, db_conn)
@@ -28,31 +55,27 @@ def initialize_teams_for_game_engine(home_team_abbrev: str, away_team_abbrev: st
     db_conn.close()
     return home_team, away_team
 
-def run_single_simulation(home_team_abbrev: str, away_team_abbrev:str, game_model=PrototypeGameModel(), print_debug_info=False) -> dict:
+def run_single_simulation(home_team_abbrev: str, away_team_abbrev:str, game_model=PrototypeGameModel(), print_debug_info=False, seed=None, output_level="full") -> dict:
     home_team, away_team = initialize_teams_for_game_engine(home_team_abbrev, away_team_abbrev)
-    game_engine = GameEngine(home_team, away_team, game_model)
-    game_summary = game_engine.run_simulation()
-    if print_debug_info:
+    game_engine = GameEngine(home_team, away_team, game_model, rng=get_game_generator(seed, 0))
+    game_summary = game_engine.run_simulation(output_level=output_level)
+    if print_debug_info and output_level == "full":
         print("Number of plays:", game_summary["num_plays_in_game"])
         for play in game_summary["play_log"]:
             print(play)
             print("\n")
     return game_summary
 
-def run_multiple_simulations(home_team_abbrev: str, away_team_abbrev: str, num_simulations: int, game_model=PrototypeGameModel()) -> None:
+def run_multiple_simulations(home_team_abbrev: str, away_team_abbrev: str, num_simulations: int, game_model=PrototypeGameModel(), seed=None) -> None:
     home_team, away_team = initialize_teams_for_game_engine(home_team_abbrev, away_team_abbrev)
     
     home_wins = 0
-    i = 0
     print(f"Running {num_simulations} simulations of {home_team.name} vs. {away_team.name}.")
+    game_engine = GameEngine(home_team, away_team, game_model)
     with tqdm(total=num_simulations) as pbar:
-        while i < num_simulations:
-            game_engine = GameEngine(home_team, away_team, game_model)
-            game_summary = game_engine.run_simulation()
-            final_score = game_summary["final_score"]
-            if final_score[home_team.name] > final_score[away_team.name]:
+        for game_summary in game_engine.run_many(num_simulations, seed=seed, output_level="scores"):
+            if game_summary["winner"] == home_team.name:
                 home_wins += 1
-            i += 1
             pbar.update(1)
     
     print(f"{home_team.name} wins {round(100 * (home_wins/num_simulations), 2)} percent of the time.")
@@ -183,246 +206,549 @@ def fetch_scores_for_week(week: int) -> None:
                 scores_file.write(f"{home_team_abbrev} and {away_team_abbrev} tie\n")
     print(f"Scores for week {week} have been written to 'test_scores.txt'.")
 
-def run_weekly_predictions(week: int, num_simulations=3000, num_workers=None):
+def get_weekly_game_models() -> tuple[list, list]:
+    # Models whose fourth down model is available, with their labels in the prediction CSVs
+    game_models, model_labels = [], []
+    for model_code, model_label in WEEKLY_GAME_MODELS.items():
+        game_model = initialize_new_game_model_instance(model_code)
+        if not game_model.is_playable():
+            print(f"Leaving {model_label} out of the predictions, its {game_model.fourth_down_model_name} fourth down model is not available.")
+            continue
+        game_models.append(game_model)
+        model_labels.append(model_label)
+    return game_models, model_labels
+
+def run_weekly_predictions(week: int, num_simulations=3000, num_workers=None, seed=None, adaptive=False,
+                           target_win_pct_se=ADAPTIVE_TARGET_WIN_PCT_SE, target_score_diff_se=ADAPTIVE_TARGET_SCORE_DIFF_SE, paired=False,
+                           simulation_budget=None):
+    # Every model and matchup of the week runs as one slate (see run_slate_simulations)
     prediction_run_start = time()
+    if seed is None:
+        seed = generate_seed()
+    print(f"Running weekly predictions with seed {seed}.")
     matchups = read_matchup_column(f"input_week_{week}.txt")
-    game_models = [
-        PrototypeGameModel(), initialize_new_game_model_instance("v1"), 
-        initialize_new_game_model_instance("v1a"), initialize_new_game_model_instance("v1b"),
-        initialize_new_game_model_instance("v2"), initialize_new_game_model_instance("v2a"),
-        initialize_new_game_model_instance("v2b")
-    ]
-    prediction_results = {key: [] for key in matchups}
-    for game_model in game_models:
-        for matchup in matchups:
-            away_team = matchup[0].strip()
-            home_team = matchup[1].strip()
-            print(f"Running simulations for {away_team} at {home_team} with {game_model.get_model_code()}")
-            result = run_multiple_simulations_multi_threaded(home_team, away_team, num_simulations, game_model, num_workers=num_workers)
-            prediction_results[matchup].append(parse_simulation_result(result["average_score_diff"], home_team, away_team))
-            prediction_results[matchup].append(matchup[1] + " WP%: " + str(result["home_win_pct"]))
+    game_models, model_labels = get_weekly_game_models()
+    slate_results = run_slate_simulations(matchups, game_models, num_simulations, num_workers=num_workers, seed=seed, adaptive=adaptive,
+                                          target_win_pct_se=target_win_pct_se, target_score_diff_se=target_score_diff_se, paired=paired,
+                                          simulation_budget=simulation_budget)
+    report_precision = adaptive or simulation_budget is not None
+    # One dict per matchup with every model's predictions, under the model's label
+    prediction_rows = {matchup: {"Matchup": f"{matchup[0]} v {matchup[1]}"} for matchup in matchups}
+    precision_rows = {matchup: {} for matchup in matchups}
+    paired_game_scores = {matchup: {} for matchup in matchups}
+    for (model_index, matchup_index), result in slate_results.items():
+        matchup = matchups[matchup_index]
+        model_label = model_labels[model_index]
+        prediction_rows[matchup][model_label] = parse_simulation_result(result["average_score_diff"], matchup[1].strip(), matchup[0].strip())
+        prediction_rows[matchup][f"{model_label}_WP"] = matchup[1] + " WP%: " + str(result["home_win_pct"])
+        precision_rows[matchup].update({
+            f"{model_label}_N": result["num_simulations"],
+            f"{model_label}_WP_SE": result["home_win_pct_standard_error"],
+            f"{model_label}_Diff_SE": result["average_score_diff_standard_error"]
+        })
+        if paired:
+            paired_game_scores[matchup][model_label] = np.array(result["game_scores"])
+        print(f"{model_label} {matchup[0]} at {matchup[1]}: {prediction_rows[matchup][model_label]}, {prediction_rows[matchup][f'{model_label}_WP']} "
+              f"over {result['num_simulations']} simulations")
+    total_simulations = sum(result["num_simulations"] for result in slate_results.values())
 
     with open("weekly_predictions_enhanced.csv", "w", newline='') as output_file:
-        csv_fieldnames = ["Matchup", "Prototype", "Prototype_WP", "V1", "V1_WP", "V1a", "V1a_WP", "V1b", "V1b_WP", "V2", "V2_WP", "V2a", "V2a_WP", "V2b", "V2b_WP"]
+        csv_fieldnames = ["Matchup"] + [column for model_label in model_labels for column in (model_label, f"{model_label}_WP")]
+        if report_precision:
+            csv_fieldnames += [f"{model_label}_{column}" for model_label in model_labels for column in ("N", "WP_SE", "Diff_SE")]
         writer = csv.DictWriter(output_file, fieldnames=csv_fieldnames)
         writer.writeheader()
         for matchup in matchups:
-            writer.writerow({
-                "Matchup": f"{matchup[0]} v {matchup[1]}",
-                "V2b_WP": prediction_results[matchup][13],
-                "V2b": prediction_results[matchup][12],
-                "V2a_WP": prediction_results[matchup][11],
-                "V2a": prediction_results[matchup][10],
-                "V2_WP": prediction_results[matchup][9],
-                "V2": prediction_results[matchup][8],
-                "V1b_WP": prediction_results[matchup][7],
-                "V1b": prediction_results[matchup][6],
-                "V1a_WP": prediction_results[matchup][5],
-                "V1a": prediction_results[matchup][4],
-                "V1_WP": prediction_results[matchup][3],
-                "V1": prediction_results[matchup][2],
-                "Prototype_WP": prediction_results[matchup][1],
-                "Prototype": prediction_results[matchup][0]
-            })
+            writer.writerow(dict(prediction_rows[matchup], **precision_rows[matchup]) if report_precision else prediction_rows[matchup])
 
     with open("weekly_predictions.csv", "w", newline='') as output_file:
-        writer = csv.DictWriter(output_file, fieldnames=["Matchup", "Prototype", "V1", "V1a", "V1b", "V2", "V2a", "V2b"])
+        writer = csv.DictWriter(output_file, fieldnames=["Matchup"] + model_labels, extrasaction="ignore")
         writer.writeheader()
         for matchup in matchups:
-            writer.writerow({
-                "Matchup": f"{matchup[0]} v {matchup[1]}",
-                "V2b": prediction_results[matchup][12],
-                "V2a": prediction_results[matchup][10],
-                "V2": prediction_results[matchup][8],
-                "V1b": prediction_results[matchup][6],
-                "V1a": prediction_results[matchup][4],
-                "V1": prediction_results[matchup][2],
-                "Prototype": prediction_results[matchup][0]
-            })
+            writer.writerow(prediction_rows[matchup])
+    if paired:
+        write_paired_predictions_csv(matchups, model_labels, paired_game_scores)
+
     prediction_run_end = time()
     prediction_run_time = prediction_run_end - prediction_run_start
     print(f"Prediction run time: {prediction_run_time} seconds.")
+    if simulation_budget is not None:
+        print(f"Used {total_simulations} of a budget of {simulation_budget} simulations.")
+    elif adaptive:
+        print(f"Used {total_simulations} of at most {num_simulations * len(game_models) * len(matchups)} simulations.")
     print("Weekly predictions have been written to 'weekly_predictions.csv'.")
 
-def generate_simulation_stats_summary(home_team: Team, away_team: Team, home_wins: int, 
-                                      num_simulations: int, home_team_stats_df_list: list[pd.DataFrame], 
-                                      away_team_stats_df_list: list[pd.DataFrame], debug_mode=True) -> dict:
-    
-    home_team_sim_stats_df = pd.concat(home_team_stats_df_list)
-    away_team_sim_stats_df = pd.concat(away_team_stats_df_list)
+def write_paired_predictions_csv(matchups: list, model_labels: list, paired_game_scores: dict) -> None:
+    # One row per matchup and pair of models, with how far the second model's predictions are from the first's
+    with open("weekly_predictions_paired.csv", "w", newline='') as output_file:
+        writer = csv.DictWriter(output_file, fieldnames=["Matchup", "Baseline", "Model", "N", "WP_Diff", "WP_Diff_SE", "Independent_WP_Diff_SE",
+                                                         "Score_Diff_Diff", "Score_Diff_Diff_SE", "Independent_Score_Diff_Diff_SE"])
+        writer.writeheader()
+        for matchup in matchups:
+            for baseline_index, baseline_label in enumerate(model_labels):
+                for model_label in model_labels[baseline_index + 1:]:
+                    comparison = compare_paired_game_scores(paired_game_scores[matchup][model_label], paired_game_scores[matchup][baseline_label])
+                    writer.writerow({
+                        "Matchup": f"{matchup[0]} v {matchup[1]}",
+                        "Baseline": baseline_label,
+                        "Model": model_label,
+                        "N": comparison["num_paired_games"],
+                        "WP_Diff": comparison["home_win_pct_difference"],
+                        "WP_Diff_SE": comparison["home_win_pct_difference_standard_error"],
+                        "Independent_WP_Diff_SE": comparison["independent_home_win_pct_difference_standard_error"],
+                        "Score_Diff_Diff": comparison["average_score_diff_difference"],
+                        "Score_Diff_Diff_SE": comparison["average_score_diff_difference_standard_error"],
+                        "Independent_Score_Diff_Diff_SE": comparison["independent_average_score_diff_difference_standard_error"]
+                    })
+    print("Paired model comparisons have been written to 'weekly_predictions_paired.csv'.")
+
+def write_team_sim_stats_csvs(home_team: Team, away_team: Team, home_team_sim_stats_df: pd.DataFrame, away_team_sim_stats_df: pd.DataFrame) -> None:
     combined_sim_stats_df = pd.concat([home_team_sim_stats_df, away_team_sim_stats_df])
-    
-    if debug_mode:
-        home_team_sim_stats_df.to_csv(f"../simulation_logs/{home_team.name}_sim_stats.csv", index=True)
-        away_team_sim_stats_df.to_csv(f"../simulation_logs/{away_team.name}_sim_stats.csv", index=True)
-        combined_sim_stats_df.to_csv(f"../simulation_logs/{home_team.name}_{away_team.name}_sim_stats.csv", index=True)
+    home_team_sim_stats_df.to_csv(f"../simulation_logs/{home_team.name}_sim_stats.csv", index=True)
+    away_team_sim_stats_df.to_csv(f"../simulation_logs/{away_team.name}_sim_stats.csv", index=True)
+    combined_sim_stats_df.to_csv(f"../simulation_logs/{home_team.name}_{away_team.name}_sim_stats.csv", index=True)
 
-    home_team_df = home_team_sim_stats_df
-    away_team_df = away_team_sim_stats_df
+def write_featured_game_csv(featured_play_log: list) -> None:
+    featured_play_log_df = pd.DataFrame(featured_play_log)
+    featured_play_log_df["game_time_elapsed"] = (featured_play_log_df["game_seconds_remaining"] - 3600) * -1
+    featured_play_log_df.to_csv("logs/featured_game.csv", index=True)
 
+def generate_simulation_stats_summary(home_team: Team, away_team: Team, simulation_aggregate: SimulationAggregate, debug_mode=True, output_level="full") -> dict:
     stats_columns = ["team","score","run_rate","pass_rate","pass_cmp_rate",
                     "pass_yards","passing_tds","sacks_allowed","pass_yards_per_play",
                     "rushing_attempts","rushing_yards","rushing_tds","rush_yards_per_play",
                     "total_turnovers","fg_pct"]
+    if output_level == "scores":
+        stats_columns = ["team","score"]
+
+    home_team_sim_stats_dict = {"team": home_team.name}
+    home_team_sim_stats_dict.update({stat: round(mean, 2) for stat, mean in simulation_aggregate.get_stat_means(0).items() if stat in stats_columns})
+    away_team_sim_stats_dict = {"team": away_team.name}
+    away_team_sim_stats_dict.update({stat: round(mean, 2) for stat, mean in simulation_aggregate.get_stat_means(1).items() if stat in stats_columns})
 
-    home_team_sim_stats_dict = {
-                "team": home_team_df["team"].iloc[0],
-                "score": round(home_team_df["score"].mean(), 2),
-                "run_rate": round(home_team_df["run_rate"].mean(), 2),
-                "pass_rate": round(home_team_df["pass_rate"].mean(), 2),
-                "pass_cmp_rate": round(home_team_df["pass_cmp_rate"].mean(), 2),
-                "pass_yards": round(home_team_df["pass_yards"].mean(), 2),
-                "passing_tds": round(home_team_df["passing_tds"].mean(), 2),
-                "sacks_allowed": round(home_team_df["sacks_allowed"].mean(), 2),
-                "pass_yards_per_play": round(home_team_df["pass_yards_per_play"].mean(), 2),
-                "rushing_attempts": round(home_team_df["rushing_attempts"].mean(), 2),
-                "rushing_yards": round(home_team_df["rushing_yards"].mean(), 2),
-                "rushing_tds": round(home_team_df["rushing_tds"].mean(), 2),
-                "rush_yards_per_play": round(home_team_df["rush_yards_per_play"].mean(), 2),
-                "total_turnovers": round(home_team_df["total_turnovers"].mean(), 2),
-                "fg_pct": round(home_team_df["fg_pct"].mean(), 2),
-            }
-
-    away_team_sim_stats_dict = {
-                "team": away_team_df["team"].iloc[0],
-                "score": round(away_team_df["score"].mean(), 2),
-                "run_rate": round(away_team_df["run_rate"].mean(), 2),
-                "pass_rate": round(away_team_df["pass_rate"].mean(), 2),
-                "pass_cmp_rate": round(away_team_df["pass_cmp_rate"].mean(), 2),
-                "pass_yards": round(away_team_df["pass_yards"].mean(), 2),
-                "passing_tds": round(away_team_df["passing_tds"].mean(), 2),
-                "sacks_allowed": round(away_team_df["sacks_allowed"].mean(), 2),
-                "pass_yards_per_play": round(away_team_df["pass_yards_per_play"].mean(), 2),
-                "rushing_attempts": round(away_team_df["rushing_attempts"].mean(), 2),
-                "rushing_yards": round(away_team_df["rushing_yards"].mean(), 2),
-                "rushing_tds": round(away_team_df["rushing_tds"].mean(), 2),
-                "rush_yards_per_play": round(away_team_df["rush_yards_per_play"].mean(), 2),
-                "total_turnovers": round(away_team_df["total_turnovers"].mean(), 2),
-                "fg_pct": round(away_team_df["fg_pct"].mean(), 2),
-            }
-
-    home_team_sim_stats_df = pd.DataFrame(home_team_sim_stats_dict, index=[0], columns=stats_columns)
-    away_team_sim_stats_df = pd.DataFrame(away_team_sim_stats_dict, index=[0], columns=stats_columns)
-
-    total_sim_stats_df = pd.concat([home_team_sim_stats_df, away_team_sim_stats_df])
+    total_sim_stats_df = pd.DataFrame([home_team_sim_stats_dict, away_team_sim_stats_dict], index=[0, 0], columns=stats_columns)
     if debug_mode:
         stats_csv_path = "../simulation_logs/total_sim_stats.csv"
         total_sim_stats_df.to_csv(stats_csv_path, index=False)
     total_sim_stats_dict = total_sim_stats_df.reset_index().to_dict(orient="records")
-    #print(total_sim_stats_dict)
 
+    # Standard errors of the averages above, and percentiles of each stat if they were tracked
+    total_sim_stats_standard_errors = []
+    total_sim_stats_percentiles = []
+    for team_index, team in enumerate((home_team, away_team)):
+        standard_errors = {"team": team.name}
+        standard_errors.update({stat: round(standard_error, 4) for stat, standard_error in simulation_aggregate.get_stat_standard_errors(team_index).items() if stat in stats_columns})
+        total_sim_stats_standard_errors.append(standard_errors)
+        if simulation_aggregate.stat_sketches is not None:
+            for percentile in SIM_STATS_PERCENTILES:
+                percentiles = {"team": team.name, "percentile": percentile}
+                percentiles.update({stat: round(value, 2) for stat, value in simulation_aggregate.get_stat_percentiles(team_index, percentile).items() if stat in stats_columns})
+                total_sim_stats_percentiles.append(percentiles)
+
+    num_simulations = simulation_aggregate.num_games
     home_score = home_team_sim_stats_dict["score"]
     away_score = away_team_sim_stats_dict["score"]
     average_score_diff = home_score - away_score
-    home_win_pct = round(100 * (home_wins/num_simulations), 2)
+    home_win_pct = round(100 * (simulation_aggregate.home_wins/num_simulations), 2)
     #result_string = f"{home_team.name} wins {home_win_pct} percent of the time."
     result_string = f"Average score difference: {round(average_score_diff, 2)}"
     result_string += f"\nAverage total score: {round(home_score+away_score, 2)}"
     print(result_string)
 
-    return {
+    sim_result = {
         "result_string": result_string,
         "home_win_pct": home_win_pct,
         "total_sim_stats": total_sim_stats_dict,
-        "average_score_diff": average_score_diff
+        "total_sim_stats_standard_errors": total_sim_stats_standard_errors,
+        # Number of games each team finished with each score, indexed by score
+        "score_distributions": {team_name: histogram.tolist() for team_name, histogram in zip(simulation_aggregate.team_names, simulation_aggregate.score_histograms)},
+        "average_score_diff": average_score_diff,
+        # How many games the averages are over and how precise the headline numbers are
+        "num_simulations": num_simulations,
+        "home_win_pct_standard_error": round(simulation_aggregate.get_home_win_pct_standard_error(), 4),
+        "average_score_diff_standard_error": round(simulation_aggregate.get_score_diff_standard_error(), 4),
+        "home_win_pct_confidence_interval": get_confidence_interval(home_win_pct, simulation_aggregate.get_home_win_pct_standard_error()),
+        "average_score_diff_confidence_interval": get_confidence_interval(average_score_diff, simulation_aggregate.get_score_diff_standard_error())
     }
+    if simulation_aggregate.stat_sketches is not None:
+        sim_result["total_sim_stats_percentiles"] = total_sim_stats_percentiles
+    return sim_result
 
-def run_multiple_simulations_with_statistics(home_team_abbrev: str, away_team_abbrev: str, num_simulations: int, game_model=PrototypeGameModel(), debug_mode=True) -> dict:
+def get_confidence_interval(mean: float, standard_error: float) -> list:
+    return [round(mean - CONFIDENCE_INTERVAL_Z * standard_error, 2), round(mean + CONFIDENCE_INTERVAL_Z * standard_error, 2)]
+
+def run_multiple_simulations_with_statistics(home_team_abbrev: str, away_team_abbrev: str, num_simulations: int, game_model=PrototypeGameModel(), debug_mode=True, seed=None, track_percentiles=False, output_level="full") -> dict:
+    if output_level not in OUTPUT_LEVELS:
+        raise ValueError(f"Unknown output level: {output_level}, expected one of {OUTPUT_LEVELS}")
     home_team, away_team = initialize_teams_for_game_engine(home_team_abbrev, away_team_abbrev)
+    # Score-only runs have no per-game team stats to write out
+    debug_mode = debug_mode and output_level == "full"
 
-    home_wins = 0
-    i = 0
     print(f"Running {num_simulations} simulations of {away_team.name} at {home_team.name}.")
 
-    home_team_stats_df_list= []
-    away_team_stats_df_list = []
+    # Per-game stats are only kept to write them out in debug mode
+    simulation_aggregate = SimulationAggregate(home_team.name, away_team.name, track_percentiles=track_percentiles)
+    home_team_stats_list = []
+    away_team_stats_list = []
 
+    game_engine = GameEngine(home_team, away_team, game_model)
     with tqdm(total=num_simulations) as pbar:
-        while i < num_simulations:
-            game_engine = GameEngine(home_team, away_team, game_model)
-            game_summary = game_engine.run_simulation()
-            final_score = game_summary["final_score"]
-            if final_score[home_team.name] > final_score[away_team.name]:
-                home_wins += 1
-            home_team_stats_df_list.append(pd.DataFrame([game_summary[home_team.name]]))
-            away_team_stats_df_list.append(pd.DataFrame([game_summary[away_team.name]]))
-            i += 1
+        for game_summary in game_engine.run_many(num_simulations, seed=seed, output_level=output_level):
+            simulation_aggregate.add_game(game_summary)
+            if debug_mode:
+                home_team_stats_list.append(game_summary[home_team.name])
+                away_team_stats_list.append(game_summary[away_team.name])
             pbar.update(1)
 
-    return generate_simulation_stats_summary(home_team, away_team, home_wins, num_simulations, home_team_stats_df_list, away_team_stats_df_list, debug_mode=debug_mode)
-
-def run_simulation_chunk(home_team: Team, away_team: Team, game_model: AbstractGameModel, start_index: int, num_simulations_for_chunk: int) -> list:
-    chunk_results = []
-    for i in range(num_simulations_for_chunk):
-        game_engine = GameEngine(home_team, away_team, game_model)
-        game_summary = game_engine.run_simulation()
-        chunk_results.append((start_index + i, game_summary))
-    return chunk_results
-
-def run_multiple_simulations_multi_threaded(home_team_abbrev: str, away_team_abbrev: str, num_simulations: int, game_model=PrototypeGameModel(), num_workers=None, debug_mode=True) -> dict:
-    home_team, away_team = initialize_teams_for_game_engine(home_team_abbrev, away_team_abbrev)
-    print(f"Running {num_simulations} simulations of {away_team.name} at {home_team.name}.")
+    if debug_mode:
+        write_team_sim_stats_csvs(home_team, away_team, pd.DataFrame(home_team_stats_list), pd.DataFrame(away_team_stats_list))
+    return generate_simulation_stats_summary(home_team, away_team, simulation_aggregate, debug_mode=debug_mode, output_level=output_level)
 
+def get_number_of_workers(num_workers: int = None) -> int:
     ## The default number of workers is half the number of CPU cores
-    number_of_workers = min(num_simulations, os.cpu_count() // 2)
     if num_workers:
-        number_of_workers = num_workers
-    chunk_size = math.ceil(num_simulations / number_of_workers)
-
-    print(f"Using a chunk size of {chunk_size} and {number_of_workers} workers...\n")
-
+        return num_workers
+    return max(1, os.cpu_count() // 2)
+
+def submit_simulation_round(simulation_pool: SimulationPool, home_team_abbrev: str, away_team_abbrev: str, model_descriptor: tuple,
+                            start_index: int, round_size: int, seed: int, featured_game_index: int = None,
+                            track_percentiles: bool = False, output_level: str = "full", paired: bool = False,
+                            sampling: str = "plain", chunk_size: int = None, batch: bool = False) -> list:
+    # Splits a round into chunks of chunk_size games, or one chunk per worker by default
+    if chunk_size is None:
+        chunk_size = math.ceil(round_size / min(round_size, simulation_pool.num_workers))
+    end_index = start_index + round_size
     futures = []
-    with ProcessPoolExecutor(max_workers=number_of_workers) as executor:
-        start_index = 0
-        for _ in range(number_of_workers):
-            sim_count_for_curr_chunk = min(chunk_size, num_simulations - start_index)
-            if sim_count_for_curr_chunk <= 0:
+    for chunk_start_index in range(start_index, end_index, chunk_size):
+        futures.append(simulation_pool.submit_simulation_chunk(
+            home_team_abbrev,
+            away_team_abbrev,
+            model_descriptor,
+            chunk_start_index,
+            min(chunk_size, end_index - chunk_start_index),
+            seed,
+            featured_game_index,
+            track_percentiles,
+            output_level,
+            paired,
+            sampling,
+            batch
+        ))
+    return futures
+
+def run_simulation_rounds(simulation_pool: SimulationPool, home_team_abbrev: str, away_team_abbrev: str, model_descriptor: tuple,
+                          simulation_aggregate: SimulationAggregate, get_next_round_size, seed: int, featured_game_index: int = None,
+                          track_percentiles: bool = False, output_level: str = "full", paired: bool = False,
+                          sampling: str = "plain", batch: bool = False) -> int:
+    # Runs rounds of games until get_next_round_size returns 0, returns the number of rounds run
+    num_rounds = 0
+    round_size = get_next_round_size(simulation_aggregate)
+    while round_size > 0:
+        futures = submit_simulation_round(simulation_pool, home_team_abbrev, away_team_abbrev, model_descriptor, simulation_aggregate.num_games,
+                                          round_size, seed, featured_game_index, track_percentiles, output_level, paired, sampling,
+                                          batch=batch)
+        print(f"Running {round_size} simulations over {len(futures)} chunks...")
+        pending_futures = dict.fromkeys(futures)
+        with tqdm(total=len(futures)) as pbar:
+            while pending_futures:
+                done_futures, __ = wait(pending_futures, return_when=FIRST_COMPLETED)
+                for future in done_futures:
+                    try:
+                        chunk_aggregate = future.result()
+                    except BrokenProcessPool:
+                        # A worker died, every chunk still out is run again on fresh workers
+                        pending_futures = simulation_pool.resubmit_simulation_chunks(pending_futures)
+                        break
+                    del pending_futures[future]
+                    simulation_aggregate.merge(chunk_aggregate)
+                    pbar.update(1)
+        num_rounds += 1
+        round_size = get_next_round_size(simulation_aggregate)
+    return num_rounds
+
+def get_adaptive_round_size(simulation_aggregate: SimulationAggregate, max_simulations: int, target_win_pct_se: float,
+                            target_score_diff_se: float, min_round_size: int = ADAPTIVE_MIN_ROUND_SIZE) -> int:
+    # Games to add to an adaptive run, 0 once both standard errors are within their targets
+    num_games = simulation_aggregate.num_games
+    if num_games >= max_simulations:
+        return 0
+    standard_errors = (simulation_aggregate.get_home_win_pct_standard_error(), simulation_aggregate.get_score_diff_standard_error())
+    # No standard errors yet
+    if not all(math.isfinite(standard_error) for standard_error in standard_errors):
+        return min(min_round_size, max_simulations - num_games)
+    targets = (target_win_pct_se, target_score_diff_se)
+    if all(standard_error <= target for standard_error, target in zip(standard_errors, targets)):
+        return 0
+    # Standard errors shrink with the square root of the number of games
+    required_games = max(num_games * (standard_error / target)**2 for standard_error, target in zip(standard_errors, targets))
+    return max(0, min(max(math.ceil(required_games) - num_games, min_round_size), max_simulations - num_games))
+
+def get_time_budget_round_size(simulation_aggregate: SimulationAggregate, max_simulations: int, run_start: float, deadline: float,
+                               pilot_round_size: int) -> int:
+    # Games to add to a time-budgeted run, 0 once a round as big as the pilot round no longer fits
+    num_games = simulation_aggregate.num_games
+    if num_games == 0:
+        return min(pilot_round_size, max_simulations)
+    current_time = perf_counter()
+    games_per_second = num_games / (current_time - run_start)
+    round_size = int(games_per_second * (deadline - current_time) * TIME_BUDGET_ROUND_FRACTION)
+    if round_size < pilot_round_size:
+        return 0
+    return min(round_size, max_simulations - num_games)
+
+def run_multiple_simulations_multi_threaded(home_team_abbrev: str, away_team_abbrev: str, num_simulations: int, game_model=PrototypeGameModel(), num_workers=None, debug_mode=True, seed=None, track_percentiles=False, output_level="full",
+                                            adaptive=False, target_win_pct_se=ADAPTIVE_TARGET_WIN_PCT_SE, target_score_diff_se=ADAPTIVE_TARGET_SCORE_DIFF_SE,
+                                            paired=False, sampling="plain", time_budget_ms=None, batch=False) -> dict:
+    # Adaptive and time-budgeted runs simulate in rounds, with num_simulations as the most games
+    if output_level not in OUTPUT_LEVELS:
+        raise ValueError(f"Unknown output level: {output_level}, expected one of {OUTPUT_LEVELS}")
+    if sampling not in SAMPLING_SCHEMES:
+        raise ValueError(f"Unknown sampling scheme: {sampling}, expected one of {SAMPLING_SCHEMES}")
+    if batch and not game_model.supports_batch_simulation():
+        raise ValueError(f"Game model {game_model.get_model_code()} does not support batch simulation")
+    if batch and (paired or sampling != "plain"):
+        raise ValueError("Batch simulation only supports unpaired runs with plain sampling")
+    home_team, away_team = initialize_teams_for_game_engine(home_team_abbrev, away_team_abbrev)
+    if time_budget_ms is not None:
+        print(f"Running up to {num_simulations} simulations of {away_team.name} at {home_team.name} within {time_budget_ms} ms.")
+    elif adaptive:
+        print(f"Running up to {num_simulations} simulations of {away_team.name} at {home_team.name}, until the win percentage "
+              f"and score difference standard errors are within {target_win_pct_se} and {target_score_diff_se}.")
+    else:
+        print(f"Running {num_simulations} simulations of {away_team.name} at {home_team.name}.")
+
+    # Every game is seeded from its own stream, so results don't depend on the number of workers
+    if seed is None:
+        seed = generate_seed()
+
+    number_of_workers = get_number_of_workers(num_workers)
+    print(f"Using {number_of_workers} workers...\n")
+
+    # Randomly choose a game to be featured in detail on the frontend, from the first round if there are several
+    pilot_games_per_worker = TIME_BUDGET_PILOT_GAMES_PER_WORKER
+    if time_budget_ms is not None:
+        pilot_games_per_worker = max(1, min(pilot_games_per_worker, int(time_budget_ms * TIME_BUDGET_ROUND_FRACTION / TIME_BUDGET_PILOT_GAME_MS)))
+    pilot_round_size = pilot_games_per_worker * number_of_workers
+    featured_game_range = num_simulations
+    if time_budget_ms is not None:
+        featured_game_range = min(num_simulations, pilot_round_size)
+    elif adaptive:
+        featured_game_range = min(num_simulations, ADAPTIVE_MIN_ROUND_SIZE)
+    featured_game_index = int(spawn_generator(seed).integers(featured_game_range))
+    if output_level == "scores":
+        featured_game_index = None
+
+    # The pool outlives this call, chunks only carry the matchup, the model's descriptor and where they start
+    simulation_pool = get_simulation_pool(number_of_workers)
+    if time_budget_ms is not None:
+        # The budget counts from once the pool's workers are up, so a cold start doesn't use it up
+        simulation_pool.warm_up()
+        run_start = perf_counter()
+        deadline = run_start + time_budget_ms / 1000
+        if adaptive:
+            get_next_round_size = lambda aggregate: min(get_time_budget_round_size(aggregate, num_simulations, run_start, deadline, pilot_round_size),
+                                                        get_adaptive_round_size(aggregate, num_simulations, target_win_pct_se, target_score_diff_se,
+                                                                                min_round_size=pilot_round_size))
+        else:
+            get_next_round_size = lambda aggregate: get_time_budget_round_size(aggregate, num_simulations, run_start, deadline, pilot_round_size)
+    elif adaptive:
+        get_next_round_size = lambda aggregate: get_adaptive_round_size(aggregate, num_simulations, target_win_pct_se, target_score_diff_se)
+    else:
+        get_next_round_size = lambda aggregate: num_simulations - aggregate.num_games
+    simulation_aggregate = SimulationAggregate(home_team.name, away_team.name, track_percentiles=track_percentiles, track_game_scores=paired,
+                                               sampling_group_size=SAMPLING_GROUP_SIZES[sampling])
+    num_rounds = run_simulation_rounds(simulation_pool, home_team_abbrev, away_team_abbrev, game_model.get_model_descriptor(), simulation_aggregate,
+                                       get_next_round_size, seed, featured_game_index, track_percentiles, output_level, paired, sampling, batch)
+
+    sim_result = generate_simulation_stats_summary(home_team, away_team, simulation_aggregate, debug_mode=debug_mode, output_level=output_level)
+    sim_result["seed"] = seed
+    if time_budget_ms is not None:
+        sim_result["time_budget_ms"] = time_budget_ms
+        sim_result["elapsed_ms"] = round(1000 * (perf_counter() - run_start))
+        sim_result["num_simulation_rounds"] = num_rounds
+    if adaptive:
+        sim_result["num_simulation_rounds"] = num_rounds
+        sim_result["precision_targets_met"] = bool(simulation_aggregate.get_home_win_pct_standard_error() <= target_win_pct_se
+                                                   and simulation_aggregate.get_score_diff_standard_error() <= target_score_diff_se)
+    if paired:
+        sim_result["game_scores"] = simulation_aggregate.get_game_scores().tolist()
+    if sampling != "plain":
+        sim_result["sampling"] = sampling
+        sim_result["variance_reduction"] = {stat: round(variance_reduction, 2) for stat, variance_reduction in simulation_aggregate.get_variance_reduction().items()}
+        print(f"{sampling.capitalize()} sampling reduced the variance of the win percentage {sim_result['variance_reduction']['home_win_pct']} "
+              f"times and of the score difference {sim_result['variance_reduction']['average_score_diff']} times.")
+    if output_level == "scores":
+        return sim_result
+
+    featured_play_log = simulation_aggregate.featured_play_log
+    if debug_mode:
+        write_featured_game_csv(featured_play_log)
+    sim_result["featured_game_home_pass_data"] = plu.get_team_passing_stats(home_team_abbrev, featured_play_log)
+    sim_result["featured_game_away_pass_data"] = plu.get_team_passing_stats(away_team_abbrev, featured_play_log)
+    sim_result["featured_game_home_rush_data"] = plu.get_team_rushing_stats(home_team_abbrev, featured_play_log)
+    sim_result["featured_game_away_rush_data"] = plu.get_team_rushing_stats(away_team_abbrev, featured_play_log)
+    sim_result["featured_game_home_scoring_data"] = plu.get_team_scoring(home_team_abbrev, featured_play_log)
+    sim_result["featured_game_away_scoring_data"] = plu.get_team_scoring(away_team_abbrev, featured_play_log)
+    return sim_result
+
+def run_slate_rounds(simulation_pool: SimulationPool, slate_runs: dict, get_next_round_size, output_level: str = "scores",
+                     paired: bool = False, sampling: str = "plain", chunk_size: int = SLATE_CHUNK_SIZE) -> dict:
+    # Runs every run of a slate on the one pool, returns the number of rounds of each run
+    num_rounds = dict.fromkeys(slate_runs, 0)
+    unfinished_chunks = dict.fromkeys(slate_runs, 0)
+    pending_futures = {}
+    ready_keys = list(slate_runs)
+    with tqdm(unit=" games") as pbar:
+        while ready_keys or pending_futures:
+            for key in ready_keys:
+                home_team_abbrev, away_team_abbrev, model_descriptor, seed, simulation_aggregate = slate_runs[key]
+                round_size = get_next_round_size(key, simulation_aggregate)
+                if round_size <= 0:
+                    continue
+                futures = submit_simulation_round(simulation_pool, home_team_abbrev, away_team_abbrev, model_descriptor, simulation_aggregate.num_games,
+                                                  round_size, seed, None, False, output_level, paired, sampling, chunk_size=chunk_size)
+                pending_futures.update(dict.fromkeys(futures, key))
+                unfinished_chunks[key] = len(futures)
+                num_rounds[key] += 1
+            ready_keys = []
+            if not pending_futures:
+                break
+            done_futures, __ = wait(pending_futures, return_when=FIRST_COMPLETED)
+            for future in done_futures:
+                try:
+                    chunk_aggregate = future.result()
+                except BrokenProcessPool:
+                    pending_futures = simulation_pool.resubmit_simulation_chunks(pending_futures)
+                    break
+                key = pending_futures.pop(future)
+                slate_runs[key][4].merge(chunk_aggregate)
+                pbar.update(chunk_aggregate.num_games)
+                unfinished_chunks[key] -= 1
+                if unfinished_chunks[key] == 0:
+                    ready_keys.append(key)
+    return num_rounds
+
+def allocate_slate_simulations(slate_aggregates: dict, budget: int, max_simulations: int, target_win_pct_se: float,
+                               target_score_diff_se: float) -> dict:
+    # Splits up to budget more games between the runs of a slate, the least precise runs get the most
+    keys = list(slate_aggregates)
+    num_games = np.array([slate_aggregates[key].num_games for key in keys], dtype=np.float64)
+    # Per-game variances of each run's estimates, as its standard errors would shrink with more games
+    standard_errors = np.array([(slate_aggregates[key].get_home_win_pct_standard_error(), slate_aggregates[key].get_score_diff_standard_error())
+                                for key in keys])
+    game_variances = np.nan_to_num(num_games[:, None] * standard_errors**2)
+    targets = np.array([target_win_pct_se, target_score_diff_se])
+
+    get_additional_games = lambda precision_level: np.clip(np.ceil(np.max(game_variances / (precision_level * targets)**2, axis=1)),
+                                                           num_games, max_simulations) - num_games
+
+    # Bisection on the multiple of the targets every run is brought down to
+    low_level, high_level = 1.0, max(1.0, 1.01 * float(np.max(np.nan_to_num(standard_errors) / targets)))
+    if get_additional_games(low_level).sum() > budget:
+        for __ in range(50):
+            precision_level = (low_level + high_level) / 2
+            if get_additional_games(precision_level).sum() > budget:
+                low_level = precision_level
+            else:
+                high_level = precision_level
+        low_level = high_level
+    return {key: int(additional_games) for key, additional_games in zip(keys, get_additional_games(low_level))}
+
+def run_slate_simulations(matchups: list, game_models: list, num_simulations: int, num_workers=None, seed=None, adaptive=False,
+                          target_win_pct_se=ADAPTIVE_TARGET_WIN_PCT_SE, target_score_diff_se=ADAPTIVE_TARGET_SCORE_DIFF_SE,
+                          paired=False, sampling="plain", simulation_budget=None) -> dict:
+    # Simulates every game model on every matchup of a slate on one pool, see run_slate_rounds
+    if sampling not in SAMPLING_SCHEMES:
+        raise ValueError(f"Unknown sampling scheme: {sampling}, expected one of {SAMPLING_SCHEMES}")
+    for game_model in game_models:
+        if not game_model.is_playable():
+            raise ValueError(f"Game model {game_model.get_model_code()} cannot play, its {game_model.fourth_down_model_name} fourth down model is not available")
+    pilot_round_size = min(ADAPTIVE_MIN_ROUND_SIZE, num_simulations)
+    if simulation_budget is not None and simulation_budget < pilot_round_size * len(game_models) * len(matchups):
+        raise ValueError(f"A simulation budget of {simulation_budget} does not cover the pilot rounds of "
+                         f"{pilot_round_size * len(game_models) * len(matchups)} simulations")
+    if seed is None:
+        seed = generate_seed()
+    number_of_workers = get_number_of_workers(num_workers)
+    print(f"Running {len(game_models)} game models on {len(matchups)} matchups with {number_of_workers} workers.")
+
+    # Copies of the shared teams, since the block is closed while this process still holds them
+    league_teams = get_shared_league_data().build_teams(copy=True)
+    slate_runs = {}
+    for model_index, game_model in enumerate(game_models):
+        for matchup_index, matchup in enumerate(matchups):
+            away_team_abbrev, home_team_abbrev = matchup[0].strip(), matchup[1].strip()
+            # Paired runs share the matchup's seed across models, so game i of every model gets the same streams
+            run_seed = derive_seed(seed, matchup_index) if paired else derive_seed(seed, model_index, matchup_index)
+            simulation_aggregate = SimulationAggregate(home_team_abbrev, away_team_abbrev, track_game_scores=paired,
+                                                       sampling_group_size=SAMPLING_GROUP_SIZES[sampling])
+            slate_runs[(model_index, matchup_index)] = (home_team_abbrev, away_team_abbrev, game_model.get_model_descriptor(), run_seed, simulation_aggregate)
+
+    simulation_pool = get_simulation_pool(number_of_workers)
+    if simulation_budget is not None:
+        planned_games = dict.fromkeys(slate_runs, pilot_round_size)
+        get_next_round_size = lambda key, aggregate: planned_games[key] - aggregate.num_games
+        num_rounds = run_slate_rounds(simulation_pool, slate_runs, get_next_round_size, paired=paired, sampling=sampling)
+        slate_aggregates = {key: slate_run[4] for key, slate_run in slate_runs.items()}
+        for stage_index in range(SLATE_ALLOCATION_STAGES):
+            remaining_budget = simulation_budget - sum(aggregate.num_games for aggregate in slate_aggregates.values())
+            stage_budget = remaining_budget // (SLATE_ALLOCATION_STAGES - stage_index)
+            additional_games = allocate_slate_simulations(slate_aggregates, stage_budget, num_simulations, target_win_pct_se, target_score_diff_se)
+            print(f"Allocating {sum(additional_games.values())} of the {remaining_budget} simulations left in the budget.")
+            if not any(additional_games.values()):
                 break
-            futures.append(executor.submit(
-                run_simulation_chunk,
-                home_team,
-                away_team,
-                game_model,
-                start_index,
-                sim_count_for_curr_chunk
-            ))
-            start_index += sim_count_for_curr_chunk
-        
-        all_results = []
-        print(f"Running {num_simulations} simulations over {number_of_workers} chunks...")
-        with tqdm(total=number_of_workers) as pbar:
-            for future in as_completed(futures):
-                chunk_results = future.result()
-                all_results.extend(chunk_results)
-                pbar.update(1)
+            planned_games.update({key: slate_aggregates[key].num_games + additional_games[key] for key in slate_aggregates})
+            stage_rounds = run_slate_rounds(simulation_pool, slate_runs, get_next_round_size, paired=paired, sampling=sampling)
+            num_rounds = {key: num_rounds[key] + stage_rounds[key] for key in num_rounds}
+    else:
+        if adaptive:
+            get_next_round_size = lambda key, aggregate: get_adaptive_round_size(aggregate, num_simulations, target_win_pct_se, target_score_diff_se)
+        else:
+            get_next_round_size = lambda key, aggregate: num_simulations - aggregate.num_games
+        num_rounds = run_slate_rounds(simulation_pool, slate_runs, get_next_round_size, paired=paired, sampling=sampling)
+
+    slate_results = {}
+    for key, (home_team_abbrev, away_team_abbrev, __, run_seed, simulation_aggregate) in slate_runs.items():
+        sim_result = generate_simulation_stats_summary(league_teams[home_team_abbrev], league_teams[away_team_abbrev], simulation_aggregate,
+                                                       debug_mode=False, output_level="scores")
+        sim_result["seed"] = run_seed
+        if adaptive or simulation_budget is not None:
+            sim_result["num_simulation_rounds"] = num_rounds[key]
+            sim_result["precision_targets_met"] = bool(simulation_aggregate.get_home_win_pct_standard_error() <= target_win_pct_se
+                                                       and simulation_aggregate.get_score_diff_standard_error() <= target_score_diff_se)
+        if paired:
+            sim_result["game_scores"] = simulation_aggregate.get_game_scores().tolist()
+        if sampling != "plain":
+            sim_result["sampling"] = sampling
+            sim_result["variance_reduction"] = {stat: round(variance_reduction, 2) for stat, variance_reduction in simulation_aggregate.get_variance_reduction().items()}
+        slate_results[key] = sim_result
+    return slate_results
+
+def run_multiple_simulations_vectorized(home_team_abbrev: str, away_team_abbrev: str, num_simulations: int, game_model=PrototypeGameModel(), debug_mode=True, seed=None, track_percentiles=False) -> dict:
+    home_team, away_team = initialize_teams_for_game_engine(home_team_abbrev, away_team_abbrev)
+    print(f"Running {num_simulations} vectorized simulations of {away_team.name} at {home_team.name}.")
 
-    home_wins = 0
-    home_team_stats_df_list = []
-    away_team_stats_df_list = []
-    
-    # Randomly choose a game to be featured in detail on the frontend
-    featured_game_index = random.randint(0, len(all_results) - 1)
-    featured_play_log = None
-
-    for i, game_summary in all_results:
-        final_score = game_summary["final_score"]
-        if i == featured_game_index:
-            featured_play_log = pd.DataFrame(game_summary["play_log"])
-            featured_play_log["game_time_elapsed"] = (featured_play_log["game_seconds_remaining"] - 3600) * -1
-            if debug_mode:
-                featured_play_log.to_csv("logs/featured_game.csv", index=True)
-        if final_score[home_team.name] > final_score[away_team.name]:
-            home_wins += 1
-        home_team_stats_df_list.append(pd.DataFrame(game_summary[home_team_abbrev], index=[i]))
-        away_team_stats_df_list.append(pd.DataFrame(game_summary[away_team_abbrev], index=[i]))
-
-    sim_result = generate_simulation_stats_summary(home_team, away_team, home_wins, num_simulations, home_team_stats_df_list, away_team_stats_df_list, debug_mode=debug_mode)
-    sim_result["featured_game_home_pass_data"] = plu.generate_team_passing_stats_summary(home_team_abbrev, featured_play_log)
-    sim_result["featured_game_away_pass_data"] = plu.generate_team_passing_stats_summary(away_team_abbrev, featured_play_log)
-    sim_result["featured_game_home_rush_data"] = plu.generate_team_rushing_stats_summary(home_team_abbrev, featured_play_log)
-    sim_result["featured_game_away_rush_data"] = plu.generate_team_rushing_stats_summary(away_team_abbrev, featured_play_log)
-    sim_result["featured_game_home_scoring_data"] = plu.generate_team_scoring_summary(home_team_abbrev, featured_play_log)
-    sim_result["featured_game_away_scoring_data"] = plu.generate_team_scoring_summary(away_team_abbrev, featured_play_log)
+    if seed is None:
+        seed = generate_seed()
+    batch_game_engine = BatchGameEngine(home_team, away_team, game_model, num_simulations, rng=spawn_generator(seed))
+    batch_summary = batch_game_engine.run_simulations()
+
+    simulation_aggregate = SimulationAggregate(home_team.name, away_team.name, track_percentiles=track_percentiles)
+    simulation_aggregate.add_game_batch(batch_summary["final_scores"], batch_summary[home_team.name], batch_summary[away_team.name])
+    if debug_mode:
+        write_team_sim_stats_csvs(home_team, away_team, pd.DataFrame(batch_summary[home_team.name]), pd.DataFrame(batch_summary[away_team.name]))
+    sim_result = generate_simulation_stats_summary(home_team, away_team, simulation_aggregate, debug_mode=debug_mode)
+    sim_result["seed"] = seed
+
+    featured_play_log = batch_summary["featured_play_log"]
+    if debug_mode:
+        write_featured_game_csv(featured_play_log)
+    sim_result["featured_game_home_pass_data"] = plu.get_team_passing_stats(home_team_abbrev, featured_play_log)
+    sim_result["featured_game_away_pass_data"] = plu.get_team_passing_stats(away_team_abbrev, featured_play_log)
+    sim_result["featured_game_home_rush_data"] = plu.get_team_rushing_stats(home_team_abbrev, featured_play_log)
+    sim_result["featured_game_away_rush_data"] = plu.get_team_rushing_stats(away_team_abbrev, featured_play_log)
+    sim_result["featured_game_home_scoring_data"] = plu.get_team_scoring(home_team_abbrev, featured_play_log)
+    sim_result["featured_game_away_scoring_data"] = plu.get_team_scoring(away_team_abbrev, featured_play_log)
     return sim_result
 
 if __name__ == "__main__":
@@ -0,0 +1,193 @@
+from concurrent.futures import ProcessPoolExecutor, Future
+from concurrent.futures.process import BrokenProcessPool
+from nfl_simulation_engine_lite.db.db_conn import get_db_conn
+from nfl_simulation_engine_lite.game_model.game_model_factory import GAME_MODEL_CODES, initialize_new_game_model_instance, initialize_game_model_from_descriptor
+from nfl_simulation_engine_lite.game_model.game_model import AbstractGameModel
+from nfl_simulation_engine_lite.game_engine.game_engine import GameEngine
+from nfl_simulation_engine_lite.game_engine.batch_game_engine import BatchGameEngine
+from nfl_simulation_engine_lite.team.team import Team
+from nfl_simulation_engine_lite.team.shared_league_data import SharedLeagueData, publish_league_data
+from nfl_simulation_engine_lite.utils.random_stream import SAMPLING_GROUP_SIZES, spawn_generator
+from nfl_simulation_engine_lite.utils.simulation_aggregate import SimulationAggregate
+import nfl_simulation_engine_lite.team.team_factory as TeamFactory
+from multiprocessing.util import Finalize
+import atexit
+import os
+import weakref
+
+# Times a chunk is run before giving up on it, when its workers keep dying
+MAX_CHUNK_ATTEMPTS = 3
+
+# Loaded once per worker process by initialize_simulation_worker, game models keyed by their descriptor
+worker_league_data = None
+worker_teams = {}
+worker_game_models = {}
+
+def initialize_simulation_worker(league_data_handle: tuple) -> None:
+    # Teams are built on the league data the pool published in shared memory, their rate matrices are views of it
+    global worker_league_data
+    worker_league_data = SharedLeagueData.attach(league_data_handle)
+    worker_teams.update(worker_league_data.build_teams())
+    Finalize(None, close_worker_league_data, exitpriority=10)
+
+    for model_code in GAME_MODEL_CODES:
+        add_worker_game_model(initialize_new_game_model_instance(model_code))
+
+def close_worker_league_data() -> None:
+    # Runs when the worker exits, only the parent unlinks the block
+    global worker_league_data
+    worker_game_models.clear()
+    worker_teams.clear()
+    worker_league_data.close()
+    worker_league_data = None
+
+def add_worker_game_model(game_model: AbstractGameModel) -> AbstractGameModel:
+    worker_game_models[game_model.get_model_descriptor()] = game_model
+    # Load the fourth down forest up front as well, models without one fail on first use as before
+    if hasattr(game_model, "fourth_down_model_name"):
+        try:
+            game_model.fourth_down_model
+        except FileNotFoundError:
+            pass
+    return game_model
+
+def get_worker_game_model(model_descriptor: tuple) -> AbstractGameModel:
+    if model_descriptor not in worker_game_models:
+        return add_worker_game_model(initialize_game_model_from_descriptor(model_descriptor))
+    return worker_game_models[model_descriptor]
+
+def run_simulation_chunk(home_team: Team, away_team: Team, game_model: AbstractGameModel, start_index: int, num_simulations_for_chunk: int, seed: int = None) -> list:
+    game_engine = GameEngine(home_team, away_team, game_model)
+    game_summaries = game_engine.run_many(num_simulations_for_chunk, seed=seed, start_index=start_index)
+    return list(enumerate(game_summaries, start=start_index))
+
+def run_aggregated_simulation_chunk(home_team: Team, away_team: Team, game_model: AbstractGameModel, start_index: int,
+                                    num_simulations_for_chunk: int, seed: int = None, featured_game_index: int = None,
+                                    track_percentiles: bool = False, output_level: str = "full", paired: bool = False,
+                                    sampling: str = "plain", batch: bool = False) -> SimulationAggregate:
+    # Only the featured game's play log is kept
+    if batch:
+        return run_batch_simulation_chunk(home_team, away_team, game_model, start_index, num_simulations_for_chunk, seed,
+                                          featured_game_index, track_percentiles)
+    chunk_aggregate = SimulationAggregate(home_team.name, away_team.name, track_percentiles=track_percentiles, track_game_scores=paired,
+                                          sampling_group_size=SAMPLING_GROUP_SIZES[sampling])
+    game_engine = GameEngine(home_team, away_team, game_model, paired=paired, sampling=sampling)
+    game_summaries = game_engine.run_many(num_simulations_for_chunk, seed=seed, start_index=start_index, output_level=output_level, play_records=True)
+    for game_index, game_summary in enumerate(game_summaries, start=start_index):
+        chunk_aggregate.add_game(game_summary, game_index)
+        if game_index == featured_game_index:
+            team_names = (home_team.name, away_team.name)
+            chunk_aggregate.add_featured_game(game_index, [play.to_dict(team_names) for play in game_summary["play_log"]])
+    return chunk_aggregate
+
+def run_batch_simulation_chunk(home_team: Team, away_team: Team, game_model: AbstractGameModel, start_index: int,
+                               num_simulations_for_chunk: int, seed: int = None, featured_game_index: int = None,
+                               track_percentiles: bool = False) -> SimulationAggregate:
+    # The chunk's games run in lockstep on BatchGameEngine, on one stream per chunk rather than per game
+    has_featured_game = featured_game_index is not None and start_index <= featured_game_index < start_index + num_simulations_for_chunk
+    batch_game_engine = BatchGameEngine(home_team, away_team, game_model, num_simulations_for_chunk, rng=spawn_generator(seed, start_index),
+                                        featured_game_index=featured_game_index - start_index if has_featured_game else None,
+                                        track_featured_game=has_featured_game)
+    batch_summary = batch_game_engine.run_simulations()
+    chunk_aggregate = SimulationAggregate(home_team.name, away_team.name, track_percentiles=track_percentiles)
+    chunk_aggregate.add_game_batch(batch_summary["final_scores"], batch_summary[home_team.name], batch_summary[away_team.name])
+    if has_featured_game:
+        chunk_aggregate.add_featured_game(featured_game_index, batch_summary["featured_play_log"])
+    return chunk_aggregate
+
+def run_pooled_simulation_chunk(home_team_abbrev: str, away_team_abbrev: str, model_descriptor: tuple, start_index: int,
+                                num_simulations_for_chunk: int, seed: int, featured_game_index: int = None,
+                                track_percentiles: bool = False, output_level: str = "full", paired: bool = False,
+                                sampling: str = "plain", batch: bool = False) -> SimulationAggregate:
+    # Runs in a pool worker
+    return run_aggregated_simulation_chunk(worker_teams[home_team_abbrev], worker_teams[away_team_abbrev], get_worker_game_model(model_descriptor),
+                                           start_index, num_simulations_for_chunk, seed, featured_game_index, track_percentiles,
+                                           output_level, paired, sampling, batch)
+
+def warm_up_worker() -> int:
+    return os.getpid()
+
+class SimulationPool:
+    # Long-lived process pool whose workers load every team and game model once
+    def __init__(self, num_workers: int):
+        self.num_workers = num_workers
+        self.executor = None
+        # Arguments and attempts of every chunk still referenced, to run it again if its worker dies
+        self.submitted_chunks = weakref.WeakKeyDictionary()
+
+    def get_executor(self) -> ProcessPoolExecutor:
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(max_workers=self.num_workers, initializer=initialize_simulation_worker,
+                                                initargs=(get_shared_league_data().get_handle(),))
+        return self.executor
+
+    def warm_up(self) -> None:
+        # Starts every worker and waits for their initializers to finish
+        futures = [self.get_executor().submit(warm_up_worker) for __ in range(self.num_workers)]
+        for future in futures:
+            future.result()
+
+    def submit_simulation_chunk(self, home_team_abbrev: str, away_team_abbrev: str, model_descriptor: tuple, start_index: int,
+                                num_simulations_for_chunk: int, seed: int, featured_game_index: int = None,
+                                track_percentiles: bool = False, output_level: str = "full", paired: bool = False,
+                                sampling: str = "plain", batch: bool = False) -> Future:
+        chunk_args = (home_team_abbrev, away_team_abbrev, model_descriptor, start_index, num_simulations_for_chunk, seed, featured_game_index,
+                      track_percentiles, output_level, paired, sampling, batch)
+        return self.submit_chunk_args(chunk_args, 1)
+
+    def submit_chunk_args(self, chunk_args: tuple, attempt: int) -> Future:
+        try:
+            future = self.get_executor().submit(run_pooled_simulation_chunk, *chunk_args)
+        except BrokenProcessPool:
+            # A worker died (e.g. it was OOM killed), so start over with fresh workers
+            self.shutdown()
+            future = self.get_executor().submit(run_pooled_simulation_chunk, *chunk_args)
+        self.submitted_chunks[future] = (chunk_args, attempt)
+        return future
+
+    def resubmit_simulation_chunks(self, futures: dict) -> dict:
+        # Starts over with fresh workers and resubmits the chunks that aren't back yet
+        self.shutdown()
+        resubmitted_futures = {}
+        for future, value in futures.items():
+            if future.done() and not future.cancelled() and future.exception() is None:
+                resubmitted_futures[future] = value
+                continue
+            chunk_args, attempt = self.submitted_chunks[future]
+            if attempt >= MAX_CHUNK_ATTEMPTS:
+                raise BrokenProcessPool(f"A simulation chunk failed {attempt} times in a row")
+            resubmitted_futures[self.submit_chunk_args(chunk_args, attempt + 1)] = value
+        return resubmitted_futures
+
+    def shutdown(self) -> None:
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+simulation_pools = {}
+shared_league_data = None
+
+def get_shared_league_data() -> SharedLeagueData:
+    # The league is loaded from the database once and published to shared memory for the workers of every pool
+    global shared_league_data
+    if shared_league_data is None:
+        db_conn = get_db_conn()
+        shared_league_data = publish_league_data(TeamFactory.initialize_league_teams(db_conn))
+        db_conn.close()
+    return shared_league_data
+
+def get_simulation_pool(num_workers: int) -> SimulationPool:
+    if num_workers not in simulation_pools:
+        simulation_pools[num_workers] = SimulationPool(num_workers)
+    return simulation_pools[num_workers]
+
+def shutdown_simulation_pools() -> None:
+    global shared_league_data
+    for simulation_pool in simulation_pools.values():
+        simulation_pool.shutdown()
+    simulation_pools.clear()
+    if shared_league_data is not None:
+        shared_league_data.close()
+        shared_league_data = None
+
+atexit.register(shutdown_simulation_pools)
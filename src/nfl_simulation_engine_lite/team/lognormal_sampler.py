@@ -0,0 +1,39 @@
+import numpy as np
+
+class LognormalSampler:
+    # Lognormal like scipy's lognorm(s=sigma, scale=exp(mu)), single samples served from a pre-drawn block
+    def __init__(self, mu: float, sigma: float, max_block_size: int = 4096, rng: np.random.Generator = None):
+        self.mu = mu
+        self.sigma = sigma
+        self.max_block_size = max_block_size
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.block = []
+        self.block_position = 0
+
+    def set_rng(self, rng: np.random.Generator) -> None:
+        # Samples already drawn from the previous generator are discarded
+        self.rng = rng
+        self.block = []
+        self.block_position = 0
+
+    def sample(self) -> float:
+        if self.block_position == len(self.block):
+            block_size = min(max(2 * len(self.block), 64), self.max_block_size)
+            self.block = self.rng.lognormal(self.mu, self.sigma, block_size).tolist()
+            self.block_position = 0
+        value = self.block[self.block_position]
+        self.block_position += 1
+        return value
+
+    def rvs(self, size: int = None, random_state: np.random.Generator = None):
+        # Same call shape as a frozen scipy distribution
+        if size is None and random_state is None:
+            return self.sample()
+        rng = random_state if random_state is not None else self.rng
+        return rng.lognormal(self.mu, self.sigma, size)
+
+    def mean(self) -> float:
+        return float(np.exp(self.mu + self.sigma**2 / 2))
+
+    def var(self) -> float:
+        return float((np.exp(self.sigma**2) - 1) * np.exp(2 * self.mu + self.sigma**2))
@@ -0,0 +1,92 @@
+from nfl_simulation_engine_lite.team.team import Team
+from nfl_simulation_engine_lite.team.team_rates import TeamRates, SITUATIONS, RATE_STATS, build_league_rate_tensor
+from nfl_simulation_engine_lite.team.team_stats import TeamStats
+from dataclasses import fields
+from multiprocessing.shared_memory import SharedMemory
+import numpy as np
+import weakref
+
+# Numeric TeamStats fields in the order they are stored in a team's row of the team value array
+TEAM_STAT_FIELDS = tuple(field.name for field in fields(TeamStats) if field.name != "team")
+TEAM_STAT_INT_FIELDS = frozenset(field.name for field in fields(TeamStats) if field.type is int)
+
+class SharedLeagueData:
+    # The league rate tensor and season stats in one block of shared memory for the pool workers
+    def __init__(self, shared_memory: SharedMemory, team_abbrevs: tuple, rpi_fields: tuple, rpi_int_fields: frozenset, owner: bool):
+        self.shared_memory = shared_memory
+        self.team_abbrevs = team_abbrevs
+        self.rpi_fields = rpi_fields
+        self.rpi_int_fields = rpi_int_fields
+        self.owner = owner
+        self.league_rate_tensor = np.ndarray((len(team_abbrevs), len(SITUATIONS) + 1, len(RATE_STATS)), dtype=np.float64, buffer=shared_memory.buf)
+        self.team_value_array = np.ndarray((len(team_abbrevs), len(TEAM_STAT_FIELDS) + len(rpi_fields)), dtype=np.float64,
+                                           buffer=shared_memory.buf, offset=self.league_rate_tensor.nbytes)
+        if not owner:
+            self.league_rate_tensor.flags.writeable = False
+            self.team_value_array.flags.writeable = False
+        # NumPy doesn't keep the block mapped under views, so close checks they are all gone
+        self.viewing_team_rates = weakref.WeakSet()
+
+    @staticmethod
+    def get_size_in_bytes(num_teams: int, num_rpi_fields: int) -> int:
+        return 8 * num_teams * ((len(SITUATIONS) + 1) * len(RATE_STATS) + len(TEAM_STAT_FIELDS) + num_rpi_fields)
+
+    def get_handle(self) -> tuple:
+        # What a worker needs to attach, a few hundred bytes regardless of the size of the league data
+        return (self.shared_memory.name, self.team_abbrevs, self.rpi_fields, self.rpi_int_fields)
+
+    @classmethod
+    def attach(cls, handle: tuple) -> "SharedLeagueData":
+        shared_memory_name, team_abbrevs, rpi_fields, rpi_int_fields = handle
+        return cls(SharedMemory(name=shared_memory_name), team_abbrevs, rpi_fields, rpi_int_fields, owner=False)
+
+    def get_team_index(self, team_abbrev: str) -> int:
+        return self.team_abbrevs.index(team_abbrev)
+
+    def build_team(self, team_index: int, copy: bool = False) -> Team:
+        # Copied teams don't depend on the block
+        team_abbrev = self.team_abbrevs[team_index]
+        team_values = self.team_value_array[team_index].tolist()
+        stat_values = team_values[:len(TEAM_STAT_FIELDS)]
+        rpi_values = team_values[len(TEAM_STAT_FIELDS):]
+
+        team_stats = TeamStats(team=team_abbrev, **{stat: int(value) if stat in TEAM_STAT_INT_FIELDS else value
+                                                    for stat, value in zip(TEAM_STAT_FIELDS, stat_values)})
+        rpi_data = {"team": team_abbrev}
+        rpi_data.update({field: int(value) if field in self.rpi_int_fields else value for field, value in zip(self.rpi_fields, rpi_values)})
+        situation_rate_matrix = self.league_rate_tensor[team_index].copy() if copy else self.league_rate_tensor[team_index]
+        team_rates = TeamRates(situation_rate_matrix=situation_rate_matrix, team_abbrev=team_abbrev)
+        if not copy:
+            self.viewing_team_rates.add(team_rates)
+        return Team(team_abbrev, team_stats, team_rates, rpi_data)
+
+    def build_teams(self, copy: bool = False) -> dict[str, Team]:
+        return {team_abbrev: self.build_team(team_index, copy) for team_index, team_abbrev in enumerate(self.team_abbrevs)}
+
+    def close(self) -> None:
+        # The owner also removes the block, processes still attached to it keep their mapping
+        if len(self.viewing_team_rates) > 0:
+            raise BufferError("Teams built from the shared league data still hold views of it")
+        self.league_rate_tensor = None
+        self.team_value_array = None
+        self.shared_memory.close()
+        if self.owner:
+            self.shared_memory.unlink()
+
+def publish_league_data(league_teams: dict[str, Team]) -> SharedLeagueData:
+    # build_league_rate_tensor orders the teams by abbreviation, the team value array follows the same order
+    team_abbrevs, league_rate_tensor = build_league_rate_tensor({team_abbrev: team.get_team_rates() for team_abbrev, team in league_teams.items()})
+    team_abbrevs = tuple(team_abbrevs)
+    first_rpi_data = league_teams[team_abbrevs[0]].get_rpi_data()
+    rpi_fields = tuple(field for field in first_rpi_data if field != "team")
+    rpi_int_fields = frozenset(field for field in rpi_fields if isinstance(first_rpi_data[field], (int, np.integer)))
+
+    team_value_array = np.array([[getattr(league_teams[team_abbrev].get_stats(), stat) for stat in TEAM_STAT_FIELDS]
+                                 + [league_teams[team_abbrev].get_rpi_data()[field] for field in rpi_fields]
+                                 for team_abbrev in team_abbrevs], dtype=np.float64)
+
+    shared_memory = SharedMemory(create=True, size=SharedLeagueData.get_size_in_bytes(len(team_abbrevs), len(rpi_fields)))
+    shared_league_data = SharedLeagueData(shared_memory, team_abbrevs, rpi_fields, rpi_int_fields, owner=True)
+    shared_league_data.league_rate_tensor[:] = league_rate_tensor
+    shared_league_data.team_value_array[:] = team_value_array
+    return shared_league_data
@@ -1,6 +1,6 @@
-from scipy.stats import lognorm
 from nfl_simulation_engine_lite.team.team_stats import TeamStats
 from nfl_simulation_engine_lite.team.team_rates import TeamRates
+from nfl_simulation_engine_lite.team.lognormal_sampler import LognormalSampler
 import numpy as np
 import pandas as pd
 
@@ -16,8 +16,13 @@ class Team:
         self.def_rushing_distribution = None
         self.off_air_yards_distribution = None
         self.def_air_yards_allowed_distribution = None
+        self.distributions_model_str = None
 
     def setup_stat_distributions(self, game_model_str: str) -> None:
+        # Only built the first time a matchup is set up for a game model
+        if game_model_str == self.distributions_model_str:
+            return
+
         if game_model_str == "proto" or game_model_str == "v2" or game_model_str == "v2a":
             pass
         elif game_model_str == "v1" or game_model_str == "v1a" or game_model_str == "v2b":
@@ -34,30 +39,36 @@ class Team:
             self.def_rushing_distribution = self.init_distribution(self.stats.def_rush_yards_per_play_mean, self.stats.def_rush_yards_per_play_variance)
         else:
             raise ValueError(f"Invalid game model string: {game_model_str}")
+        self.distributions_model_str = game_model_str
         
-    def init_distribution(self, mean: float, variance: float):
+    def init_distribution(self, mean: float, variance: float) -> LognormalSampler:
         sigma = np.sqrt(np.log(1 + (variance / mean**2)))
         mu = np.log(mean) - (sigma**2) / 2
-        dist = lognorm(s=sigma, scale=np.exp(mu))
-        return dist
+        return LognormalSampler(mu, sigma)
     
+    def set_rng(self, rng: np.random.Generator) -> None:
+        for distribution in [self.off_passing_distribution, self.def_passing_distribution, self.off_rushing_distribution,
+                             self.def_rushing_distribution, self.off_air_yards_distribution, self.def_air_yards_allowed_distribution]:
+            if distribution is not None:
+                distribution.set_rng(rng)
+
     def sample_offensive_passing_play(self) -> float:
-        return self.off_passing_distribution.rvs()
+        return self.off_passing_distribution.sample()
     
     def sample_defensive_passing_play(self) -> float:
-        return self.def_passing_distribution.rvs()
+        return self.def_passing_distribution.sample()
     
     def sample_offensive_rushing_play(self) -> float:
-        return self.off_rushing_distribution.rvs()
+        return self.off_rushing_distribution.sample()
     
     def sample_defensive_rushing_play(self) -> float:
-        return self.def_rushing_distribution.rvs()
+        return self.def_rushing_distribution.sample()
     
     def sample_offensive_air_yards(self) -> float:
-        return self.off_air_yards_distribution.rvs()
+        return self.off_air_yards_distribution.sample()
     
     def sample_defensive_air_yards(self) -> float:
-        return self.def_air_yards_allowed_distribution.rvs()
+        return self.def_air_yards_allowed_distribution.sample()
     
     def __str__(self) -> str:
         return f"Team object representing {self.name}"
@@ -1,7 +1,8 @@
 from nfl_simulation_engine_lite.team.team import Team
 from nfl_simulation_engine_lite.team.team_stats import TeamStats
-from nfl_simulation_engine_lite.team.team_rates import TeamRates
+from nfl_simulation_engine_lite.team.team_rates import TeamRates, build_league_rate_tensor
 from sqlite3 import Connection
+import numpy as np
 import pandas as pd
 
 def initialize_team(team_abbrev: str, db_conn: Connection) -> Team:
@@ -11,6 +12,10 @@ def initialize_team(team_abbrev: str, db_conn: Connection) -> Team:
     team = Team(team_abbrev, team_stats, team_rates, team_rpi_data)
     return team
 
+def initialize_league_teams(db_conn: Connection) -> dict[str, Team]:
+    team_abbrevs = pd.read_sql_query("SELECT DISTINCT team FROM rpi_data_2025 ORDER BY team", db_conn)["team"]
+    return {team_abbrev: initialize_team(team_abbrev, db_conn) for team_abbrev in team_abbrevs}
+
 def initialize_rpi_data(team_abbrev: str, db_conn: Connection) -> dict:
     rpi_query = f"SELECT * FROM rpi_data_2025 WHERE team = '{team_abbrev}'"
     rpi_df = pd.read_sql_query(rpi_query, db_conn)
@@ -22,6 +27,11 @@ def initialize_team_rates(team_abbrev: str, db_conn: Connection) -> TeamRates:
     team_rates = TeamRates(team_rates_df)
     return team_rates
 
+def initialize_league_team_rates(db_conn: Connection) -> tuple[list[str], np.ndarray]:
+    league_team_rates_df = pd.read_sql_query("SELECT * FROM team_rates_2025", db_conn)
+    league_team_rates = {team_abbrev: TeamRates(team_rates_df) for team_abbrev, team_rates_df in league_team_rates_df.groupby("team")}
+    return build_league_rate_tensor(league_team_rates)
+
 def initialize_team_stats(team_abbrev: str, db_conn: Connection) -> TeamStats:
     team_query = "SELECT * FROM sim_engine_team_stats_2024 WHERE team = ?"
     team_stats_df = pd.read_sql_query(team_query, db_conn, params=(team_abbrev,))
@@ -1,9 +1,41 @@
 from nfl_simulation_engine_lite.team.team_stats import TeamStats
+import numpy as np
 import pandas as pd
 
+DISTANCE_CATEGORIES = ("short", "medium", "long")
+
+# (down, distance_category_index, redzone) of every situation, the fallback data comes after them
+SITUATIONS = [(down, distance_category, redzone) for down in (1, 2, 3, 4)
+              for distance_category in range(len(DISTANCE_CATEGORIES)) for redzone in (0, 1)]
+FALLBACK_SITUATION_INDEX = len(SITUATIONS)
+
+RATE_STATS = ("games_played", "pass_completion_rate", "yards_per_completion", "scramble_rate", "scramble_rate_allowed",
+              "rush_yards_per_carry", "turnover_rate", "forced_turnover_rate", "run_rate", "pass_rate",
+              "sacks_allowed_rate", "sack_yards_allowed", "sacks_made_rate", "sack_yards_inflicted",
+              "field_goal_success_rate", "pass_completion_rate_allowed", "yards_allowed_per_completion",
+              "rush_yards_per_carry_allowed", "off_air_yards_per_attempt", "def_air_yards_per_attempt",
+              "off_yac_per_completion", "def_yac_per_completion")
+RATE_STAT_INDEX = {stat: index for index, stat in enumerate(RATE_STATS)}
+
+def get_distance_category_index(distance):
+    # Works for scalars and NumPy arrays: 0 = short (< 4), 1 = medium (< 7), 2 = long
+    return (distance >= 4) * 1 + (distance >= 7) * 1
+
+def get_situation_index(down, distance_category_index, redzone):
+    return (down - 1) * 6 + distance_category_index * 2 + redzone
+
 class TeamRates:
-    def __init__(self, total_team_rate_stats: pd.DataFrame):
-        self.team_rate_stats = self.initialize_team_rate_stats(total_team_rate_stats)
+    def __init__(self, total_team_rate_stats: pd.DataFrame = None, situation_rate_matrix: np.ndarray = None, team_abbrev: str = None):
+        if situation_rate_matrix is not None:
+            # Wraps an already compiled matrix without copying it
+            self.team_abbrev = team_abbrev
+            self.team_rate_stats = None
+            self.situation_rate_matrix = situation_rate_matrix
+        else:
+            self.team_rate_stats = self.initialize_team_rate_stats(total_team_rate_stats)
+            self.team_abbrev = self.team_rate_stats["None_None_None"].team
+            self.situation_rate_matrix = self.initialize_situation_rate_matrix()
+        self.fallback_rates = self.situation_rate_matrix[FALLBACK_SITUATION_INDEX]
 
     def initialize_team_rate_stats(self, total_team_rate_stats: pd.DataFrame) -> dict[str, TeamStats]:
         team_rate_stats = {}
@@ -12,9 +44,9 @@ class TeamRates:
                 down = int(row['down'])
             except ValueError:
                 down = None
-                
+
             distance_category = row['distance_category']
-            
+
             try:
                 redzone = int(row['redzone'])
             except ValueError:
@@ -25,13 +57,54 @@ class TeamRates:
             team_rate_stats[situation_key] = curr_situation_stats
         return team_rate_stats
 
+    def initialize_situation_rate_matrix(self) -> np.ndarray:
+        # [situation, stat] matrix followed by the fallback row
+        fallback_rates = self.get_rate_vector(self.team_rate_stats["None_None_None"])
+        situation_rate_matrix = np.empty((len(SITUATIONS) + 1, len(RATE_STATS)))
+        situation_rate_matrix[:] = fallback_rates
+        for situation_index, (down, distance_category, redzone) in enumerate(SITUATIONS):
+            situation_key = f"{down}_{DISTANCE_CATEGORIES[distance_category]}_{redzone}"
+            if situation_key not in self.team_rate_stats:
+                continue
+            situation_rates = self.get_rate_vector(self.team_rate_stats[situation_key])
+            situation_rate_matrix[situation_index] = np.where(np.isnan(situation_rates), fallback_rates, situation_rates)
+        return situation_rate_matrix
+
+    def get_rate_vector(self, team_stats: TeamStats) -> np.ndarray:
+        return np.array([getattr(team_stats, stat) for stat in RATE_STATS], dtype=np.float64)
+
+    def get_situation_rate_matrix(self) -> np.ndarray:
+        return self.situation_rate_matrix
+
+    @property
+    def rate_array(self) -> np.ndarray:
+        # Dense [down, distance_category, redzone, stat] copy, down 0 holds the fallback data
+        rate_array = np.empty((5, len(DISTANCE_CATEGORIES), 2, len(RATE_STATS)))
+        rate_array[:] = self.fallback_rates
+        rate_array[1:] = self.situation_rate_matrix[:len(SITUATIONS)].reshape(4, len(DISTANCE_CATEGORIES), 2, len(RATE_STATS))
+        return rate_array
+
+    def get_rate(self, down: int, distance_category: int, redzone: int, stat: str) -> float:
+        # Down 0 gives the fallback data
+        situation_index = get_situation_index(down, distance_category, redzone) if down > 0 else FALLBACK_SITUATION_INDEX
+        return self.situation_rate_matrix[situation_index, RATE_STAT_INDEX[stat]]
+
     def get_data_for_situation(self, down: int, distance_category: str, redzone: bool) -> TeamStats:
+        if self.team_rate_stats is None:
+            return self.get_matrix_team_stats(down, distance_category, redzone)
         situation_key = f"{down}_{distance_category}_{redzone}"
         if situation_key not in self.team_rate_stats:
-            print(f"Invalid situation key: {situation_key}, returning fallback data")
             return self.team_rate_stats["None_None_None"]
         return self.team_rate_stats[situation_key]
 
+    def get_matrix_team_stats(self, down: int, distance_category: str, redzone: bool) -> TeamStats:
+        # Situational values already fall back to the season data in the matrix
+        if down in (1, 2, 3, 4) and distance_category in DISTANCE_CATEGORIES and redzone in (0, 1):
+            situation_rates = self.situation_rate_matrix[get_situation_index(down, DISTANCE_CATEGORIES.index(distance_category), int(redzone))]
+        else:
+            situation_rates = self.fallback_rates
+        return TeamStats(team=self.team_abbrev, **dict(zip(RATE_STATS, situation_rates.tolist())))
+
     def init_situation_team_stats(self, team_stats_dict: dict) -> TeamStats:
         team_stats = TeamStats()
         team_stats.team = team_stats_dict["team"]
@@ -57,4 +130,10 @@ class TeamRates:
         team_stats.def_air_yards_per_attempt = team_stats_dict["def_air_yards_per_attempt"]
         team_stats.off_yac_per_completion = team_stats_dict["off_yac_per_completion"]
         team_stats.def_yac_per_completion = team_stats_dict["def_yac_per_completion"]
-        return team_stats
\ No newline at end of file
+        return team_stats
+
+def build_league_rate_tensor(league_team_rates: dict[str, TeamRates]) -> tuple[list[str], np.ndarray]:
+    # Stacks every team's [situation, stat] matrix into a [team, situation, stat] tensor
+    team_abbrevs = sorted(league_team_rates)
+    league_rate_tensor = np.stack([league_team_rates[team].get_situation_rate_matrix() for team in team_abbrevs])
+    return team_abbrevs, league_rate_tensor
@@ -0,0 +1,46 @@
+from api.app import create_app
+import nfl_simulation_engine_lite.game_model.game_model as game_model_module
+import json
+import math
+
+class TestApiRoutes:
+    def test_run_simulations_returns_strict_json(self):
+        # A 1 ms budget only runs a few stratified blocks, too few to estimate the variance reduction from
+        client = create_app().test_client()
+        response = client.post("/sim-engine-api/run-simulations", json={"home_team": "KC", "away_team": "BUF", "game_model": "v2", "seed": 3,
+                                                                         "time_budget_ms": 1, "output_level": "scores", "sampling": "stratified"})
+        assert response.status_code == 200
+        results = json.loads(response.get_data(as_text=True), parse_constant=TestApiRoutes.reject_constant)
+        assert results["variance_reduction"] == {"home_win_pct": None, "average_score_diff": None}
+        assert math.isfinite(results["home_win_pct_standard_error"])
+
+    def test_adaptive_run_of_a_single_game(self):
+        # One game has no standard errors to size the next round from
+        client = create_app().test_client()
+        response = client.post("/sim-engine-api/run-simulations", json={"home_team": "KC", "away_team": "BUF", "game_model": "v2", "seed": 1,
+                                                                         "num_simulations": 1, "adaptive": True, "output_level": "scores"})
+        assert response.status_code == 200
+        results = json.loads(response.get_data(as_text=True), parse_constant=TestApiRoutes.reject_constant)
+        assert results["num_simulations"] == 1
+        assert results["home_win_pct_standard_error"] is None
+
+    def test_unavailable_game_model_is_rejected(self, monkeypatch):
+        monkeypatch.setattr(game_model_module, "is_fourth_down_model_available", lambda model_name: model_name != "v1")
+        client = create_app().test_client()
+        response = client.post("/sim-engine-api/run-simulations", json={"home_team": "KC", "away_team": "BUF", "game_model": "v1", "num_simulations": 10})
+        assert response.status_code == 400
+
+    def test_batch_runs_need_a_batch_game_model(self):
+        client = create_app().test_client()
+        response = client.post("/sim-engine-api/run-simulations", json={"home_team": "KC", "away_team": "BUF", "game_model": "v2", "seed": 2,
+                                                                         "num_simulations": 40, "batch": True})
+        assert response.status_code == 200
+        assert response.get_json()["num_simulations"] == 40
+        response = client.post("/sim-engine-api/run-simulations", json={"home_team": "KC", "away_team": "BUF", "game_model": "proto",
+                                                                         "num_simulations": 40, "batch": True})
+        assert response.status_code == 400
+
+    # Helper functions
+    @staticmethod
+    def reject_constant(constant: str) -> None:
+        raise ValueError(f"{constant} is not valid JSON")
@@ -0,0 +1,74 @@
+from nfl_simulation_engine_lite.db import db_conn
+from nfl_simulation_engine_lite.game_engine.batch_game_engine import BatchGameEngine
+from nfl_simulation_engine_lite.game_engine.game_engine import GameEngine
+from nfl_simulation_engine_lite.game_model.prototype_game_model import PrototypeGameModel
+from nfl_simulation_engine_lite.game_model.game_model_v2 import GameModel_V2
+from nfl_simulation_engine_lite.game_model.game_model_v2a import GameModel_V2a
+from nfl_simulation_engine_lite.game_model.game_model_v2b import GameModel_V2b
+import nfl_simulation_engine_lite.team.team_factory as team_factory
+import numpy as np
+import pytest
+
+class TestBatchGameEngine:
+    @pytest.mark.parametrize("game_model", [GameModel_V2(), GameModel_V2a(), GameModel_V2b()])
+    def test_batch_simulation_with_V2_family_models(self, game_model):
+        home_team, away_team = self.init_teams_for_test("KC", "BUF")
+        num_games = 200
+        batch_game_engine = BatchGameEngine(home_team, away_team, game_model, num_games, rng=np.random.default_rng(7))
+        batch_summary = batch_game_engine.run_simulations()
+
+        assert not batch_game_engine.game_state["live"].any()
+        assert (batch_game_engine.game_state["quarter"] == 4).all()
+        assert (batch_game_engine.game_state["quarter_seconds_remaining"] <= 0).all()
+
+        assert batch_summary["final_scores"].shape == (num_games, 2)
+        assert (batch_summary["final_scores"] >= 0).all()
+        assert 0 <= batch_summary["home_wins"] <= num_games
+        assert len(batch_summary["featured_play_log"]) > 0
+
+        home_team_stats = batch_summary[home_team.name]
+        assert (home_team_stats["score"] == batch_summary["final_scores"][:, 0]).all()
+        assert (home_team_stats["rushing_attempts"] > 0).all()
+        assert np.allclose(home_team_stats["run_rate"] + home_team_stats["pass_rate"], 1, atol=0.05)
+
+    @pytest.mark.parametrize("game_model_class", [GameModel_V2, GameModel_V2a, GameModel_V2b])
+    def test_batch_simulation_matches_scalar_engine(self, game_model_class):
+        # Both engines play the same game, so their averages should be within 4 standard errors
+        home_team, away_team = self.init_teams_for_test("KC", "BUF")
+        num_games = 3000
+        batch_scores = BatchGameEngine(home_team, away_team, game_model_class(), num_games, rng=np.random.default_rng(5)).run_simulations()["final_scores"]
+        game_engine = GameEngine(home_team, away_team, game_model_class())
+        scalar_scores = np.array([[game_summary["final_score"]["KC"], game_summary["final_score"]["BUF"]]
+                                  for game_summary in game_engine.run_many(num_games, seed=5, output_level="scores")])
+
+        batch_home_wins = batch_scores[:, 0] > batch_scores[:, 1]
+        scalar_home_wins = scalar_scores[:, 0] > scalar_scores[:, 1]
+        assert abs(100 * (batch_home_wins.mean() - scalar_home_wins.mean())) < 4 * self.get_difference_standard_error(100 * batch_home_wins, 100 * scalar_home_wins)
+        for team_index in range(2):
+            points_difference = batch_scores[:, team_index].mean() - scalar_scores[:, team_index].mean()
+            assert abs(points_difference) < 4 * self.get_difference_standard_error(batch_scores[:, team_index], scalar_scores[:, team_index])
+
+    def test_batch_simulation_is_reproducible_with_seeded_rng(self):
+        home_team, away_team = self.init_teams_for_test("PHI", "DAL")
+        first_summary = BatchGameEngine(home_team, away_team, GameModel_V2b(), 50, rng=np.random.default_rng(11)).run_simulations()
+        second_summary = BatchGameEngine(home_team, away_team, GameModel_V2b(), 50, rng=np.random.default_rng(11)).run_simulations()
+        assert (first_summary["final_scores"] == second_summary["final_scores"]).all()
+
+    def test_batch_simulation_rejects_unsupported_models(self):
+        home_team, away_team = self.init_teams_for_test("PHI", "DAL")
+        with pytest.raises(ValueError):
+            BatchGameEngine(home_team, away_team, PrototypeGameModel(), 10)
+
+    ###########################################################################################
+    # Helper functions
+    @staticmethod
+    def init_teams_for_test(home_team_abbrev: str, away_team_abbrev: str):
+        test_db_conn = db_conn.get_db_conn()
+        home_team = team_factory.initialize_team(home_team_abbrev, test_db_conn)
+        away_team = team_factory.initialize_team(away_team_abbrev, test_db_conn)
+        test_db_conn.close()
+        return home_team, away_team
+
+    @staticmethod
+    def get_difference_standard_error(first_values: np.ndarray, second_values: np.ndarray) -> float:
+        return float(np.hypot(np.std(first_values, ddof=1) / np.sqrt(len(first_values)), np.std(second_values, ddof=1) / np.sqrt(len(second_values))))
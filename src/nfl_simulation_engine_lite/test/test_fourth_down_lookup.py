@@ -0,0 +1,30 @@
+from nfl_simulation_engine_lite.db import db_conn
+from nfl_simulation_engine_lite.fourth_down_models.fourth_down_lookup import FOURTH_DOWN_FEATURES, measure_lookup_agreement, sample_fourth_down_states
+from nfl_simulation_engine_lite.fourth_down_models.models import v2a_fdm, get_fourth_down_lookup_table
+from nfl_simulation_engine_lite.game_model.game_model_v2 import GameModel_V2
+from nfl_simulation_engine_lite.game_engine.game_engine import GameEngine
+import nfl_simulation_engine_lite.team.team_factory as team_factory
+import numpy as np
+
+class TestFourthDownLookup:
+    def test_lookup_agrees_with_forest(self):
+        lookup_table = get_fourth_down_lookup_table("v2a")
+        states = sample_fourth_down_states(5000, np.random.default_rng(1))
+        assert measure_lookup_agreement(v2a_fdm, lookup_table, states) >= 0.95
+
+        # The scalar path snaps states to the same cells as the vectorized path
+        batch_predictions = lookup_table.predict(states)
+        for i in range(100):
+            state = {feature: states[feature].iloc[i] for feature in FOURTH_DOWN_FEATURES}
+            assert lookup_table.predict_state(**state) == batch_predictions[i]
+
+    def test_game_in_lookup_mode(self):
+        test_db_conn = db_conn.get_db_conn()
+        home_team = team_factory.initialize_team("PHI", test_db_conn)
+        away_team = team_factory.initialize_team("KC", test_db_conn)
+        test_db_conn.close()
+
+        game_engine = GameEngine(home_team, away_team, game_model=GameModel_V2(fourth_down_mode="lookup"))
+        game_summary = game_engine.run_simulation(test_mode=True)
+        assert game_summary["num_plays_in_game"] > 0
+        assert game_engine.game_state.quarter == 4
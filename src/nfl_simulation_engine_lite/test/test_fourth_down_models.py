@@ -0,0 +1,57 @@
+from nfl_simulation_engine_lite.fourth_down_models.fourth_down_lookup import FOURTH_DOWN_FEATURES, sample_fourth_down_states
+from nfl_simulation_engine_lite.fourth_down_models.tree_ensemble import export_tree_ensemble
+import nfl_simulation_engine_lite.fourth_down_models.models as fourth_down_models
+from nfl_simulation_engine_lite.game_model.game_model_v2 import GameModel_V2
+import numpy as np
+import os
+import pytest
+
+class TestFourthDownModels:
+    def test_models_load_lazily_and_once(self):
+        fourth_down_models.fourth_down_forests.pop("v2a", None)
+        game_model = GameModel_V2()
+        assert "v2a" not in fourth_down_models.fourth_down_forests
+
+        fourth_down_model = game_model.fourth_down_model
+        assert fourth_down_model is fourth_down_models.get_fourth_down_forest("v2a")
+        assert list(fourth_down_model.classes_) == [0, 1, 2]
+        assert fourth_down_models.v2a_fdm is fourth_down_models.get_fourth_down_model("v2a")
+
+    @pytest.mark.parametrize("model_name", ["v2", "v2a"])
+    def test_tree_ensemble_matches_forest(self, model_name):
+        sklearn_model = fourth_down_models.get_fourth_down_model(model_name)
+        states = sample_fourth_down_states(20000, np.random.default_rng(2))
+        # Whole numbers sit right on many split thresholds
+        states["ydstogo"] = np.round(states["ydstogo"])
+
+        for tree_ensemble in [export_tree_ensemble(sklearn_model), fourth_down_models.get_fourth_down_forest(model_name)]:
+            assert np.array_equal(tree_ensemble.predict_proba(states), sklearn_model.predict_proba(states))
+            assert np.array_equal(tree_ensemble.predict(states), sklearn_model.predict(states))
+
+        # The single-state walk agrees with the batch one
+        state_predictions = [tree_ensemble.predict_state(*state) for state in states[list(FOURTH_DOWN_FEATURES)].to_numpy()[:2000].tolist()]
+        assert np.array_equal(state_predictions, sklearn_model.predict(states.iloc[:2000]))
+
+    def test_missing_model_raises_only_when_requested(self, monkeypatch):
+        monkeypatch.setattr(fourth_down_models, "FOURTH_DOWN_MODEL_DIR", "/nonexistent")
+        monkeypatch.setattr(fourth_down_models, "fourth_down_models", {})
+        monkeypatch.setattr(fourth_down_models, "fourth_down_forests", {})
+        assert not fourth_down_models.is_fourth_down_model_available("v2")
+        with pytest.raises(FileNotFoundError, match="v2 fourth down model is not available"):
+            fourth_down_models.get_fourth_down_model("v2")
+        with pytest.raises(ValueError):
+            fourth_down_models.get_fourth_down_model("v3")
+        with pytest.raises(FileNotFoundError, match="v2 fourth down model is not available"):
+            fourth_down_models.get_fourth_down_forest("v2")
+
+    def test_forest_is_exported_from_the_pickle_when_missing(self, monkeypatch, tmp_path):
+        # Only the pickle is there, as for the v1 model
+        os.symlink(fourth_down_models.get_fourth_down_model_path("v2"), tmp_path / "v2_4th_down_playcall_model.pkl")
+        monkeypatch.setattr(fourth_down_models, "FOURTH_DOWN_MODEL_DIR", str(tmp_path))
+        monkeypatch.setattr(fourth_down_models, "fourth_down_models", {})
+        monkeypatch.setattr(fourth_down_models, "fourth_down_forests", {})
+        assert fourth_down_models.is_fourth_down_model_available("v2")
+
+        states = sample_fourth_down_states(2000, np.random.default_rng(4))
+        tree_ensemble = fourth_down_models.get_fourth_down_forest("v2")
+        assert np.array_equal(tree_ensemble.predict(states), fourth_down_models.get_fourth_down_model("v2").predict(states))
@@ -1,5 +1,6 @@
 from nfl_simulation_engine_lite.db import db_conn
 from nfl_simulation_engine_lite.game_engine.game_engine import GameEngine
+from nfl_simulation_engine_lite.game_engine.game_state import GameState, PlayResult, HOME
 from nfl_simulation_engine_lite.game_model.prototype_game_model import PrototypeGameModel
 from nfl_simulation_engine_lite.game_model.game_model_v1 import GameModel_V1
 from nfl_simulation_engine_lite.game_model.game_model_v1a import GameModel_V1a
@@ -7,17 +8,29 @@ from nfl_simulation_engine_lite.game_model.game_model_v1b import GameModel_V1b
 from nfl_simulation_engine_lite.game_model.game_model_v2 import GameModel_V2
 from nfl_simulation_engine_lite.game_model.game_model_v2a import GameModel_V2a
 from nfl_simulation_engine_lite.game_model.game_model_v2b import GameModel_V2b
+from nfl_simulation_engine_lite.game_model.game_model_factory import initialize_new_game_model_instance
+from nfl_simulation_engine_lite.game_simulator import run_multiple_simulations_multi_threaded
+from nfl_simulation_engine_lite.fourth_down_models.models import is_fourth_down_model_available
 from nfl_simulation_engine_lite.team.team import Team
+from nfl_simulation_engine_lite.team.team_rates import SITUATIONS, FALLBACK_SITUATION_INDEX, get_situation_index
+from nfl_simulation_engine_lite.utils.random_stream import get_game_generator
 from typing import Tuple
 import nfl_simulation_engine_lite.team.team_factory as team_factory
+import gc
+import numpy as np
 import pytest
 import random
+import weakref
 
 teams = ["ARI","ATL","BAL","BUF","CAR","CHI","CIN","CLE","DAL",
             "DEN","DET","GB","HOU","IND","JAX","KC","LA","LAC",
             "LV","MIA","MIN","NE","NO","NYG","NYJ","PHI","PIT",
             "SEA","SF","TB","TEN","WAS"]
 
+# V1's fourth down model is not shipped with the package
+requires_v1_fourth_down_model = pytest.mark.skipif(not is_fourth_down_model_available("v1"),
+                                                   reason="v1 fourth down model is not available")
+
 class TestGameSimulator:
     def test_game_engine_initialization(self):
         home_team_abbrev, away_team_abbrev = self.get_random_teams()
@@ -36,17 +49,16 @@ class TestGameSimulator:
         
         game_engine = GameEngine(home_team, away_team)
 
-        assert game_engine.game_state["quarter"] == 1
-        assert game_engine.game_state["game_seconds_remaining"] == 3600
-        assert game_engine.game_state["quarter_seconds_remaining"] == 900
-        assert game_engine.game_state["possession_team"] == home_team
-        assert game_engine.game_state["defense_team"] == away_team
-        assert game_engine.game_state["yardline"] == 75
-        assert game_engine.game_state["down"] == 1
-        assert game_engine.game_state["distance"] == 10
-        assert game_engine.game_state["score"][home_team.name] == 0
-        assert game_engine.game_state["score"][away_team.name] == 0
-        assert game_engine.game_state["play_log"] == []
+        assert game_engine.game_state.quarter == 1
+        assert game_engine.game_state.game_seconds_remaining == 3600
+        assert game_engine.game_state.quarter_seconds_remaining == 900
+        assert game_engine.game_state.possession_team == home_team
+        assert game_engine.game_state.defense_team == away_team
+        assert game_engine.game_state.yardline == 75
+        assert game_engine.game_state.down == 1
+        assert game_engine.game_state.distance == 10
+        assert game_engine.game_state.score == [0, 0]
+        assert game_engine.game_state.play_log == []
 
     def test_turnover_simulation(self):
         home_team_abbrev, away_team_abbrev = self.get_random_teams()
@@ -59,28 +71,17 @@ class TestGameSimulator:
         expected_defteam = home_team.name
 
         # Create an initial mock game state
-        mock_game_state = {
-            "quarter": 1,
-            "game_seconds_remaining": 3600,
-            "quarter_seconds_remaining": 900, 
-            "possession_team": home_team, 
-            "defense_team": away_team,
-            "yardline": 100-expected_yardline, 
-            "down": 2,
-            "distance": 5,
-            "score": {home_team.name: 0, away_team.name: 0},
-            "play_log": [],
-        }
+        mock_game_state = GameState(home_team, away_team, possession=HOME, yardline=100-expected_yardline, down=2, distance=5)
 
         game_engine = GameEngine(home_team, away_team)
         game_engine.game_state = mock_game_state
         game_engine.simulate_turnover()
 
-        assert game_engine.game_state["yardline"] == expected_yardline
-        assert game_engine.game_state["down"] == expected_down
-        assert game_engine.game_state["distance"] == expected_distance
-        assert game_engine.game_state["possession_team"].name == expected_posteam
-        assert game_engine.game_state["defense_team"].name == expected_defteam
+        assert game_engine.game_state.yardline == expected_yardline
+        assert game_engine.game_state.down == expected_down
+        assert game_engine.game_state.distance == expected_distance
+        assert game_engine.game_state.possession_team.name == expected_posteam
+        assert game_engine.game_state.defense_team.name == expected_defteam
 
     def test_punt_simulation(self):
         home_team_abbrev, away_team_abbrev = self.get_random_teams()
@@ -92,31 +93,20 @@ class TestGameSimulator:
         expected_posteam = away_team.name
         expected_defteam = home_team.name
 
-        mock_play_result = { "yards_gained" : 0 }
+        mock_play_result = PlayResult("punt", 0, 0, HOME)
 
         # Create an initial mock game state
-        mock_game_state = {
-            "quarter": 1,
-            "game_seconds_remaining": 3600,
-            "quarter_seconds_remaining": 900, 
-            "possession_team": home_team, 
-            "defense_team": away_team,
-            "yardline": 100 - expected_yardline, 
-            "down": 2,
-            "distance": 5,
-            "score": {home_team.name: 0, away_team.name: 0},
-            "play_log": [],
-        }
+        mock_game_state = GameState(home_team, away_team, possession=HOME, yardline=100 - expected_yardline, down=2, distance=5)
 
         game_engine = GameEngine(home_team, away_team)
         game_engine.game_state = mock_game_state
         game_engine.simulate_punt(mock_play_result)
 
-        assert game_engine.game_state["yardline"] == expected_yardline
-        assert game_engine.game_state["down"] == expected_down
-        assert game_engine.game_state["distance"] == expected_distance
-        assert game_engine.game_state["possession_team"].name == expected_posteam
-        assert game_engine.game_state["defense_team"].name == expected_defteam
+        assert game_engine.game_state.yardline == expected_yardline
+        assert game_engine.game_state.down == expected_down
+        assert game_engine.game_state.distance == expected_distance
+        assert game_engine.game_state.possession_team.name == expected_posteam
+        assert game_engine.game_state.defense_team.name == expected_defteam
 
     def test_single_game_simulation_with_prototype_model(self):
         try:
@@ -139,9 +129,9 @@ class TestGameSimulator:
             assert away_team.def_rushing_distribution is None
 
             assert game_engine.game_state is not None
-            assert game_engine.game_state["quarter"] == 4
-            assert game_engine.game_state["game_seconds_remaining"] <= 0
-            assert game_engine.game_state["quarter_seconds_remaining"] <= 0
+            assert game_engine.game_state.quarter == 4
+            assert game_engine.game_state.game_seconds_remaining <= 0
+            assert game_engine.game_state.quarter_seconds_remaining <= 0
 
             assert game_summary is not None
             assert game_summary["final_score"][home_team.name] >= 0
@@ -151,6 +141,7 @@ class TestGameSimulator:
         except Exception as e:
             pytest.fail("Single game simulation failed due to an unexpected exception: " + str(e))
 
+    @requires_v1_fourth_down_model
     def test_single_game_simulation_with_V1_model(self):
         try:
             home_team_abbrev, away_team_abbrev = self.get_random_teams()
@@ -185,9 +176,9 @@ class TestGameSimulator:
             assert away_team.def_rushing_distribution.rvs() >= 0
 
             assert game_engine.game_state is not None
-            assert game_engine.game_state["quarter"] == 4
-            assert game_engine.game_state["game_seconds_remaining"] <= 0
-            assert game_engine.game_state["quarter_seconds_remaining"] <= 0
+            assert game_engine.game_state.quarter == 4
+            assert game_engine.game_state.game_seconds_remaining <= 0
+            assert game_engine.game_state.quarter_seconds_remaining <= 0
 
             assert game_summary is not None
             assert game_summary["final_score"][home_team.name] >= 0
@@ -231,9 +222,9 @@ class TestGameSimulator:
             assert away_team.def_rushing_distribution.rvs() >= 0
 
             assert game_engine.game_state is not None
-            assert game_engine.game_state["quarter"] == 4
-            assert game_engine.game_state["game_seconds_remaining"] <= 0
-            assert game_engine.game_state["quarter_seconds_remaining"] <= 0
+            assert game_engine.game_state.quarter == 4
+            assert game_engine.game_state.game_seconds_remaining <= 0
+            assert game_engine.game_state.quarter_seconds_remaining <= 0
 
             assert game_summary is not None
             assert game_summary["final_score"][home_team.name] >= 0
@@ -283,9 +274,9 @@ class TestGameSimulator:
             assert away_team.def_rushing_distribution.rvs() >= 0
 
             assert game_engine.game_state is not None
-            assert game_engine.game_state["quarter"] == 4
-            assert game_engine.game_state["game_seconds_remaining"] <= 0
-            assert game_engine.game_state["quarter_seconds_remaining"] <= 0
+            assert game_engine.game_state.quarter == 4
+            assert game_engine.game_state.game_seconds_remaining <= 0
+            assert game_engine.game_state.quarter_seconds_remaining <= 0
 
             assert game_summary is not None
             assert game_summary["final_score"][home_team.name] >= 0
@@ -334,9 +325,9 @@ class TestGameSimulator:
 
 
             assert game_engine.game_state is not None
-            assert game_engine.game_state["quarter"] == 4
-            assert game_engine.game_state["game_seconds_remaining"] <= 0
-            assert game_engine.game_state["quarter_seconds_remaining"] <= 0
+            assert game_engine.game_state.quarter == 4
+            assert game_engine.game_state.game_seconds_remaining <= 0
+            assert game_engine.game_state.quarter_seconds_remaining <= 0
 
             assert game_summary is not None
             assert game_summary["final_score"][home_team.name] >= 0
@@ -387,9 +378,9 @@ class TestGameSimulator:
 
 
             assert game_engine.game_state is not None
-            assert game_engine.game_state["quarter"] == 4
-            assert game_engine.game_state["game_seconds_remaining"] <= 0
-            assert game_engine.game_state["quarter_seconds_remaining"] <= 0
+            assert game_engine.game_state.quarter == 4
+            assert game_engine.game_state.game_seconds_remaining <= 0
+            assert game_engine.game_state.quarter_seconds_remaining <= 0
 
             assert game_summary is not None
             assert game_summary["final_score"][home_team.name] >= 0
@@ -447,9 +438,9 @@ class TestGameSimulator:
             assert away_team.def_rushing_distribution.rvs() >= 0
 
             assert game_engine.game_state is not None
-            assert game_engine.game_state["quarter"] == 4
-            assert game_engine.game_state["game_seconds_remaining"] <= 0
-            assert game_engine.game_state["quarter_seconds_remaining"] <= 0
+            assert game_engine.game_state.quarter == 4
+            assert game_engine.game_state.game_seconds_remaining <= 0
+            assert game_engine.game_state.quarter_seconds_remaining <= 0
 
             assert game_summary is not None
             assert game_summary["final_score"][home_team.name] >= 0
@@ -459,6 +450,103 @@ class TestGameSimulator:
         except Exception as e:
             pytest.fail("Single game simulation failed due to an unexpected exception: " + str(e))
 
+    def test_team_stats_summary_matches_play_log(self):
+        home_team, away_team = self.init_teams_for_test("KC", "BUF")
+        game_engine = GameEngine(home_team, away_team, GameModel_V2())
+        game_summary = game_engine.run_simulation()
+
+        # The final play is only logged once
+        assert game_summary["play_log"][-1] is not game_summary["play_log"][-2]
+        for team_index, team in enumerate((home_team, away_team)):
+            team_plays = [play for play in game_summary["play_log"] if play["posteam"] == team.name]
+            run_plays = [play for play in team_plays if play["play_type"] == "run"]
+            pass_plays = [play for play in team_plays if play["play_type"] == "pass"]
+            team_stats = game_summary[team.name]
+            assert team_stats["team"] == team.name
+            assert team_stats["rushing_attempts"] == len(run_plays)
+            assert team_stats["rushing_yards"] == pytest.approx(sum(play["yards_gained"] for play in run_plays))
+            assert team_stats["pass_yards"] == pytest.approx(sum(play["yards_gained"] for play in pass_plays))
+            assert team_stats["run_rate"] == round(len(run_plays) / len(team_plays), 2)
+            # Touchdowns on fourth down conversion attempts ("goforit") are not credited to the run or pass game
+            assert team_stats["passing_tds"] + team_stats["rushing_tds"] == sum(1 for play in run_plays + pass_plays if play["touchdown"])
+            assert team_stats["total_turnovers"] == sum(1 for play in team_plays if play["turnover"])
+
+        # The engine's own PlayResult records are only handed out on request
+        play_records = game_engine.get_game_summary(False, play_records=True)["play_log"]
+        assert all(isinstance(play_result, PlayResult) for play_result in play_records)
+        assert [play_result.to_dict((home_team.name, away_team.name)) for play_result in play_records] == game_summary["play_log"]
+
+    def test_score_only_games_play_out_the_same(self):
+        home_team, away_team = self.init_teams_for_test("KC", "BUF")
+        game_model = GameModel_V2b()
+        for game_index in range(3):
+            full_summary = GameEngine(home_team, away_team, game_model, rng=np.random.default_rng(game_index)).run_simulation()
+            game_engine = GameEngine(home_team, away_team, game_model, rng=np.random.default_rng(game_index))
+            score_summary = game_engine.run_simulation(output_level="scores")
+
+            assert score_summary["final_score"] == full_summary["final_score"]
+            assert set(score_summary) == {"final_score", "winner"}
+            assert game_engine.game_state.play_log == []
+            if full_summary["final_score"][home_team.name] > full_summary["final_score"][away_team.name]:
+                assert score_summary["winner"] == home_team.name
+
+        with pytest.raises(ValueError):
+            GameEngine(home_team, away_team, game_model).run_simulation(output_level="box_score")
+
+    def test_reused_engine_plays_the_same_games(self):
+        home_team, away_team = self.init_teams_for_test("KC", "BUF")
+        game_model = GameModel_V2b()
+        separate_summaries = [GameEngine(home_team, away_team, game_model, rng=get_game_generator(7, game_index)).run_simulation()
+                              for game_index in range(2, 5)]
+
+        game_engine = GameEngine(home_team, away_team, game_model)
+        reused_summaries = list(game_engine.run_many(3, seed=7, start_index=2))
+
+        for separate_summary, reused_summary in zip(separate_summaries, reused_summaries):
+            assert reused_summary["final_score"] == separate_summary["final_score"]
+            assert reused_summary[home_team.name] == separate_summary[home_team.name]
+            assert reused_summary[away_team.name] == separate_summary[away_team.name]
+        # Earlier summaries keep their own play logs
+        assert reused_summaries[0]["play_log"] is not reused_summaries[1]["play_log"]
+        assert len(reused_summaries[0]["play_log"]) == reused_summaries[0]["num_plays_in_game"]
+
+        game_engine.reset()
+        assert game_engine.game_state.quarter == 1
+        assert game_engine.game_state.possession_team == home_team
+        assert game_engine.game_state.score == [0, 0]
+        assert game_engine.game_state.team_stats[0]["plays"] == 0
+
+    def test_compiled_matchup_matches_rate_getters(self):
+        home_team, away_team = self.init_teams_for_test("PHI", "DAL")
+        game_model = GameModel_V2a()
+        GameEngine(home_team, away_team, game_model)
+
+        for possession, (posteam, defteam) in enumerate([(home_team, away_team), (away_team, home_team)]):
+            for down, distance_category, redzone in SITUATIONS + [(0, 0, 0)]:
+                situation = (down, None, None, distance_category, redzone)
+                situation_index = get_situation_index(down, distance_category, redzone) if down > 0 else FALLBACK_SITUATION_INDEX
+                situation_rates = game_model.matchup_rates[possession][situation_index]
+                expected_pass_yards = game_model.get_weighted_average(game_model.get_off_yards_per_play(posteam, "pass", situation),
+                                                                      game_model.get_def_yards_per_play(defteam, "pass", situation))
+                expected_turnover_rate = game_model.get_weighted_average(game_model.get_off_turnover_rate(posteam, situation),
+                                                                         game_model.get_def_turnover_rate(defteam, situation))
+                assert situation_rates.pass_yards == expected_pass_yards
+                assert situation_rates.turnover_rate == expected_turnover_rate
+                assert situation_rates.run_prob == posteam.get_team_rates().get_rate(down, distance_category, redzone, "run_rate")
+            assert game_model.matchup_fg_rates[possession] == game_model.get_field_goal_success_rate(posteam)
+
+    def test_game_model_is_freed_after_simulations_without_gc(self):
+        # Like a /run-simulations request, reference counting alone should free the model
+        game_model = initialize_new_game_model_instance("v2b")
+        game_model_ref = weakref.ref(game_model)
+        gc.disable()
+        try:
+            run_multiple_simulations_multi_threaded("KC", "BUF", 3, game_model, num_workers=2, debug_mode=False, seed=3)
+            del game_model
+            assert game_model_ref() is None
+        finally:
+            gc.enable()
+
     ###########################################################################################
     # Helper functions
     @staticmethod
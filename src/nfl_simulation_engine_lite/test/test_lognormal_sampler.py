@@ -0,0 +1,28 @@
+from nfl_simulation_engine_lite.db import db_conn
+from nfl_simulation_engine_lite.team.lognormal_sampler import LognormalSampler
+from scipy.stats import lognorm
+import nfl_simulation_engine_lite.team.team_factory as team_factory
+import numpy as np
+
+class TestLognormalSampler:
+    def test_matches_scipy_parameterization(self):
+        sampler = LognormalSampler(1.5, 0.6, max_block_size=1000, rng=np.random.default_rng(3))
+        scipy_dist = lognorm(s=0.6, scale=np.exp(1.5))
+        assert np.isclose(sampler.mean(), scipy_dist.mean())
+        assert np.isclose(sampler.var(), scipy_dist.var())
+
+        # Crosses several block refills
+        samples = np.array([sampler.sample() for __ in range(50000)])
+        assert abs(samples.mean() - scipy_dist.mean()) < 4 * scipy_dist.std() / np.sqrt(len(samples))
+        assert len(sampler.rvs(size=10, random_state=np.random.default_rng(4))) == 10
+
+    def test_distributions_built_once_per_game_model(self):
+        test_db_conn = db_conn.get_db_conn()
+        team = team_factory.initialize_team("DET", test_db_conn)
+        test_db_conn.close()
+
+        team.setup_stat_distributions("v2b")
+        off_passing_distribution = team.off_passing_distribution
+        team.setup_stat_distributions("v2b")
+        assert team.off_passing_distribution is off_passing_distribution
+        assert team.sample_offensive_passing_play() > 0
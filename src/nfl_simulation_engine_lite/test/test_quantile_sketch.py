@@ -0,0 +1,30 @@
+from nfl_simulation_engine_lite.utils.quantile_sketch import QuantileSketch
+import numpy as np
+import pytest
+
+class TestQuantileSketch:
+    def test_quantiles_are_within_relative_accuracy(self):
+        values = np.random.default_rng(5).normal(20, 15, size=5000)
+        sketch = QuantileSketch(relative_accuracy=0.01)
+        for value in values.tolist():
+            sketch.add(value)
+        for q in (0.01, 0.25, 0.5, 0.75, 0.99):
+            assert sketch.quantile(q) == pytest.approx(np.quantile(values, q, method="lower"), rel=0.02, abs=0.05)
+
+    def test_merged_sketches_match_a_single_sketch(self):
+        values = np.random.default_rng(6).lognormal(3, 1, size=2000).tolist() + [0.0] * 50 + [-4.0] * 20
+        single_sketch = QuantileSketch()
+        merged_sketch = QuantileSketch()
+        chunk_sketches = [QuantileSketch(), QuantileSketch()]
+        for i, value in enumerate(values):
+            single_sketch.add(value)
+            chunk_sketches[i % 2].add(value)
+        for chunk_sketch in chunk_sketches:
+            merged_sketch.merge(chunk_sketch)
+        assert merged_sketch.count == len(values)
+        assert [merged_sketch.quantile(q) for q in (0, 0.01, 0.5, 1)] == [single_sketch.quantile(q) for q in (0, 0.01, 0.5, 1)]
+        assert merged_sketch.quantile(0) == pytest.approx(-4.0, rel=0.01)
+
+    def test_sketches_with_different_accuracies_cannot_be_merged(self):
+        with pytest.raises(ValueError):
+            QuantileSketch(0.01).merge(QuantileSketch(0.05))
@@ -0,0 +1,80 @@
+from nfl_simulation_engine_lite.db import db_conn
+from nfl_simulation_engine_lite.game_engine.game_engine import GameEngine
+from nfl_simulation_engine_lite.game_model.game_model_v2 import GameModel_V2
+from nfl_simulation_engine_lite.utils.random_stream import RandomStream, PairedRandomStream, STRATIFIED_BLOCK_SIZE, POSSESSION_DRAWS, StratifiedDraws, get_paired_game_stream, get_strata
+import nfl_simulation_engine_lite.team.team_factory as team_factory
+import numpy as np
+import random
+
+class TestRandomStream:
+    def test_draws_match_standard_library_semantics(self):
+        rng_stream = RandomStream(np.random.default_rng(11), block_size=64)
+        uniforms = np.random.default_rng(11).random(1000)
+        for u in uniforms[:250]:
+            assert rng_stream.bernoulli(0.3) == (u < 0.3)
+        for u in uniforms[250:500]:
+            assert rng_stream.choose("run", "pass", 45, 55) == ("run" if u * 100 < 45 else "pass")
+        for u in uniforms[500:]:
+            value = rng_stream.randint(15, 40)
+            assert value == 15 + int(u * 26)
+            assert 15 <= value <= 40
+
+    def test_game_is_reproducible_without_global_state(self):
+        test_db_conn = db_conn.get_db_conn()
+        home_team = team_factory.initialize_team("BAL", test_db_conn)
+        away_team = team_factory.initialize_team("CIN", test_db_conn)
+        test_db_conn.close()
+
+        python_state = random.getstate()
+        numpy_state = np.random.get_state()[1].copy()
+        game_summaries = []
+        for __ in range(2):
+            game_model = GameModel_V2()
+            game_model.set_rng(RandomStream(np.random.default_rng(7)))
+            game_summaries.append(GameEngine(home_team, away_team, game_model=game_model).run_simulation(test_mode=True))
+
+        assert game_summaries[0]["final_score"] == game_summaries[1]["final_score"]
+        assert game_summaries[0]["num_plays_in_game"] == game_summaries[1]["num_plays_in_game"]
+        assert random.getstate() == python_state
+        assert np.array_equal(np.random.get_state()[1], numpy_state)
+
+    def test_paired_streams_line_up_possessions(self):
+        # Both streams draw the same uniforms on the next possession of each team
+        first_stream = PairedRandomStream(np.random.default_rng(3))
+        second_stream = PairedRandomStream(np.random.default_rng(3))
+        for possession, first_num_draws, second_num_draws in [(0, 5, 2), (1, 1, 7), (0, 3, 3), (1, 2, 2)]:
+            first_stream.start_play(possession)
+            second_stream.start_play(possession)
+            first_draws = [first_stream.uniform("completion") for __ in range(first_num_draws)]
+            second_draws = [second_stream.uniform("completion") for __ in range(second_num_draws)]
+            shared_draws = min(first_num_draws, second_num_draws)
+            assert first_draws[:shared_draws] == second_draws[:shared_draws]
+            # Draws for other purposes don't move the completion draws
+            first_stream.bernoulli(0.5, purpose="sack")
+        assert first_stream.uniform("clock") == second_stream.uniform("clock")
+
+    def test_antithetic_games_swap_the_offenses_of_their_pair(self):
+        first_stream = get_paired_game_stream(8, 6, "antithetic")
+        second_stream = get_paired_game_stream(8, 7, "antithetic")
+        for possession in (0, 1, 0):
+            first_stream.start_play(possession)
+            second_stream.start_play(1 - possession)
+            assert first_stream.uniform("completion") == second_stream.uniform("completion")
+
+    def test_strata_cover_every_stratum_once_per_block(self):
+        strata = get_strata(8, 0)
+        assert strata.shape[0] == STRATIFIED_BLOCK_SIZE
+        stratum_indices = np.sort(np.floor(strata * STRATIFIED_BLOCK_SIZE), axis=0)
+        assert (stratum_indices == np.arange(STRATIFIED_BLOCK_SIZE)[:, None, None]).all()
+        # Later possessions are stratified as well, and an engine's draws keep the strata of its current block
+        stratified_draws = StratifiedDraws(8)
+        stream = get_paired_game_stream(8, 3, "stratified", stratified_draws)
+        completion_sequence_index = stream.offense_sequence_indices[0]["completion"]
+        for possession in (0, 1, 0):
+            stream.start_play(possession)
+        assert stream.uniform("completion") == strata[3, completion_sequence_index, POSSESSION_DRAWS]
+        block_strata = stratified_draws.strata
+        get_paired_game_stream(8, 4, "stratified", stratified_draws)
+        assert stratified_draws.strata is block_strata
+        get_paired_game_stream(8, STRATIFIED_BLOCK_SIZE, "stratified", stratified_draws)
+        assert stratified_draws.block_index == 1
@@ -0,0 +1,48 @@
+from nfl_simulation_engine_lite.db import db_conn
+from nfl_simulation_engine_lite.team.shared_league_data import SharedLeagueData, publish_league_data
+from nfl_simulation_engine_lite.team.team_rates import RATE_STATS, build_league_rate_tensor
+import nfl_simulation_engine_lite.team.team_factory as team_factory
+import numpy as np
+import pickle
+import pytest
+
+class TestSharedLeagueData:
+    def test_attached_teams_match_database_teams(self):
+        test_db_conn = db_conn.get_db_conn()
+        league_teams = team_factory.initialize_league_teams(test_db_conn)
+        test_db_conn.close()
+
+        published_league_data = publish_league_data(league_teams)
+        handle = published_league_data.get_handle()
+        assert len(pickle.dumps(handle)) < 1024
+
+        attached_league_data = SharedLeagueData.attach(handle)
+        attached_teams = attached_league_data.build_teams()
+        assert set(attached_teams) == set(league_teams)
+        for team_abbrev, team in league_teams.items():
+            attached_team = attached_teams[team_abbrev]
+            assert attached_team.get_stats() == team.get_stats()
+            assert attached_team.get_rpi_data() == team.get_rpi_data()
+            assert np.array_equal(attached_team.get_team_rates().rate_array, team.get_team_rates().rate_array, equal_nan=True)
+            assert attached_team.get_team_rates().get_rate(0, 0, 0, "run_rate") == team.get_team_rates().get_rate(0, 0, 0, "run_rate")
+
+        # The shared block holds the league rate tensor, and attached teams' rate matrices are read-only views of it
+        team_abbrevs, league_rate_tensor = build_league_rate_tensor({team_abbrev: team.get_team_rates() for team_abbrev, team in league_teams.items()})
+        assert attached_league_data.team_abbrevs == tuple(team_abbrevs)
+        assert np.array_equal(attached_league_data.league_rate_tensor, league_rate_tensor, equal_nan=True)
+        team_index = attached_league_data.get_team_index("KC")
+        situation_rate_matrix = attached_teams["KC"].get_team_rates().situation_rate_matrix
+        assert np.shares_memory(situation_rate_matrix, attached_league_data.league_rate_tensor)
+        assert not situation_rate_matrix.flags.writeable
+        published_league_data.league_rate_tensor[team_index, 0, 0] = -1.0
+        assert attached_teams["KC"].get_team_rates().get_rate(1, 0, 0, RATE_STATS[0]) == -1.0
+
+        # Copied teams don't hold on to the block, views have to be gone before it is closed
+        copied_teams = published_league_data.build_teams(copy=True)
+        assert not np.shares_memory(copied_teams["KC"].get_team_rates().situation_rate_matrix, published_league_data.league_rate_tensor)
+        with pytest.raises(BufferError):
+            attached_league_data.close()
+        del attached_teams, attached_team, situation_rate_matrix
+        attached_league_data.close()
+        published_league_data.close()
+        assert copied_teams["KC"].get_team_rates().get_rate(1, 0, 0, RATE_STATS[0]) == -1.0
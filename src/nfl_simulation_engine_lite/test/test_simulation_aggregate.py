@@ -0,0 +1,112 @@
+from nfl_simulation_engine_lite.utils.simulation_aggregate import MIN_SAMPLING_GROUPS, SimulationAggregate
+import numpy as np
+import pickle
+import pytest
+
+class TestSimulationAggregate:
+    def test_merged_chunks_match_a_single_aggregate(self):
+        game_summaries = [self.make_game_summary(home_score, away_score, fg_pct)
+                          for home_score, away_score, fg_pct in [(24, 17, 1.0), (10, 31, None), (45, 3, 0.5), (20, 20, None)]]
+        single_aggregate = SimulationAggregate("SF", "SEA")
+        for game_summary in game_summaries:
+            single_aggregate.add_game(game_summary)
+
+        merged_aggregate = SimulationAggregate("SF", "SEA")
+        for chunk in (game_summaries[:1], game_summaries[1:]):
+            chunk_aggregate = SimulationAggregate("SF", "SEA")
+            for game_summary in chunk:
+                chunk_aggregate.add_game(game_summary)
+            merged_aggregate.merge(chunk_aggregate)
+
+        assert merged_aggregate.num_games == 4 and merged_aggregate.home_wins == 2
+        assert (merged_aggregate.score_histograms == single_aggregate.score_histograms).all()
+        assert merged_aggregate.score_histograms[0, 45] == 1 and merged_aggregate.score_histograms[1].sum() == 4
+        assert merged_aggregate.get_stat_means(0) == pytest.approx(single_aggregate.get_stat_means(0), nan_ok=True)
+        # Games without field goal attempts don't count towards fg_pct
+        assert merged_aggregate.get_stat_means(0)["fg_pct"] == pytest.approx(0.75)
+        assert merged_aggregate.get_stat_variances(0)["score"] == pytest.approx(np.var([24, 10, 45, 20], ddof=1))
+        assert np.isnan(merged_aggregate.get_stat_means(1)["fg_pct"])
+
+    def test_batch_of_games_matches_games_added_one_by_one(self):
+        rng = np.random.default_rng(3)
+        final_scores = rng.integers(0, 50, size=(200, 2))
+        fg_pcts = np.where(rng.random(200) < 0.3, np.nan, rng.random(200) * 100)
+        one_by_one_aggregate = SimulationAggregate("SF", "SEA", track_percentiles=True)
+        for (home_score, away_score), fg_pct in zip(final_scores.tolist(), fg_pcts.tolist()):
+            one_by_one_aggregate.add_game(self.make_game_summary(home_score, away_score, None if np.isnan(fg_pct) else fg_pct))
+
+        batch_aggregate = SimulationAggregate("SF", "SEA", track_percentiles=True)
+        home_team_stats = {stat: np.full(200, value) for stat, value in self.make_game_summary(0, 0, None)["SF"].items() if stat != "team"}
+        away_team_stats = {stat: np.full(200, value, dtype=np.float64) for stat, value in self.make_game_summary(0, 0, None)["SEA"].items() if stat != "team"}
+        home_team_stats.update({"score": final_scores[:, 0], "fg_pct": fg_pcts})
+        away_team_stats["score"] = final_scores[:, 1]
+        batch_aggregate.add_game_batch(final_scores, home_team_stats, away_team_stats)
+
+        assert batch_aggregate.home_wins == one_by_one_aggregate.home_wins
+        assert (batch_aggregate.stat_counts == one_by_one_aggregate.stat_counts).all()
+        assert batch_aggregate.get_stat_means(0) == pytest.approx(one_by_one_aggregate.get_stat_means(0))
+        assert batch_aggregate.get_stat_variances(0)["fg_pct"] == pytest.approx(np.nanvar(fg_pcts, ddof=1))
+        assert batch_aggregate.get_stat_percentiles(0, 50) == one_by_one_aggregate.get_stat_percentiles(0, 50)
+        assert batch_aggregate.get_stat_percentiles(0, 50)["score"] == pytest.approx(np.median(final_scores[:, 0]), rel=0.02)
+
+    def test_standard_errors_of_win_pct_and_score_diff(self):
+        rng = np.random.default_rng(5)
+        final_scores = rng.integers(0, 45, size=(300, 2))
+        score_diffs = final_scores[:, 0] - final_scores[:, 1]
+        home_wins = (score_diffs > 0).astype(np.float64)
+        batch_aggregate = SimulationAggregate("SF", "SEA")
+        merged_aggregate = SimulationAggregate("SF", "SEA")
+        for chunk_scores in (final_scores[:120], final_scores[120:]):
+            chunk_aggregate = SimulationAggregate("SF", "SEA")
+            for home_score, away_score in chunk_scores.tolist():
+                chunk_aggregate.add_game({"final_score": {"SF": home_score, "SEA": away_score}})
+            merged_aggregate.merge(chunk_aggregate)
+            stats = {stat: np.full(len(chunk_scores), np.nan) for stat in self.make_game_summary(0, 0, None)["SF"] if stat != "team"}
+            batch_aggregate.add_game_batch(chunk_scores, dict(stats, score=chunk_scores[:, 0]), dict(stats, score=chunk_scores[:, 1]))
+
+        for aggregate in (merged_aggregate, batch_aggregate):
+            assert aggregate.get_score_diff_standard_error() == pytest.approx(np.std(score_diffs, ddof=1) / np.sqrt(300))
+            assert aggregate.get_home_win_pct_standard_error() == pytest.approx(100 * np.std(home_wins, ddof=1) / np.sqrt(300))
+        assert np.isnan(SimulationAggregate("SF", "SEA").get_score_diff_standard_error())
+
+    def test_grouped_games_use_the_spread_of_group_means(self):
+        # Pairs of games that always split the same way have no spread between pairs at all
+        grouped_aggregate = SimulationAggregate("SF", "SEA", sampling_group_size=2)
+        merged_aggregate = SimulationAggregate("SF", "SEA", sampling_group_size=2)
+        chunk_aggregates = [SimulationAggregate("SF", "SEA", sampling_group_size=2) for __ in range(2)]
+        for game_index in range(40):
+            home_score, away_score = (24, 17) if game_index % 2 == 0 else (17, 24)
+            game_summary = {"final_score": {"SF": home_score, "SEA": away_score}}
+            grouped_aggregate.add_game(game_summary, game_index)
+            chunk_aggregates[game_index // 20].add_game(game_summary, game_index)
+        for chunk_aggregate in chunk_aggregates:
+            merged_aggregate.merge(chunk_aggregate)
+
+        for aggregate in (grouped_aggregate, merged_aggregate):
+            assert aggregate.get_score_diff_standard_error() == 0
+            assert aggregate.get_home_win_pct_standard_error() == 0
+            assert aggregate.get_variance_reduction() == {"home_win_pct": np.inf, "average_score_diff": np.inf}
+        with pytest.raises(ValueError):
+            merged_aggregate.merge(SimulationAggregate("SF", "SEA", sampling_group_size=64))
+
+    def test_size_does_not_grow_with_number_of_games(self):
+        small_aggregate = SimulationAggregate("SF", "SEA")
+        large_aggregate = SimulationAggregate("SF", "SEA")
+        small_aggregate.add_game(self.make_game_summary(24, 17, 1.0))
+        for __ in range(1000):
+            large_aggregate.add_game(self.make_game_summary(24, 17, 1.0))
+        # Only the game counts get a few bytes longer
+        assert len(pickle.dumps(large_aggregate)) - len(pickle.dumps(small_aggregate)) < 16
+
+    # Helper functions
+    @staticmethod
+    def make_game_summary(home_score: int, away_score: int, home_fg_pct: float) -> dict:
+        def make_team_stats(team: str, score: int, fg_pct: float) -> dict:
+            return {"team": team, "score": score, "run_rate": 0.45, "pass_rate": 0.55, "pass_cmp_rate": 0.65, "pass_yards": 250,
+                    "passing_tds": 2, "sacks_allowed": 3, "pass_yards_per_play": 7.1, "rushing_attempts": 25, "rushing_yards": 110,
+                    "rushing_tds": 1, "rush_yards_per_play": 4.4, "total_turnovers": 1, "fg_pct": fg_pct}
+        return {
+            "final_score": {"SF": home_score, "SEA": away_score},
+            "SF": make_team_stats("SF", home_score, home_fg_pct),
+            "SEA": make_team_stats("SEA", away_score, None),
+        }
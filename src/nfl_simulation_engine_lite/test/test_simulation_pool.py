@@ -0,0 +1,97 @@
+from nfl_simulation_engine_lite.game_model.game_model_factory import initialize_game_model_from_descriptor
+from nfl_simulation_engine_lite.game_model.game_model_v2 import GameModel_V2
+from nfl_simulation_engine_lite.game_model.game_model_v2b import GameModel_V2b
+from nfl_simulation_engine_lite.game_model.prototype_game_model import PrototypeGameModel
+from nfl_simulation_engine_lite.game_simulator import initialize_teams_for_game_engine, run_multiple_simulations_multi_threaded, run_slate_simulations
+from nfl_simulation_engine_lite.simulation_pool import get_simulation_pool, run_aggregated_simulation_chunk, warm_up_worker
+import nfl_simulation_engine_lite.game_simulator as game_simulator
+import os
+import pickle
+import pytest
+import signal
+
+class TestSimulationPool:
+    def test_pool_workers_persist_between_runs(self):
+        simulation_pool = get_simulation_pool(2)
+        simulation_pool.warm_up()
+        assert get_simulation_pool(2) is simulation_pool
+
+        model_descriptor = GameModel_V2().get_model_descriptor()
+        worker_pids = {simulation_pool.get_executor().submit(warm_up_worker).result() for __ in range(6)}
+        first_aggregate = simulation_pool.submit_simulation_chunk("DAL", "NYG", model_descriptor, 0, 2, 99, 1).result()
+        second_aggregate = simulation_pool.submit_simulation_chunk("DAL", "NYG", model_descriptor, 0, 2, 99).result()
+        assert worker_pids <= set(simulation_pool.get_executor()._processes)
+
+        # Only the chunk's totals come back, and the same seed replays the same games
+        assert first_aggregate.num_games == 2
+        assert first_aggregate.featured_game_index == 1 and first_aggregate.featured_play_log
+        assert second_aggregate.featured_play_log is None
+        assert (first_aggregate.score_histograms == second_aggregate.score_histograms).all()
+        assert (first_aggregate.stat_means == second_aggregate.stat_means).all()
+
+    def test_workers_run_models_with_custom_params(self):
+        game_model = GameModel_V2b(off_weight=0.6, rpi_params={"gamma": 0.1, "multiplier_floor": 0.7, "multiplier_ceiling": 1.3, "hfa_const": 0.2})
+        model_descriptor = game_model.get_model_descriptor()
+        assert initialize_game_model_from_descriptor(model_descriptor).get_model_descriptor() == model_descriptor
+        # A chunk carries a few hundred bytes at most, never the model itself
+        assert len(pickle.dumps(model_descriptor)) < 512
+
+        pooled_aggregate = get_simulation_pool(2).submit_simulation_chunk("DAL", "NYG", model_descriptor, 0, 3, 5).result()
+        home_team, away_team = initialize_teams_for_game_engine("DAL", "NYG")
+        local_aggregate = run_aggregated_simulation_chunk(home_team, away_team, game_model, 0, 3, 5)
+        default_aggregate = run_aggregated_simulation_chunk(home_team, away_team, GameModel_V2b(), 0, 3, 5)
+        assert (pooled_aggregate.stat_means == local_aggregate.stat_means).all()
+        assert not (pooled_aggregate.stat_means == default_aggregate.stat_means).all()
+
+    def test_batch_chunks_run_on_the_batch_engine(self):
+        model_descriptor = GameModel_V2().get_model_descriptor()
+        pooled_aggregate = get_simulation_pool(2).submit_simulation_chunk("DAL", "NYG", model_descriptor, 10, 50, 7, 12, batch=True).result()
+        home_team, away_team = initialize_teams_for_game_engine("DAL", "NYG")
+        local_aggregate = run_aggregated_simulation_chunk(home_team, away_team, GameModel_V2(), 10, 50, 7, 12, batch=True)
+        assert pooled_aggregate.num_games == 50
+        assert pooled_aggregate.featured_game_index == 12 and pooled_aggregate.featured_play_log
+        assert pooled_aggregate.featured_play_log == local_aggregate.featured_play_log
+        assert (pooled_aggregate.score_histograms == local_aggregate.score_histograms).all()
+        assert pooled_aggregate.home_wins == local_aggregate.home_wins
+
+        other_chunk_aggregate = run_aggregated_simulation_chunk(home_team, away_team, GameModel_V2(), 60, 50, 7, 12, batch=True)
+        assert other_chunk_aggregate.featured_play_log is None
+
+    def test_batch_runs_through_the_pool(self):
+        result = run_multiple_simulations_multi_threaded("DAL", "NYG", 200, GameModel_V2(), num_workers=2, debug_mode=False, seed=4, batch=True)
+        repeated_result = run_multiple_simulations_multi_threaded("DAL", "NYG", 200, GameModel_V2(), num_workers=2, debug_mode=False, seed=4, batch=True)
+        assert result["num_simulations"] == 200
+        assert result["featured_game_home_scoring_data"] == repeated_result["featured_game_home_scoring_data"]
+        assert result["home_win_pct"] == repeated_result["home_win_pct"]
+
+        with pytest.raises(ValueError):
+            run_multiple_simulations_multi_threaded("DAL", "NYG", 10, PrototypeGameModel(), num_workers=2, debug_mode=False, batch=True)
+        with pytest.raises(ValueError):
+            run_multiple_simulations_multi_threaded("DAL", "NYG", 10, GameModel_V2(), num_workers=2, debug_mode=False, sampling="antithetic", batch=True)
+
+    def test_chunks_in_flight_are_run_again_when_a_worker_dies(self, monkeypatch):
+        simulation_pool = get_simulation_pool(2)
+        expected_result = run_multiple_simulations_multi_threaded("DAL", "NYG", 400, GameModel_V2(), num_workers=2, debug_mode=False, seed=6,
+                                                                  output_level="scores")
+        expected_slate_result = run_slate_simulations([("DAL", "NYG")], [GameModel_V2()], 400, num_workers=2, seed=6)
+
+        # A worker is killed right after each round is submitted, once per run
+        submit_simulation_round = game_simulator.submit_simulation_round
+        killed_pools = []
+        monkeypatch.setattr(game_simulator, "submit_simulation_round",
+                            lambda *args, **kwargs: TestSimulationPool.kill_worker_once(submit_simulation_round(*args, **kwargs), simulation_pool, killed_pools))
+        result = run_multiple_simulations_multi_threaded("DAL", "NYG", 400, GameModel_V2(), num_workers=2, debug_mode=False, seed=6,
+                                                         output_level="scores")
+        killed_pools.clear()
+        slate_result = run_slate_simulations([("DAL", "NYG")], [GameModel_V2()], 400, num_workers=2, seed=6)
+        assert killed_pools
+        assert result["score_distributions"] == expected_result["score_distributions"]
+        assert slate_result == expected_slate_result
+
+    # Helper functions
+    @staticmethod
+    def kill_worker_once(futures: list, simulation_pool, killed_pools: list) -> list:
+        if not killed_pools:
+            killed_pools.append(simulation_pool.executor)
+            os.kill(next(iter(simulation_pool.executor._processes)), signal.SIGKILL)
+        return futures
@@ -0,0 +1,167 @@
+from nfl_simulation_engine_lite.game_simulator import run_multiple_simulations_multi_threaded, run_multiple_simulations_with_statistics, run_slate_simulations, allocate_slate_simulations, get_weekly_game_models
+from nfl_simulation_engine_lite.utils.random_stream import derive_seed
+from nfl_simulation_engine_lite.utils.simulation_aggregate import SimulationAggregate
+from nfl_simulation_engine_lite.game_model.game_model_factory import initialize_new_game_model_instance
+from nfl_simulation_engine_lite.utils.paired_comparison import compare_paired_game_scores
+from nfl_simulation_engine_lite.simulation_pool import get_simulation_pool
+import nfl_simulation_engine_lite.game_model.game_model as game_model_module
+import numpy as np
+import pandas as pd
+import pytest
+
+class TestSimulationSeeding:
+    def test_seeded_results_do_not_depend_on_worker_count(self):
+        results = [run_multiple_simulations_multi_threaded("SF", "SEA", 12, initialize_new_game_model_instance("v2b"),
+                                                           num_workers=num_workers, debug_mode=False, seed=1234)
+                   for num_workers in (1, 3)]
+        assert results[0]["seed"] == results[1]["seed"] == 1234
+        assert results[0]["home_win_pct"] == results[1]["home_win_pct"]
+        assert self.sim_stats_equal(results[0], results[1])
+        assert results[0]["featured_game_home_scoring_data"] == results[1]["featured_game_home_scoring_data"]
+
+        # Serial runs give the same games as well
+        serial_result = run_multiple_simulations_with_statistics("SF", "SEA", 12, initialize_new_game_model_instance("v2b"), debug_mode=False, seed=1234)
+        assert self.sim_stats_equal(serial_result, results[0])
+
+    def test_score_only_runs_have_the_same_outcomes(self):
+        full_result = run_multiple_simulations_multi_threaded("SF", "SEA", 12, initialize_new_game_model_instance("v2"),
+                                                              num_workers=2, debug_mode=False, seed=77)
+        score_result = run_multiple_simulations_multi_threaded("SF", "SEA", 12, initialize_new_game_model_instance("v2"),
+                                                               num_workers=2, debug_mode=False, seed=77, output_level="scores")
+        assert score_result["home_win_pct"] == full_result["home_win_pct"]
+        assert score_result["score_distributions"] == full_result["score_distributions"]
+        assert "featured_game_home_scoring_data" not in score_result
+        assert list(score_result["total_sim_stats"][0]) == ["index", "team", "score"]
+
+    def test_adaptive_runs_stop_once_the_targets_are_met(self):
+        adaptive_result = run_multiple_simulations_multi_threaded("SF", "SEA", 5000, initialize_new_game_model_instance("proto"), num_workers=2,
+                                                                  debug_mode=False, seed=5, output_level="scores", adaptive=True,
+                                                                  target_win_pct_se=3.0, target_score_diff_se=1.0)
+        assert adaptive_result["precision_targets_met"]
+        assert adaptive_result["home_win_pct_standard_error"] <= 3.0 and adaptive_result["average_score_diff_standard_error"] <= 1.0
+        assert adaptive_result["num_simulations"] < 5000 and adaptive_result["num_simulation_rounds"] >= 1
+
+        # The rounds play the same games as a fixed run of as many games
+        fixed_result = run_multiple_simulations_multi_threaded("SF", "SEA", adaptive_result["num_simulations"], initialize_new_game_model_instance("proto"),
+                                                               num_workers=2, debug_mode=False, seed=5, output_level="scores")
+        assert fixed_result["home_win_pct"] == adaptive_result["home_win_pct"]
+        assert fixed_result["score_distributions"] == adaptive_result["score_distributions"]
+        assert fixed_result["average_score_diff_standard_error"] == adaptive_result["average_score_diff_standard_error"]
+
+        capped_result = run_multiple_simulations_multi_threaded("SF", "SEA", 300, initialize_new_game_model_instance("proto"), num_workers=2,
+                                                                debug_mode=False, seed=5, output_level="scores", adaptive=True,
+                                                                target_win_pct_se=0.1, target_score_diff_se=0.1)
+        assert capped_result["num_simulations"] == 300 and not capped_result["precision_targets_met"]
+
+    def test_time_budgeted_runs_return_the_games_that_fit_in_the_budget(self):
+        budgeted_result = run_multiple_simulations_multi_threaded("SF", "SEA", 100000, initialize_new_game_model_instance("proto"), num_workers=2,
+                                                                  debug_mode=False, seed=9, output_level="scores", time_budget_ms=1500)
+        # The pilot round alone is 20 games, and the rounds after it are sized to leave part of the budget unused
+        assert 20 <= budgeted_result["num_simulations"] < 100000
+        assert budgeted_result["elapsed_ms"] < 1500 + 1000
+        win_pct_low, win_pct_high = budgeted_result["home_win_pct_confidence_interval"]
+        assert win_pct_low < budgeted_result["home_win_pct"] < win_pct_high
+        assert win_pct_high - win_pct_low == pytest.approx(2 * 1.96 * budgeted_result["home_win_pct_standard_error"], abs=0.02)
+
+        fixed_result = run_multiple_simulations_multi_threaded("SF", "SEA", budgeted_result["num_simulations"], initialize_new_game_model_instance("proto"),
+                                                               num_workers=2, debug_mode=False, seed=9, output_level="scores")
+        assert fixed_result["score_distributions"] == budgeted_result["score_distributions"]
+
+    def test_time_budget_starts_once_the_pool_is_up(self):
+        # A cold pool takes longer to start than this budget, and the pilot round shrinks to fit it
+        get_simulation_pool(2).shutdown()
+        budgeted_result = run_multiple_simulations_multi_threaded("SF", "SEA", 100000, initialize_new_game_model_instance("proto"), num_workers=2,
+                                                                  debug_mode=False, seed=9, output_level="scores", time_budget_ms=20)
+        assert budgeted_result["num_simulations"] >= 2
+        assert budgeted_result["elapsed_ms"] < 20 + 200
+
+    def test_paired_runs_give_lower_variance_model_differences(self):
+        results = {model_code: run_multiple_simulations_multi_threaded("DET", "NYG", 400, initialize_new_game_model_instance(model_code), num_workers=2,
+                                                                       debug_mode=False, seed=21, output_level="scores", paired=True)
+                   for model_code in ("v2", "v2a")}
+        game_scores = {model_code: np.array(result["game_scores"]) for model_code, result in results.items()}
+        assert game_scores["v2"].shape == (400, 2)
+        assert round(100 * np.mean(game_scores["v2"][:, 0] > game_scores["v2"][:, 1]), 2) == results["v2"]["home_win_pct"]
+
+        comparison = compare_paired_game_scores(game_scores["v2a"], game_scores["v2"])
+        assert comparison["num_paired_games"] == 400
+        assert comparison["home_win_pct_difference"] == round(results["v2a"]["home_win_pct"] - results["v2"]["home_win_pct"], 2)
+        assert comparison["average_score_diff_difference_standard_error"] < comparison["independent_average_score_diff_difference_standard_error"]
+        assert comparison["home_win_pct_difference_standard_error"] < comparison["independent_home_win_pct_difference_standard_error"]
+
+        # Paired games are the same for a given seed whatever the number of workers
+        single_worker_result = run_multiple_simulations_multi_threaded("DET", "NYG", 400, initialize_new_game_model_instance("v2"), num_workers=1,
+                                                                       debug_mode=False, seed=21, output_level="scores", paired=True)
+        assert single_worker_result["game_scores"] == results["v2"]["game_scores"]
+
+    def test_antithetic_and_stratified_runs_report_their_variance_reduction(self):
+        # Enough games for MIN_SAMPLING_GROUPS complete stratified blocks
+        for sampling in ("antithetic", "stratified"):
+            result = run_multiple_simulations_multi_threaded("SF", "SEA", 640, initialize_new_game_model_instance("v2"), num_workers=2,
+                                                             debug_mode=False, seed=13, output_level="scores", sampling=sampling)
+            assert result["sampling"] == sampling
+            assert set(result["variance_reduction"]) == {"home_win_pct", "average_score_diff"}
+            assert all(variance_reduction > 0 for variance_reduction in result["variance_reduction"].values())
+
+            single_worker_result = run_multiple_simulations_multi_threaded("SF", "SEA", 640, initialize_new_game_model_instance("v2"), num_workers=1,
+                                                                           debug_mode=False, seed=13, output_level="scores", sampling=sampling)
+            assert single_worker_result["score_distributions"] == result["score_distributions"]
+            assert single_worker_result["variance_reduction"] == result["variance_reduction"]
+
+    def test_slate_runs_play_the_same_games_as_separate_runs(self):
+        matchups = [("SEA", "SF"), ("NYG", "DET"), ("KC", "BUF")]
+        game_models = [initialize_new_game_model_instance("proto"), initialize_new_game_model_instance("v2b")]
+        slate_results = run_slate_simulations(matchups, game_models, 600, num_workers=2, seed=17)
+        assert set(slate_results) == {(model_index, matchup_index) for model_index in range(2) for matchup_index in range(3)}
+        for (model_index, matchup_index), slate_result in slate_results.items():
+            away_team_abbrev, home_team_abbrev = matchups[matchup_index]
+            separate_result = run_multiple_simulations_multi_threaded(home_team_abbrev, away_team_abbrev, 600, game_models[model_index], num_workers=2,
+                                                                      debug_mode=False, seed=derive_seed(17, model_index, matchup_index), output_level="scores")
+            assert slate_result["num_simulations"] == 600
+            assert slate_result["home_win_pct"] == separate_result["home_win_pct"]
+            assert slate_result["score_distributions"] == separate_result["score_distributions"]
+
+    def test_slate_budget_goes_to_the_least_precise_runs(self):
+        # A coin flip, a 75/25 matchup and a blowout, 200 games each with the same score differences
+        slate_aggregates = {}
+        for key, num_home_wins in (("coin_flip", 100), ("favorite", 150), ("blowout", 200)):
+            slate_aggregates[key] = SimulationAggregate("SF", "SEA")
+            for game_index in range(200):
+                home_score = 20 + (game_index % 10) if game_index < num_home_wins else 0
+                slate_aggregates[key].add_game({"final_score": {"SF": home_score, "SEA": 10 + (game_index % 10) * (game_index >= num_home_wins)}})
+        additional_games = allocate_slate_simulations(slate_aggregates, 1000, 100000, 1.0, 100.0)
+        assert additional_games["coin_flip"] > additional_games["favorite"] > additional_games["blowout"] == 0
+        assert 990 <= sum(additional_games.values()) <= 1000
+
+        # Budget beyond what the targets need is left unspent
+        additional_games = allocate_slate_simulations(slate_aggregates, 100000, 100000, 1.0, 100.0)
+        assert additional_games["coin_flip"] == pytest.approx(2500 - 200, abs=20) and sum(additional_games.values()) < 100000
+
+        matchups = [("SEA", "SF"), ("NYG", "DET")]
+        game_models = [initialize_new_game_model_instance("proto"), initialize_new_game_model_instance("v2")]
+        slate_results = run_slate_simulations(matchups, game_models, 5000, num_workers=2, seed=23, simulation_budget=2000)
+        assert sum(result["num_simulations"] for result in slate_results.values()) <= 2000
+        assert all(result["num_simulations"] >= 200 and "precision_targets_met" in result for result in slate_results.values())
+        with pytest.raises(ValueError):
+            run_slate_simulations(matchups, game_models, 5000, num_workers=2, seed=23, simulation_budget=500)
+
+    def test_models_without_a_fourth_down_model_are_left_out_of_the_week(self, monkeypatch):
+        # Whether or not the v1 forest is around, the week only runs models that can play
+        monkeypatch.setattr(game_model_module, "is_fourth_down_model_available", lambda model_name: model_name != "v1")
+        game_models, model_labels = get_weekly_game_models()
+        assert model_labels == ["Prototype", "V1a", "V1b", "V2", "V2a", "V2b"]
+        assert len(game_models) == len(model_labels)
+        with pytest.raises(ValueError, match="v1 fourth down model is not available"):
+            run_slate_simulations([("SEA", "SF")], [initialize_new_game_model_instance("v1")], 200, num_workers=2, seed=1)
+
+    # Helper functions
+    @staticmethod
+    def sim_stats_equal(first_result: dict, second_result: dict) -> bool:
+        # Chunked sums can move the last rounded digit, NaN averages count as equal
+        first_stats = pd.DataFrame(first_result["total_sim_stats"])
+        second_stats = pd.DataFrame(second_result["total_sim_stats"])
+        if not first_stats["team"].equals(second_stats["team"]):
+            return False
+        first_averages = first_stats.drop(columns=["team"]).to_numpy(dtype=float)
+        second_averages = second_stats.drop(columns=["team"]).to_numpy(dtype=float)
+        return bool(np.allclose(first_averages, second_averages, rtol=0, atol=0.011, equal_nan=True))
@@ -0,0 +1,59 @@
+from nfl_simulation_engine_lite.db import db_conn
+from nfl_simulation_engine_lite.team.team_rates import DISTANCE_CATEGORIES, FALLBACK_SITUATION_INDEX, RATE_STATS, RATE_STAT_INDEX, SITUATIONS, TeamRates, get_distance_category_index, get_situation_index
+import nfl_simulation_engine_lite.team.team_factory as team_factory
+import numpy as np
+import pandas as pd
+
+class TestTeamRates:
+    def test_rate_array_resolves_fallbacks(self):
+        test_db_conn = db_conn.get_db_conn()
+        team_rates = team_factory.initialize_team_rates("KC", test_db_conn)
+        test_db_conn.close()
+
+        fallback_data = team_rates.get_data_for_situation(None, None, None)
+        for down, distance_category, redzone in SITUATIONS:
+            situation_data = team_rates.get_data_for_situation(down, DISTANCE_CATEGORIES[distance_category], redzone)
+            for stat in RATE_STATS:
+                expected_rate = getattr(situation_data, stat)
+                if pd.isna(expected_rate):
+                    expected_rate = getattr(fallback_data, stat)
+                assert team_rates.get_rate(down, distance_category, redzone, stat) == expected_rate
+
+        # Index 0 on the down axis always holds the fallback data
+        assert team_rates.get_rate(0, 0, 0, "run_rate") == fallback_data.run_rate
+
+    def test_league_rate_tensor(self):
+        test_db_conn = db_conn.get_db_conn()
+        team_abbrevs, league_rate_tensor = team_factory.initialize_league_team_rates(test_db_conn)
+        team_rates = team_factory.initialize_team_rates("BUF", test_db_conn)
+        test_db_conn.close()
+
+        assert len(team_abbrevs) == 32
+        assert league_rate_tensor.shape == (32, len(SITUATIONS) + 1, len(RATE_STATS))
+
+        team_index = team_abbrevs.index("BUF")
+        situation_index = get_situation_index(3, get_distance_category_index(5), 1)
+        stat_index = RATE_STAT_INDEX["pass_rate"]
+        assert league_rate_tensor[team_index, situation_index, stat_index] == team_rates.get_rate(3, 1, 1, "pass_rate")
+        assert np.array_equal(league_rate_tensor[team_index, FALLBACK_SITUATION_INDEX], team_rates.fallback_rates)
+
+    def test_rate_array_team_stats(self):
+        # Teams built from the shared league data only have the situation rate matrix
+        test_db_conn = db_conn.get_db_conn()
+        team_rates = team_factory.initialize_team_rates("KC", test_db_conn)
+        test_db_conn.close()
+        matrix_team_rates = TeamRates(situation_rate_matrix=team_rates.get_situation_rate_matrix(), team_abbrev="KC")
+        assert matrix_team_rates.team_rate_stats is None
+        assert np.array_equal(matrix_team_rates.rate_array, team_rates.rate_array, equal_nan=True)
+
+        fallback_data = team_rates.get_data_for_situation(None, None, None)
+        for down, distance_category, redzone in SITUATIONS + [(None, None, None), (4, "unknown", False)]:
+            distance_category = DISTANCE_CATEGORIES[distance_category] if isinstance(distance_category, int) else distance_category
+            situation_data = team_rates.get_data_for_situation(down, distance_category, redzone)
+            matrix_situation_data = matrix_team_rates.get_data_for_situation(down, distance_category, redzone)
+            assert matrix_situation_data.team == "KC"
+            for stat in RATE_STATS:
+                expected_value = getattr(situation_data, stat)
+                if pd.isna(expected_value):
+                    expected_value = getattr(fallback_data, stat)
+                assert getattr(matrix_situation_data, stat) == expected_value
@@ -0,0 +1,24 @@
+import numpy as np
+
+def get_standard_error(values: np.ndarray) -> float:
+    return float(np.std(values, ddof=1) / np.sqrt(len(values))) if len(values) > 1 else np.nan
+
+def compare_paired_game_scores(game_scores: np.ndarray, baseline_game_scores: np.ndarray) -> dict:
+    # Differences from a baseline model that ran the same games in paired mode, with their standard errors
+    num_games = min(len(game_scores), len(baseline_game_scores))
+    game_scores = np.asarray(game_scores[:num_games], dtype=np.float64)
+    baseline_game_scores = np.asarray(baseline_game_scores[:num_games], dtype=np.float64)
+
+    home_wins = 100 * (game_scores[:, 0] > game_scores[:, 1])
+    baseline_home_wins = 100 * (baseline_game_scores[:, 0] > baseline_game_scores[:, 1])
+    score_diffs = game_scores[:, 0] - game_scores[:, 1]
+    baseline_score_diffs = baseline_game_scores[:, 0] - baseline_game_scores[:, 1]
+    return {
+        "num_paired_games": num_games,
+        "home_win_pct_difference": round(float(np.mean(home_wins - baseline_home_wins)), 2) if num_games else np.nan,
+        "home_win_pct_difference_standard_error": round(get_standard_error(home_wins - baseline_home_wins), 4),
+        "independent_home_win_pct_difference_standard_error": round(float(np.hypot(get_standard_error(home_wins), get_standard_error(baseline_home_wins))), 4),
+        "average_score_diff_difference": round(float(np.mean(score_diffs - baseline_score_diffs)), 2) if num_games else np.nan,
+        "average_score_diff_difference_standard_error": round(get_standard_error(score_diffs - baseline_score_diffs), 4),
+        "independent_average_score_diff_difference_standard_error": round(float(np.hypot(get_standard_error(score_diffs), get_standard_error(baseline_score_diffs))), 4)
+    }
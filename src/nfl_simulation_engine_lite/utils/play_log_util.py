@@ -1,18 +1,38 @@
 import pandas as pd
 
-def generate_team_passing_stats_summary(team: str, df: pd.DataFrame) -> dict:
-    passing_df = df[(df["play_type"] == "pass") & (df["posteam"] == team)]
-    passing_df["agg_pass_yards"] = passing_df["yards_gained"].cumsum()
-    team_pass_stats_df = passing_df[["game_time_elapsed", "agg_pass_yards"]]
-    return team_pass_stats_df.to_dict(orient="records")
-
-def generate_team_rushing_stats_summary(team: str, df: pd.DataFrame) -> dict:
-    rushing_df = df[(df["play_type"] == "run") & (df["posteam"] == team)]
-    rushing_df["agg_rush_yards"] = rushing_df["yards_gained"].cumsum()
-    team_rush_stats_df = rushing_df[["game_time_elapsed", "agg_rush_yards"]]
-    return team_rush_stats_df.to_dict(orient="records")
-
-def generate_team_scoring_summary(team: str, df: pd.DataFrame) -> dict:
-    posteam_df = df[df["posteam"] == team]
-    team_scoring_df = posteam_df[["game_time_elapsed", "posteam_score"]]
-    return team_scoring_df.to_dict(orient="records")
\ No newline at end of file
+# Each summary is one pass over the featured game's play log, a list of play result dicts
+
+def get_game_time_elapsed(play: dict) -> int:
+    return 3600 - play["game_seconds_remaining"]
+
+def get_team_passing_stats(team: str, play_log: list) -> list:
+    team_pass_stats = []
+    agg_pass_yards = 0
+    for play in play_log:
+        if play["play_type"] == "pass" and play["posteam"] == team:
+            agg_pass_yards += play["yards_gained"]
+            team_pass_stats.append({"game_time_elapsed": get_game_time_elapsed(play), "agg_pass_yards": agg_pass_yards})
+    return team_pass_stats
+
+def get_team_rushing_stats(team: str, play_log: list) -> list:
+    team_rush_stats = []
+    agg_rush_yards = 0
+    for play in play_log:
+        if play["play_type"] == "run" and play["posteam"] == team:
+            agg_rush_yards += play["yards_gained"]
+            team_rush_stats.append({"game_time_elapsed": get_game_time_elapsed(play), "agg_rush_yards": agg_rush_yards})
+    return team_rush_stats
+
+def get_team_scoring(team: str, play_log: list) -> list:
+    return [{"game_time_elapsed": get_game_time_elapsed(play), "posteam_score": play["posteam_score"]}
+            for play in play_log if play["posteam"] == team]
+
+# Play log DataFrame versions kept for existing callers
+def generate_team_passing_stats_summary(team: str, df: pd.DataFrame) -> list:
+    return get_team_passing_stats(team, df.to_dict(orient="records"))
+
+def generate_team_rushing_stats_summary(team: str, df: pd.DataFrame) -> list:
+    return get_team_rushing_stats(team, df.to_dict(orient="records"))
+
+def generate_team_scoring_summary(team: str, df: pd.DataFrame) -> list:
+    return get_team_scoring(team, df.to_dict(orient="records"))
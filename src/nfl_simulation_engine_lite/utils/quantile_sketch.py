@@ -0,0 +1,65 @@
+import math
+
+class QuantileSketch:
+    # Mergeable quantile estimates in logarithmically sized buckets, as in DDSketch
+    def __init__(self, relative_accuracy: float = 0.01):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError(f"The relative accuracy must be between 0 and 1, got {relative_accuracy}")
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        # Values this close to zero are counted as zero
+        self.min_value = 1e-9
+        self.positive_buckets = {}
+        self.negative_buckets = {}
+        self.zero_count = 0
+        self.count = 0
+
+    def get_bucket_key(self, value: float) -> int:
+        return math.ceil(math.log(value) / self.log_gamma)
+
+    def get_bucket_value(self, key: int) -> float:
+        return 2 * self.gamma**key / (self.gamma + 1)
+
+    def add(self, value: float) -> None:
+        if value > self.min_value:
+            key = self.get_bucket_key(value)
+            self.positive_buckets[key] = self.positive_buckets.get(key, 0) + 1
+        elif value < -self.min_value:
+            key = self.get_bucket_key(-value)
+            self.negative_buckets[key] = self.negative_buckets.get(key, 0) + 1
+        else:
+            self.zero_count += 1
+        self.count += 1
+
+    def merge(self, other: "QuantileSketch") -> None:
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError(f"Cannot merge a sketch with relative accuracy {other.relative_accuracy} into one with {self.relative_accuracy}")
+        for key, bucket_count in other.positive_buckets.items():
+            self.positive_buckets[key] = self.positive_buckets.get(key, 0) + bucket_count
+        for key, bucket_count in other.negative_buckets.items():
+            self.negative_buckets[key] = self.negative_buckets.get(key, 0) + bucket_count
+        self.zero_count += other.zero_count
+        self.count += other.count
+
+    def quantile(self, q: float) -> float:
+        if not 0 <= q <= 1:
+            raise ValueError(f"The quantile must be between 0 and 1, got {q}")
+        if self.count == 0:
+            return math.nan
+
+        rank = q * (self.count - 1)
+        seen = 0
+        # Most negative values first, then zeros, then the positive values in increasing order
+        for key in sorted(self.negative_buckets, reverse=True):
+            seen += self.negative_buckets[key]
+            if seen > rank:
+                return -self.get_bucket_value(key)
+        seen += self.zero_count
+        if seen > rank:
+            return 0.0
+        for key in sorted(self.positive_buckets):
+            seen += self.positive_buckets[key]
+            if seen > rank:
+                return self.get_bucket_value(key)
+        return self.get_bucket_value(max(self.positive_buckets))
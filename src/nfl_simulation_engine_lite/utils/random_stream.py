@@ -0,0 +1,144 @@
+import numpy as np
+
+def spawn_generator(seed: int, *stream_key: int) -> np.random.Generator:
+    # Streams are addressed by key, so a game gets the same stream whichever worker runs it
+    return np.random.default_rng(np.random.SeedSequence(seed, spawn_key=stream_key))
+
+def get_game_generator(seed: int, game_index: int) -> np.random.Generator:
+    # Unseeded games keep drawing from the streams the model and teams already hold
+    return spawn_generator(seed, game_index) if seed is not None else None
+
+def derive_seed(seed: int, *stream_key: int) -> int:
+    return int(np.random.SeedSequence(seed, spawn_key=stream_key).generate_state(1, np.uint64)[0])
+
+def generate_seed() -> int:
+    # Fresh 32-bit seed for unseeded runs, so they can still be reproduced from the reported seed
+    return int(np.random.SeedSequence().generate_state(1)[0])
+
+class RandomStream:
+    # Uniform numbers pre-drawn in blocks from a NumPy Generator
+    def __init__(self, generator: np.random.Generator = None, block_size: int = 4096):
+        self.generator = generator if generator is not None else np.random.default_rng()
+        self.block_size = block_size
+        self.block = []
+        self.block_position = 0
+
+    def uniform(self, purpose: str = None) -> float:
+        # The purpose of a draw (see DRAW_PURPOSES) only matters to PairedRandomStream
+        if self.block_position == len(self.block):
+            self.block = self.generator.random(self.block_size).tolist()
+            self.block_position = 0
+        value = self.block[self.block_position]
+        self.block_position += 1
+        return value
+
+    def bernoulli(self, p: float, purpose: str = None) -> bool:
+        # Same outcome as random.choices([True, False], [p, 1 - p])[0] for the same uniform
+        return self.uniform(purpose) < p
+
+    def choose(self, first, second, first_weight: float, second_weight: float, purpose: str = None):
+        # Same outcome as random.choices([first, second], [first_weight, second_weight])[0] for the same uniform
+        total_weight = first_weight + second_weight
+        if not total_weight > 0:
+            raise ValueError(f"Total of weights must be greater than zero, got {first_weight} and {second_weight}")
+        return first if self.uniform(purpose) * total_weight < first_weight else second
+
+    def randint(self, low: int, high: int, purpose: str = None) -> int:
+        # Inclusive on both ends like random.randint
+        return low + int(self.uniform(purpose) * (high - low + 1))
+
+    def start_play(self, possession: int) -> None:
+        pass
+
+# What game models draw uniforms for
+DRAW_PURPOSES = ("clock", "play_call", "completion", "sack", "turnover", "field_goal", "punt")
+# Index of every purpose's sequence in a paired stream, for each offense
+PURPOSE_SEQUENCE_INDICES = tuple({purpose: 2 * index + possession for index, purpose in enumerate(DRAW_PURPOSES + (None,))} for possession in (0, 1))
+# Draws of each purpose set aside for every possession in a paired stream, and the possessions drawn up front
+POSSESSION_DRAWS = 32
+BLOCK_POSSESSIONS = 16
+NUM_PAIRED_SEQUENCES = 2 * len(DRAW_PURPOSES) + 2
+
+# Ways of drawing the games of a seeded run, see get_paired_game_stream
+SAMPLING_SCHEMES = ("plain", "antithetic", "stratified")
+# Games per Latin hypercube of a stratified run, and the stream key its strata are drawn from
+STRATIFIED_BLOCK_SIZE = 64
+STRATA_STREAM_KEY = 2**32
+# Games in each group of games that are drawn together, and so are not independent of each other
+SAMPLING_GROUP_SIZES = {"plain": None, "antithetic": 2, "stratified": STRATIFIED_BLOCK_SIZE}
+
+class PairedRandomStream(RandomStream):
+    # Common random numbers, a team's k-th possession reads every sequence from k * POSSESSION_DRAWS
+    def __init__(self, generator: np.random.Generator = None, block_size: int = BLOCK_POSSESSIONS * POSSESSION_DRAWS, swap_offenses: bool = False,
+                 leading_draws: np.ndarray = None):
+        super().__init__(generator, block_size)
+        # Drawn before the generator is handed to the yard samplers, so those draws line up as well
+        self.sequence_block = self.generator.random((NUM_PAIRED_SEQUENCES, block_size))
+        if leading_draws is not None:
+            self.sequence_block[:, :leading_draws.shape[1]] = leading_draws
+        self.sequences = [None] * len(self.sequence_block)
+        self.sequence_positions = [0] * len(self.sequence_block)
+        self.sampler_generator = self.generator
+        self.possession = None
+        self.possession_counts = [0, 0]
+        self.possession_start = 0
+        self.offense_sequence_indices = PURPOSE_SEQUENCE_INDICES[::-1] if swap_offenses else PURPOSE_SEQUENCE_INDICES
+        self.sequence_indices = self.offense_sequence_indices[0]
+
+    def start_play(self, possession: int) -> None:
+        if possession != self.possession:
+            self.possession = possession
+            self.possession_start = self.possession_counts[possession] * POSSESSION_DRAWS
+            self.possession_counts[possession] += 1
+            self.sequence_indices = self.offense_sequence_indices[possession]
+
+    def uniform(self, purpose: str = None) -> float:
+        sequence_index = self.sequence_indices[purpose]
+        position = self.sequence_positions[sequence_index]
+        if position < self.possession_start:
+            position = self.possession_start
+        while position >= self.sequence_block.shape[1]:
+            self.extend_sequences()
+        sequence = self.sequences[sequence_index]
+        if sequence is None:
+            sequence = self.sequences[sequence_index] = self.sequence_block[sequence_index].tolist()
+        self.sequence_positions[sequence_index] = position + 1
+        return sequence[position]
+
+    def extend_sequences(self) -> None:
+        # More draws for every sequence from a child of the generator
+        extension_generator = self.generator.spawn(1)[0]
+        self.sequence_block = np.hstack([self.sequence_block, extension_generator.random((len(self.sequence_block), self.block_size))])
+        self.sequences = [None] * len(self.sequence_block)
+
+def get_paired_game_stream(seed: int, game_index: int, sampling: str = "plain", strata: "StratifiedDraws" = None) -> PairedRandomStream:
+    # Antithetic games 2k and 2k + 1 swap offenses, stratified games draw from a Latin hypercube
+    if sampling == "antithetic":
+        return PairedRandomStream(spawn_generator(seed, game_index - game_index % 2), swap_offenses=game_index % 2 == 1)
+    if sampling == "stratified":
+        if strata is None:
+            strata = StratifiedDraws(seed)
+        return PairedRandomStream(spawn_generator(seed, game_index), leading_draws=strata.get_game_draws(game_index))
+    return PairedRandomStream(spawn_generator(seed, game_index))
+
+def get_strata(seed: int, block_index: int) -> np.ndarray:
+    # [game, sequence, draw] uniforms with one game of the block in each stratum
+    rng = spawn_generator(seed, STRATA_STREAM_KEY, block_index)
+    num_draws = NUM_PAIRED_SEQUENCES * BLOCK_POSSESSIONS * POSSESSION_DRAWS
+    strata = rng.permuted(np.tile(np.arange(STRATIFIED_BLOCK_SIZE), (num_draws, 1)), axis=1)
+    uniforms = (strata + rng.random(strata.shape)) / STRATIFIED_BLOCK_SIZE
+    return uniforms.T.reshape(STRATIFIED_BLOCK_SIZE, NUM_PAIRED_SEQUENCES, BLOCK_POSSESSIONS * POSSESSION_DRAWS)
+
+class StratifiedDraws:
+    # The strata of a stratified run's current block of games, held by the engine running them
+    def __init__(self, seed: int):
+        self.seed = seed
+        self.block_index = None
+        self.strata = None
+
+    def get_game_draws(self, game_index: int) -> np.ndarray:
+        block_index = game_index // STRATIFIED_BLOCK_SIZE
+        if block_index != self.block_index:
+            self.strata = get_strata(self.seed, block_index)
+            self.block_index = block_index
+        return self.strata[game_index % STRATIFIED_BLOCK_SIZE]
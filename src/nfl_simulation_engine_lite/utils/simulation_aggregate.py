@@ -0,0 +1,237 @@
+from nfl_simulation_engine_lite.utils.quantile_sketch import QuantileSketch
+import numpy as np
+
+# Per-team stats averaged over simulated games, in the order of a game summary's team stats
+TEAM_STAT_COLUMNS = ["score", "run_rate", "pass_rate", "pass_cmp_rate", "pass_yards", "passing_tds", "sacks_allowed",
+                     "pass_yards_per_play", "rushing_attempts", "rushing_yards", "rushing_tds", "rush_yards_per_play",
+                     "total_turnovers", "fg_pct"]
+# Complete sampling groups needed before their spread is used for standard errors
+MIN_SAMPLING_GROUPS = 10
+
+class SimulationAggregate:
+    # Running statistics for simulated games of one matchup, index 0 is the home team
+    def __init__(self, home_team_name: str, away_team_name: str, track_percentiles: bool = False, track_game_scores: bool = False,
+                 sampling_group_size: int = None):
+        self.team_names = (home_team_name, away_team_name)
+        self.num_games = 0
+        self.home_wins = 0
+        # Running mean and sum of squared differences of home score minus away score
+        self.score_diff_mean = 0.0
+        self.score_diff_m2 = 0.0
+        # Welford running means, each stat keeps its own count since stats can be missing
+        self.stat_counts = np.zeros((2, len(TEAM_STAT_COLUMNS)), dtype=np.int64)
+        self.stat_means = np.zeros((2, len(TEAM_STAT_COLUMNS)))
+        self.stat_m2 = np.zeros((2, len(TEAM_STAT_COLUMNS)))
+        self.score_histograms = np.zeros((2, 0), dtype=np.int64)
+        self.stat_sketches = None
+        if track_percentiles:
+            self.stat_sketches = [[QuantileSketch() for __ in TEAM_STAT_COLUMNS] for __ in self.team_names]
+        self.featured_game_index = None
+        self.featured_play_log = None
+        # Final scores by game index, kept for paired comparisons of game models run on the same games
+        self.game_scores = {} if track_game_scores else None
+        # Antithetic pairs and stratified blocks are only independent between groups
+        self.sampling_group_size = sampling_group_size
+        self.sampling_groups = {} if sampling_group_size else None
+
+    def add_game(self, game_summary: dict, game_index: int = None) -> None:
+        final_score = game_summary["final_score"]
+        scores = [final_score[team_name] for team_name in self.team_names]
+        if game_index is None:
+            game_index = self.num_games
+        if self.game_scores is not None:
+            self.game_scores[game_index] = tuple(scores)
+        if self.sampling_groups is not None:
+            group_totals = self.sampling_groups.setdefault(game_index // self.sampling_group_size, [0, 0, 0])
+            group_totals[0] += 1
+            group_totals[1] += scores[0] > scores[1]
+            group_totals[2] += scores[0] - scores[1]
+        self.num_games += 1
+        if scores[0] > scores[1]:
+            self.home_wins += 1
+        score_diff = scores[0] - scores[1]
+        score_diff_delta = score_diff - self.score_diff_mean
+        self.score_diff_mean += score_diff_delta / self.num_games
+        self.score_diff_m2 += score_diff_delta * (score_diff - self.score_diff_mean)
+        self.add_scores_to_histograms(np.array([scores]))
+
+        for team_index, team_name in enumerate(self.team_names):
+            if team_name in game_summary:
+                team_stats = game_summary[team_name]
+                stat_values = np.array([np.nan if team_stats[stat] is None else team_stats[stat] for stat in TEAM_STAT_COLUMNS], dtype=np.float64)
+            else:
+                # Score-only games (see GameEngine's output levels) have no team stats besides the score
+                stat_values = np.full(len(TEAM_STAT_COLUMNS), np.nan)
+                stat_values[TEAM_STAT_COLUMNS.index("score")] = scores[team_index]
+            self.add_team_stats(team_index, stat_values)
+
+    def add_team_stats(self, team_index: int, stat_values: np.ndarray) -> None:
+        stat_present = ~np.isnan(stat_values)
+        counts = self.stat_counts[team_index] + stat_present
+        deltas = np.where(stat_present, stat_values - self.stat_means[team_index], 0)
+        self.stat_means[team_index] += np.divide(deltas, counts, out=np.zeros_like(deltas), where=stat_present)
+        self.stat_m2[team_index] += np.where(stat_present, deltas * (stat_values - self.stat_means[team_index]), 0)
+        self.stat_counts[team_index] = counts
+        if self.stat_sketches is not None:
+            for stat_index in np.flatnonzero(stat_present):
+                self.stat_sketches[team_index][stat_index].add(stat_values[stat_index])
+
+    def add_game_batch(self, final_scores: np.ndarray, home_team_stats: dict, away_team_stats: dict) -> None:
+        # Every game of a batch at once, team stats map each stat to an array of values
+        if self.game_scores is not None:
+            self.game_scores.update(enumerate(map(tuple, final_scores.tolist()), start=self.num_games))
+        score_diffs = (final_scores[:, 0] - final_scores[:, 1]).astype(np.float64)
+        self.merge_score_diff_moments(len(final_scores), float(score_diffs.mean()), float(((score_diffs - score_diffs.mean())**2).sum()))
+        self.num_games += len(final_scores)
+        self.home_wins += int(np.count_nonzero(final_scores[:, 0] > final_scores[:, 1]))
+        self.add_scores_to_histograms(final_scores)
+
+        for team_index, team_stats in enumerate((home_team_stats, away_team_stats)):
+            stat_values = np.column_stack([np.asarray(team_stats[stat], dtype=np.float64) for stat in TEAM_STAT_COLUMNS])
+            stat_present = ~np.isnan(stat_values)
+            counts = stat_present.sum(axis=0)
+            present_values = np.where(stat_present, stat_values, 0)
+            means = np.divide(present_values.sum(axis=0), counts, out=np.zeros(len(TEAM_STAT_COLUMNS)), where=counts > 0)
+            m2 = np.where(stat_present, (stat_values - means)**2, 0).sum(axis=0)
+            self.merge_stat_moments(team_index, counts, means, m2)
+            if self.stat_sketches is not None:
+                for stat_index, sketch in enumerate(self.stat_sketches[team_index]):
+                    for value in stat_values[stat_present[:, stat_index], stat_index].tolist():
+                        sketch.add(value)
+
+    def merge_stat_moments(self, team_index: int, counts: np.ndarray, means: np.ndarray, m2: np.ndarray) -> None:
+        # Chan et al.'s pairwise update, so merging is as stable as adding the games one by one
+        total_counts = self.stat_counts[team_index] + counts
+        deltas = means - self.stat_means[team_index]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            merged_means = self.stat_means[team_index] + deltas * counts / total_counts
+            merged_m2 = self.stat_m2[team_index] + m2 + deltas**2 * self.stat_counts[team_index] * counts / total_counts
+        self.stat_means[team_index] = np.where(total_counts > 0, merged_means, 0)
+        self.stat_m2[team_index] = np.where(total_counts > 0, merged_m2, 0)
+        self.stat_counts[team_index] = total_counts
+
+    def merge_score_diff_moments(self, num_games: int, mean: float, m2: float) -> None:
+        # Same pairwise update as merge_stat_moments, called before num_games is updated
+        total_games = self.num_games + num_games
+        if total_games == 0:
+            return
+        delta = mean - self.score_diff_mean
+        self.score_diff_mean += delta * num_games / total_games
+        self.score_diff_m2 += m2 + delta**2 * self.num_games * num_games / total_games
+
+    def add_featured_game(self, game_index: int, play_log: list) -> None:
+        self.featured_game_index = game_index
+        self.featured_play_log = play_log
+
+    def add_scores_to_histograms(self, final_scores: np.ndarray) -> None:
+        final_scores = np.asarray(final_scores, dtype=np.int64)
+        self.resize_score_histograms(int(final_scores.max()) + 1)
+        for team_index in range(2):
+            self.score_histograms[team_index] += np.bincount(final_scores[:, team_index], minlength=self.score_histograms.shape[1])
+
+    def resize_score_histograms(self, num_scores: int) -> None:
+        if num_scores > self.score_histograms.shape[1]:
+            resized_histograms = np.zeros((2, num_scores), dtype=np.int64)
+            resized_histograms[:, :self.score_histograms.shape[1]] = self.score_histograms
+            self.score_histograms = resized_histograms
+
+    def merge(self, other: "SimulationAggregate") -> None:
+        if other.team_names != self.team_names:
+            raise ValueError(f"Cannot merge simulations of {other.team_names} into simulations of {self.team_names}")
+        if (other.stat_sketches is None) != (self.stat_sketches is None):
+            raise ValueError("Cannot merge simulations with and without percentiles tracked")
+        if (other.game_scores is None) != (self.game_scores is None):
+            raise ValueError("Cannot merge simulations with and without game scores tracked")
+        if other.sampling_group_size != self.sampling_group_size:
+            raise ValueError("Cannot merge simulations with different sampling groups")
+        self.merge_score_diff_moments(other.num_games, other.score_diff_mean, other.score_diff_m2)
+        if self.game_scores is not None:
+            self.game_scores.update(other.game_scores)
+        if self.sampling_groups is not None:
+            for group_index, other_group_totals in other.sampling_groups.items():
+                group_totals = self.sampling_groups.setdefault(group_index, [0, 0, 0])
+                for total_index, total in enumerate(other_group_totals):
+                    group_totals[total_index] += total
+        self.num_games += other.num_games
+        self.home_wins += other.home_wins
+        for team_index in range(2):
+            self.merge_stat_moments(team_index, other.stat_counts[team_index], other.stat_means[team_index], other.stat_m2[team_index])
+        self.resize_score_histograms(other.score_histograms.shape[1])
+        self.score_histograms[:, :other.score_histograms.shape[1]] += other.score_histograms
+        if self.stat_sketches is not None:
+            for team_sketches, other_team_sketches in zip(self.stat_sketches, other.stat_sketches):
+                for sketch, other_sketch in zip(team_sketches, other_team_sketches):
+                    sketch.merge(other_sketch)
+        if other.featured_play_log is not None:
+            self.add_featured_game(other.featured_game_index, other.featured_play_log)
+
+    def get_stat_means(self, team_index: int) -> dict:
+        means = np.where(self.stat_counts[team_index] > 0, self.stat_means[team_index], np.nan)
+        return dict(zip(TEAM_STAT_COLUMNS, means.tolist()))
+
+    def get_stat_variances(self, team_index: int) -> dict:
+        # Sample variances, NaN for stats seen in fewer than two games
+        counts = self.stat_counts[team_index]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            variances = np.where(counts > 1, self.stat_m2[team_index] / (counts - 1), np.nan)
+        return dict(zip(TEAM_STAT_COLUMNS, variances.tolist()))
+
+    def get_stat_standard_errors(self, team_index: int) -> dict:
+        # Standard errors of the means above
+        counts = self.stat_counts[team_index]
+        variances = np.array(list(self.get_stat_variances(team_index).values()))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            standard_errors = np.sqrt(variances / counts)
+        return dict(zip(TEAM_STAT_COLUMNS, standard_errors.tolist()))
+
+    def get_home_win_pct_standard_error(self) -> float:
+        # In percentage points like home_win_pct
+        group_means = self.get_complete_group_means()
+        if group_means is not None:
+            return 100 * float(np.std(group_means[:, 0], ddof=1) / np.sqrt(len(group_means)))
+        return 100 * float(np.sqrt(self.get_home_win_variance() / self.num_games)) if self.num_games > 1 else np.nan
+
+    def get_score_diff_standard_error(self) -> float:
+        group_means = self.get_complete_group_means()
+        if group_means is not None:
+            return float(np.std(group_means[:, 1], ddof=1) / np.sqrt(len(group_means)))
+        return float(np.sqrt(self.get_score_diff_variance() / self.num_games)) if self.num_games > 1 else np.nan
+
+    def get_home_win_variance(self) -> float:
+        # Sample variance of the per-game home win indicator
+        home_win_rate = self.home_wins / self.num_games
+        return home_win_rate * (1 - home_win_rate) * self.num_games / (self.num_games - 1)
+
+    def get_score_diff_variance(self) -> float:
+        return self.score_diff_m2 / (self.num_games - 1)
+
+    def get_complete_group_means(self) -> np.ndarray:
+        # [group, (home win rate, average score difference)], None with fewer than MIN_SAMPLING_GROUPS
+        if self.sampling_groups is None:
+            return None
+        group_totals = np.array([totals for totals in self.sampling_groups.values() if totals[0] == self.sampling_group_size], dtype=np.float64)
+        if len(group_totals) < MIN_SAMPLING_GROUPS:
+            return None
+        return group_totals[:, 1:] / self.sampling_group_size
+
+    def get_variance_reduction(self) -> dict:
+        # Variance reduction against independent games, from the spread of the group averages
+        group_means = self.get_complete_group_means()
+        if group_means is None:
+            return {"home_win_pct": np.nan, "average_score_diff": np.nan}
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return {
+                "home_win_pct": float(self.get_home_win_variance() / self.sampling_group_size / np.var(group_means[:, 0], ddof=1)),
+                "average_score_diff": float(self.get_score_diff_variance() / self.sampling_group_size / np.var(group_means[:, 1], ddof=1))
+            }
+
+    def get_game_scores(self) -> np.ndarray:
+        # [game, team] final scores in game index order
+        if self.game_scores is None:
+            raise ValueError("Game scores were not tracked for these simulations")
+        return np.array([self.game_scores[game_index] for game_index in sorted(self.game_scores)], dtype=np.int64).reshape(-1, 2)
+
+    def get_stat_percentiles(self, team_index: int, percentile: float) -> dict:
+        if self.stat_sketches is None:
+            raise ValueError("Percentiles were not tracked for these simulations")
+        return {stat: sketch.quantile(percentile / 100) for stat, sketch in zip(TEAM_STAT_COLUMNS, self.stat_sketches[team_index])}